@@ -0,0 +1,102 @@
+"""
+Асинхронный (awaitable) вариант API KindergartenDB для async-обработчиков Flet
+
+Каждый метод фасада доступен как корутина:
+    adb = get_async_database(db)
+    teachers, groups = await asyncio.gather(adb.get_all_teachers(), adb.get_all_groups())
+Запросы выполняются в потоках и не блокируют цикл событий. Чтения идут
+в ограниченном пуле (ASYNC_DB_READERS); в режиме WAL читатели не блокируют
+друг друга, но параллельна только работа SQLite — строки в Python
+собираются под GIL, поэтому gather почти не сокращает время загрузки:
+выигрыш в том, что цикл событий остается отзывчивым.
+Записи, сделанные через этот API, идут через единственный поток-писатель
+и выполняются в порядке вызова. Записи из других потоков (db_worker,
+синхронные вызовы фасада) в эту очередь не попадают и, как и раньше,
+ждут блокировку SQLite (busy_timeout). Вызов проходит через фасад, поэтому
+кэш, сброс кэша после записи и профилировщик работают как при синхронном
+вызове.
+"""
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import WRITE_METHODS
+from settings.config import ASYNC_DB_READERS
+
+# Методы записи, кроме перечисленных в cache.WRITE_METHODS, — по префиксу имени
+WRITE_PREFIXES = ('add_', 'update_', 'delete_', 'remove_', 'bulk_', 'create_', 'transfer_')
+
+# Методы фасада без запросов к базе или для запуска и обслуживания: остаются синхронными
+SYNC_METHODS = {
+    'children_page_key', 'teachers_page_key', 'parents_page_key',
+    'connect', 'close', 'create_tables', 'ensure_schema', 'enable_profiler', 'disable_profiler',
+}
+
+
+def is_write_method(name: str) -> bool:
+    """Метод фасада меняет данные (выполняется потоком-писателем)"""
+    return name in WRITE_METHODS or name.startswith(WRITE_PREFIXES)
+
+
+class AsyncKindergartenDB:
+    """Обертка над KindergartenDB: методы фасада как корутины"""
+
+    def __init__(self, kindergarten_db, readers: int = ASYNC_DB_READERS):
+        self.db = kindergarten_db
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+
+    def __getattr__(self, name):
+        """Метод фасада name как корутина, выполняемая в пуле читателей или потоком-писателем"""
+        if name.startswith('_'):
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        # Проверка, что метод есть у фасада; вызывается он в потоке пула
+        target = getattr(self.db, name)
+        if name in SYNC_METHODS or not callable(target):
+            return target
+        executor = self._writer if is_write_method(name) else self._readers
+
+        async def method(*args, **kwargs):
+            call = functools.partial(self._call, name, args, kwargs)
+            return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+        method.__name__ = name
+        return method
+
+    def _call(self, name: str, args: tuple, kwargs: dict):
+        # Метод берется у фасада при каждом вызове: профилировщик может быть включен позже
+        return getattr(self.db, name)(*args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Остановить пулы, дождавшись запущенных запросов
+
+        Потоки пулов держат свои соединения с базой, поэтому пулы
+        останавливаются перед закрытием базы или переключением на другой файл.
+        """
+        self._readers.shutdown(wait=wait)
+        self._writer.shutdown(wait=wait)
+
+
+# Один асинхронный вариант на экземпляр KindergartenDB
+_async_databases = weakref.WeakKeyDictionary()
+_async_databases_lock = threading.Lock()
+
+
+def get_async_database(kindergarten_db) -> AsyncKindergartenDB:
+    """Получить общий AsyncKindergartenDB для экземпляра KindergartenDB"""
+    with _async_databases_lock:
+        async_db = _async_databases.get(kindergarten_db)
+        if async_db is None:
+            async_db = _async_databases[kindergarten_db] = AsyncKindergartenDB(kindergarten_db)
+        return async_db
+
+
+def shutdown_async_database(kindergarten_db):
+    """Остановить пулы асинхронного варианта kindergarten_db, если он создавался"""
+    with _async_databases_lock:
+        async_db = _async_databases.pop(kindergarten_db, None)
+    if async_db is not None:
+        async_db.shutdown()
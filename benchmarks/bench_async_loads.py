@@ -0,0 +1,121 @@
+"""
+Бенчмарк асинхронного API базы (async_database.py)
+
+Загрузка формы группы: группа, воспитатели, все дети и дети группы —
+последовательными синхронными вызовами прямо в цикле событий и одним
+asyncio.gather через AsyncKindergartenDB. Кроме времени загрузки
+измеряется наибольшая пауза цикла событий (задача-метроном каждые 5 мс):
+синхронные вызовы останавливают цикл на всю загрузку, вызовы через
+AsyncKindergartenDB — нет. Время загрузки при gather не меньше
+последовательного: строки собираются в Python под GIL. Затем
+параллельные записи вперемешку с чтениями: все записи проходят через
+одного писателя без ошибок блокировки.
+"""
+import asyncio
+import time
+
+from common import temp_database, seed_roster
+from async_database import get_async_database
+
+ROSTER_SIZES = [2000, 20000]
+RUNS = 5
+WRITES = 200
+TICK = 0.005  # период метронома, секунд
+
+
+def form_loads_sync(kindergarten_db, group_id):
+    return (
+        kindergarten_db.get_group_by_id(group_id),
+        kindergarten_db.get_all_teachers(),
+        kindergarten_db.get_all_children(),
+        kindergarten_db.get_children_by_group(group_id),
+    )
+
+
+async def form_loads_async(adb, group_id):
+    return await asyncio.gather(
+        adb.get_group_by_id(group_id),
+        adb.get_all_teachers(),
+        adb.get_all_children(),
+        adb.get_children_by_group(group_id),
+    )
+
+
+async def measure(load) -> tuple:
+    """Время загрузки и наибольшая пауза цикла событий во время нее, мс"""
+    gaps = []
+    running = True
+    
+    async def metronome():
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(TICK)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+    
+    ticker = asyncio.create_task(metronome())
+    await asyncio.sleep(TICK)  # метроном запущен
+    start = time.perf_counter()
+    await load()
+    elapsed = time.perf_counter() - start
+    running = False
+    await ticker
+    return elapsed * 1000, max(gaps) * 1000
+
+
+async def best(load) -> tuple:
+    """Лучшее из RUNS запусков: (время загрузки, пауза цикла), мс"""
+    return min([await measure(load) for _ in range(RUNS)])
+
+
+async def compare(kindergarten_db, adb, group_id) -> tuple:
+    async def sync_load():
+        form_loads_sync(kindergarten_db, group_id)
+    
+    async def async_load():
+        await form_loads_async(adb, group_id)
+    
+    return await best(sync_load), await best(async_load)
+
+
+async def mixed_writes(adb, group_id):
+    """WRITES добавлений и столько же чтений одновременно"""
+    writes = [
+        adb.add_child(last_name=f"Асинхронов{i}", first_name="Иван", middle_name=None,
+                      birth_date="2020-01-01", gender="М", group_id=group_id,
+                      enrollment_date="2023-09-01")
+        for i in range(WRITES)
+    ]
+    reads = [adb.get_children_page() for _ in range(WRITES)]
+    return await asyncio.gather(*writes, *reads)
+
+
+def main():
+    print(f"{'Детей':>6} | {'Последовательно, мс':>19} | {'Пауза цикла, мс':>15} | "
+          f"{'gather, мс':>10} | {'Пауза цикла, мс':>15}")
+    print("-" * 78)
+    for size in ROSTER_SIZES:
+        with temp_database() as kindergarten_db:
+            group_id = seed_roster(size)
+            adb = get_async_database(kindergarten_db)
+
+            sync_result = form_loads_sync(kindergarten_db, group_id)
+            async_result = asyncio.run(form_loads_async(adb, group_id))
+            assert [len(part) for part in sync_result[2:]] == [len(part) for part in async_result[2:]]
+
+            (sync_ms, sync_gap), (async_ms, async_gap) = asyncio.run(compare(kindergarten_db, adb, group_id))
+            print(f"{size:>6} | {sync_ms:>19.1f} | {sync_gap:>15.1f} | {async_ms:>10.1f} | {async_gap:>15.1f}")
+
+            before = len(kindergarten_db.get_children_by_group(group_id))
+            start = time.perf_counter()
+            asyncio.run(mixed_writes(adb, group_id))
+            mixed_ms = (time.perf_counter() - start) * 1000
+            after = len(kindergarten_db.get_children_by_group(group_id))
+            assert after - before == WRITES, "не все записи выполнены"
+    print()
+    print(f"{WRITES} записей и {WRITES} чтений одновременно: {mixed_ms:.0f} мс, ошибок блокировки нет")
+
+
+if __name__ == "__main__":
+    main()
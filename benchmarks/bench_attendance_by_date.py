@@ -0,0 +1,34 @@
+"""
+Проверка числа запросов get_attendance_by_group_and_date
+
+Посещаемость группы на дату должна загружаться фиксированным числом
+запросов независимо от размера группы. Скрипт завершается с ошибкой,
+если число запросов растет вместе с группой.
+"""
+import sys
+
+from common import temp_database, measure, seed_group, seed_attendance
+
+GROUP_SIZES = [1, 25, 100, 500]
+
+
+def main():
+    counts = []
+    print(f"{'Детей':>6} | {'Запросов':>8} | {'Время, с':>9}")
+    print("-" * 30)
+    with temp_database() as kindergarten_db:
+        for size in GROUP_SIZES:
+            group_id = seed_group(size, group_name=f"Группа {size}")
+            seed_attendance(group_id, 2024, 3)
+            result, queries, elapsed = measure(kindergarten_db.get_attendance_by_group_and_date, group_id, "2024-03-05")
+            assert len(result) == size
+            counts.append(queries)
+            print(f"{size:>6} | {queries:>8} | {elapsed:>9.4f}")
+    
+    if len(set(counts)) != 1:
+        print("ОШИБКА: число запросов зависит от размера группы")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Бенчмарк построения месячной матрицы посещаемости
+
+Сравнивает прежний способ (get_attendance_by_group_and_date на каждого
+ребенка и каждый день) с get_attendance_matrix (один диапазонный запрос).
+Прежний способ для больших групп слишком долгий, поэтому для них он
+замеряется на одной ячейке (ребенок × день) и умножается на число ячеек
+(помечено как оценка).
+"""
+import calendar
+
+from common import temp_database, measure, seed_group, seed_attendance
+
+YEAR, MONTH = 2024, 3
+GROUP_SIZES = [25, 100, 500]
+
+
+def legacy_journal(kindergarten_db, group_id: int, days, children_limit=None):
+    """Прежний алгоритм build_journal: запрос всей группы на каждую ячейку"""
+    children = kindergarten_db.get_children_by_group(group_id)
+    for child in children[:children_limit]:
+        for day in days:
+            date_str = f"{YEAR}-{MONTH:02d}-{day:02d}"
+            attendance_data = kindergarten_db.get_attendance_by_group_and_date(group_id, date_str)
+            next((item for item in attendance_data if item['child_id'] == child['child_id']), None)
+
+
+def main():
+    days_in_month = calendar.monthrange(YEAR, MONTH)[1]
+    print(f"{'Детей':>6} | {'Было: запросов':>16} | {'Было: время, с':>15} | {'Стало: запросов':>16} | {'Стало: время, с':>16}")
+    print("-" * 82)
+    for size in GROUP_SIZES:
+        with temp_database() as kindergarten_db:
+            group_id = seed_group(size)
+            seed_attendance(group_id, YEAR, MONTH)
+            
+            if size <= 25:
+                _, old_queries, old_time = measure(legacy_journal, kindergarten_db, group_id, range(1, days_in_month + 1))
+                estimated = ""
+            else:
+                _, old_queries, old_time = measure(legacy_journal, kindergarten_db, group_id, [1], 1)
+                old_queries = (old_queries - 1) * size * days_in_month + 1
+                old_time *= size * days_in_month
+                estimated = "~"
+            
+            _, new_queries, new_time = measure(kindergarten_db.get_attendance_matrix, group_id, YEAR, MONTH)
+            
+            print(f"{size:>6} | {estimated + str(old_queries):>16} | {estimated + format(old_time, '.3f'):>15} | "
+                  f"{new_queries:>16} | {new_time:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
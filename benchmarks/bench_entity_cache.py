@@ -0,0 +1,59 @@
+"""
+Бенчмарк кэша справочных данных (cache.py)
+
+Имитирует переходы между разделами: каждый раздел заново читает группы
+и воспитателей, как конструкторы AttendanceView, ChildrenView,
+ElectronicJournalView и HomeView. Считает SQL-запросы с кэшем и без
+него и проверяет, что запись через фасад сразу видна при следующем чтении.
+"""
+from common import temp_database, seed_group, QueryCounter
+from database import Teacher
+
+NAVIGATIONS = 50
+
+
+def navigate(kindergarten_db):
+    """Чтения справочников при одном переходе между разделами"""
+    kindergarten_db.get_all_groups()
+    kindergarten_db.get_all_groups(with_counts=True)
+    kindergarten_db.get_all_teachers()
+
+
+def main():
+    with temp_database() as kindergarten_db:
+        for _ in range(5):
+            seed_group(25)
+        Teacher.create(last_name="Смирнова", first_name="Анна")
+        
+        with QueryCounter() as uncached:
+            for _ in range(NAVIGATIONS):
+                kindergarten_db._groups_settings.get_all_groups()
+                kindergarten_db._groups_settings.get_all_groups(with_counts=True)
+                kindergarten_db._teachers_settings.get_all_teachers()
+        
+        with QueryCounter() as cached:
+            for _ in range(NAVIGATIONS):
+                navigate(kindergarten_db)
+        
+        print(f"Переходов: {NAVIGATIONS}")
+        print(f"Без кэша: SQL-запросов {uncached.count}")
+        print(f"С кэшем:  SQL-запросов {cached.count}")
+        print(f"Счетчики: {kindergarten_db.cache.stats()}")
+        
+        # Запись через фасад делает кэш групп недействительным
+        group_id = kindergarten_db.add_group("Новая", "Средняя (4-5 лет)")
+        assert any(group['group_id'] == group_id for group in kindergarten_db.get_all_groups())
+        # Изменение воспитателя видно в группах (имя воспитателя в группе)
+        teacher = kindergarten_db.get_all_teachers()[0]
+        kindergarten_db.update_group(group_id, teacher_id=teacher['teacher_id'])
+        kindergarten_db.update_teacher(teacher['teacher_id'], last_name="Петрова")
+        group = kindergarten_db.get_group_by_id(group_id)
+        assert "Петрова" in str(group), group
+        # Изменение возвращенных данных не портит кэш
+        kindergarten_db.get_all_teachers()[0]['last_name'] = "Испорчено"
+        assert kindergarten_db.get_all_teachers()[0]['last_name'] == "Петрова"
+        print("Сброс кэша при записи: ок")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Бенчмарк поиска: LIKE '%...%', префикс по колонкам *_norm и индекс FTS5
+
+Заполняет 50 000 детей с разнообразными фамилиями и сравнивает время
+поиска по подстроке (полный просмотр таблицы), по началу нормализованных
+колонок (диапазон индекса) и по полнотекстовому индексу для нескольких
+строк, которые пользователь набирает в SearchBar. Затем поиск родителей
+по части телефона: индекс FTS5 находит только начала слов, поэтому
+телефон ищется и по подстроке: все найденное LIKE должно найтись.
+"""
+import random
+import time
+
+from common import temp_database, seed_roster
+from database import Child, Group, Parent
+from settings.children_settings import ChildrenSettings
+
+RECORDS = 50000
+REPEATS = 20
+SEARCH_TERMS = ["Ко", "Ковал", "ковалев", "ива", "Петр Ан", "ЗУБ", "Алёна"]
+PARENTS = 20000
+PHONE_TERMS = ["45-67", "9123456789", "(912)"]
+
+def timed(func, *args) -> tuple:
+    """Среднее время вызова в миллисекундах и число найденных записей"""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        found = func(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000, len(found)
+
+
+def main():
+    settings = ChildrenSettings()
+    
+    def like_search(term):
+        pattern = f"%{term}%"
+        query = (Child
+                 .select(Child, Group)
+                 .join(Group)
+                 .where((Child.last_name ** pattern) | (Child.first_name ** pattern))
+                 .order_by(Child.last_name, Child.first_name))
+        return [settings._child_to_row(child) for child in query]
+    
+    def prefix_search(term):
+        query = Child.select(Child, Group).join(Group)
+        return [settings._child_to_row(child) for child in settings._search_children_normalized(query, term)]
+    
+    with temp_database() as kindergarten_db:
+        seed_roster(RECORDS)
+        print(f"Записей: {RECORDS}, повторов: {REPEATS}")
+        print(f"{'Запрос':<10} | {'LIKE, мс':>9} | {'*_norm, мс':>10} | {'FTS5, мс':>9} | Найдено LIKE/*_norm/FTS")
+        print("-" * 72)
+        for term in SEARCH_TERMS:
+            like_ms, like_found = timed(like_search, term)
+            prefix_ms, prefix_found = timed(prefix_search, term)
+            fts_ms, fts_found = timed(kindergarten_db.search_children, term)
+            print(f"{term:<10} | {like_ms:>9.2f} | {prefix_ms:>10.2f} | {fts_ms:>9.2f} | "
+                  f"{like_found}/{prefix_found}/{fts_found}")
+        
+        random.seed(7)
+        Parent.insert_many([
+            {
+                'last_name': f"Родитель{i}",
+                'first_name': "Иван",
+                'phone': (f"+7 ({random.randint(900, 999)}) {random.randint(100, 999)}-"
+                          f"{random.randint(10, 99)}-{random.randint(10, 99)}") if i % 2 else
+                         f"8{random.randint(900, 999)}{random.randint(1000000, 9999999)}",
+            }
+            for i in range(PARENTS)
+        ] + [{'last_name': "Телефонов", 'first_name': "Петр", 'phone': "89123456789"}]).execute()
+        print()
+        print(f"Родителей: {PARENTS + 1}, поиск по части телефона")
+        print(f"{'Запрос':<12} | {'LIKE, мс':>9} | {'FTS5 + подстрока, мс':>20} | Найдено LIKE/FTS")
+        print("-" * 66)
+        for term in PHONE_TERMS:
+            like_ms, like_found = timed(lambda t: list(Parent.select().where(Parent.phone ** f"%{t}%")), term)
+            fts_ms, fts_found = timed(kindergarten_db.search_parents, term)
+            # FTS5 находит еще и совпадения по началам слов, но не должен терять подстроки
+            like_ids = {parent.parent_id for parent in Parent.select().where(Parent.phone ** f"%{term}%")}
+            fts_ids = {parent['parent_id'] for parent in kindergarten_db.search_parents(term)}
+            assert like_ids <= fts_ids, f"поиск телефона '{term}' пропускает записи"
+            print(f"{term:<12} | {like_ms:>9.2f} | {fts_ms:>20.2f} | {like_found}/{fts_found}")
+
+
+if __name__ == "__main__":
+    main()
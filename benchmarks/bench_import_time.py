@@ -0,0 +1,95 @@
+"""
+Бюджет времени импорта при запуске приложения
+
+Запускает `python -X importtime -c "import main"` в новом интерпретаторе
+несколько раз и берет медиану. Сравнивает с бюджетом из import_budget.json:
+- total_ms — весь импорт main (в основном flet);
+- app_ms — main без flet: свои модули проекта и их зависимости (peewee).
+Также проверяет, что тяжелые модули (представления, статистика, медкарта,
+настройки) при запуске не импортируются — они загружаются при первом
+обращении. Код выхода 1, если бюджет превышен.
+
+    python benchmarks/bench_import_time.py            # проверка
+    python benchmarks/bench_import_time.py --update   # записать новый бюджет
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+RUNS = 7
+# Запас при записи бюджета (--update) на разброс между запусками
+HEADROOM = 1.3
+
+# Модули, которых не должно быть в импорте main
+LAZY_MODULES = [
+    "view.home_view", "view.children_view", "view.groups_view", "view.teachers_view",
+    "view.parents_view", "view.attendance_view", "view.electronic_journal_view",
+    "view.events_view", "view.settings_view", "view.medical_card_view",
+    "kindergarten_stats", "settings.children_settings", "settings.teachers_settings",
+    "settings.parents_settings", "settings.groups_settings", "settings.attendance_settings",
+    "settings.medical_card_settings", "migrations", "profiler",
+]
+
+
+def import_times() -> dict:
+    """Одно измерение: {модуль: накопленное время импорта, мс}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def measure() -> dict:
+    """Медианы total_ms и app_ms, список импортированных модулей"""
+    import_times()  # прогрев: .pyc и файловый кэш
+    runs = [import_times() for _ in range(RUNS)]
+    total = [times["main"] for times in runs]
+    app = [times["main"] - times.get("flet", 0.0) for times in runs]
+    return {
+        "total_ms": statistics.median(total),
+        "app_ms": statistics.median(app),
+        "modules": set(runs[0]),
+    }
+
+
+def main():
+    result = measure()
+    print(f"Импорт main: {result['total_ms']:.1f} мс, без flet: {result['app_ms']:.1f} мс (медиана {RUNS} запусков)")
+
+    eager = [name for name in LAZY_MODULES if name in result["modules"]]
+    if "--update" in sys.argv:
+        budget = {key: round(result[key] * HEADROOM, 1) for key in ("total_ms", "app_ms")}
+        with open(BUDGET_PATH, "w", encoding="utf-8") as file:
+            json.dump(budget, file, indent=4)
+            file.write("\n")
+        print(f"Бюджет записан: {budget}")
+        return
+
+    with open(BUDGET_PATH, encoding="utf-8") as file:
+        budget = json.load(file)
+    failures = [
+        f"{key}: {result[key]:.1f} мс > бюджета {budget[key]} мс"
+        for key in ("total_ms", "app_ms") if result[key] > budget[key]
+    ]
+    if eager:
+        failures.append(f"импортируются при запуске: {', '.join(eager)}")
+    if failures:
+        print("Бюджет превышен:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print(f"В пределах бюджета: {budget}")
+
+
+if __name__ == "__main__":
+    main()
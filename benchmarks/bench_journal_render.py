@@ -0,0 +1,70 @@
+"""
+Бенчмарк построения электронного журнала
+
+Для групп разного размера строит журнал за месяц и считает элементы,
+которые получает клиент Flet: сразу после построения (первая страница
+строк) и после прокрутки до конца. Для сравнения приводится число
+элементов прежней сетки — контейнер с текстом на каждую ячейку,
+2×(дни+1) элементов на строку. Затем измеряет переключение отметки:
+число SQL-запросов и время одного клика.
+"""
+import time
+from datetime import date
+
+from common import temp_database, seed_group, seed_attendance, QueryCounter
+from view.electronic_journal_view import ElectronicJournalView
+
+GROUP_SIZES = [25, 200, 1000]
+YEAR, MONTH = 2024, 3
+
+
+def count_controls(control) -> int:
+    """Число элементов в дереве control"""
+    return 1 + sum(count_controls(child) for child in control._get_children())
+
+
+def main():
+    print(f"{'Детей':>6} | {'Прежняя сетка':>13} | {'Первый показ':>12} | {'Весь список':>11} | {'Построение, мс':>14}")
+    print("-" * 70)
+    clicks = []
+    for size in GROUP_SIZES:
+        with temp_database() as kindergarten_db:
+            group_id = seed_group(size)
+            seed_attendance(group_id, YEAR, MONTH)
+            view = ElectronicJournalView(kindergarten_db)
+            view.selected_group = group_id
+            view.current_year, view.current_month = YEAR, MONTH
+            
+            start = time.perf_counter()
+            view.build_journal().result()
+            build_ms = (time.perf_counter() - start) * 1000
+            first = count_controls(view.journal_container)
+            
+            rows = view.journal_container.content.controls[-1]
+            while rows.load_more().result():
+                pass
+            full = count_controls(view.journal_container)
+            
+            days = view.days_in_month
+            old = 2 * (days + 1) * (size + 1) + 2 * len(view.status_colors) * 3 + 6
+            print(f"{size:>6} | {old:>13} | {first:>12} | {full:>11} | {build_ms:>14.1f}")
+            
+            # Клик по ячейке: одна запись в базу (в фоне), без перестроения журнала
+            child_id = next(iter(view.month_statuses))
+            with QueryCounter() as counter:
+                start = time.perf_counter()
+                view.toggle_attendance(child_id, 1).result()
+                click_ms = (time.perf_counter() - start) * 1000
+            writes = [sql for sql, _ in counter.statements if not sql.startswith(('BEGIN', 'COMMIT'))]
+            clicks.append((size, len(writes), click_ms))
+            expected = view.month_statuses[child_id][1]
+            stored = kindergarten_db.get_attendance_matrix(group_id, YEAR, MONTH)
+            assert next(c for c in stored if c['child_id'] == child_id)['days'][1] == expected
+    
+    print()
+    for size, writes, click_ms in clicks:
+        print(f"Клик в журнале на {size} детей: SQL-запросов {writes}, {click_ms:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
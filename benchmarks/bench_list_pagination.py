@@ -0,0 +1,67 @@
+"""
+Бенчмарк списка детей: все строки сразу против страниц по ключу
+
+Для растущего числа детей измеряет время и память на первый показ
+ChildrenView: прежний способ (get_all_children и элемент на каждую строку)
+и PagedList (первая страница get_children_page). Также проверяет, что
+страницы по ключу не пропускают и не повторяют строки, и время глубокой
+страницы (после прокрутки почти до конца списка).
+"""
+import time
+import tracemalloc
+
+from common import temp_database, seed_roster
+from settings.config import LIST_PAGE_SIZE
+from view.children_view import ChildrenView
+
+ROSTER_SIZES = [1000, 10000, 50000]
+
+
+def measure_memory(func):
+    """Время (мс) и пик памяти (МБ) вызова func"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    print(f"Размер страницы: {LIST_PAGE_SIZE}")
+    print(f"{'Детей':>7} | {'Все: мс':>8} | {'Все: МБ':>8} | {'Страница: мс':>12} | {'Страница: МБ':>12} | {'Глубокая стр., мс':>17}")
+    print("-" * 80)
+    for size in ROSTER_SIZES:
+        with temp_database() as kindergarten_db:
+            seed_roster(size)
+            view = ChildrenView(kindergarten_db)
+            
+            def show_all():
+                children = kindergarten_db.get_all_children()
+                view.children_list.controls = [view._create_child_item(child) for child in children]
+            
+            page_ms, page_mb = measure_memory(lambda: view.load_children().result())
+            all_ms, all_mb = measure_memory(show_all)
+            
+            # Обход всех страниц: без пропусков и повторов
+            seen, after = [], None
+            while True:
+                rows = kindergarten_db.get_children_page(after)
+                if not rows:
+                    break
+                seen.extend(row['child_id'] for row in rows)
+                after = kindergarten_db.children_page_key(rows[-1])
+            assert len(seen) == len(set(seen)) == size, "страницы пропускают или повторяют строки"
+            
+            deep_key = kindergarten_db.children_page_key(
+                kindergarten_db.get_children_page(limit=size - LIST_PAGE_SIZE)[-1])
+            start = time.perf_counter()
+            kindergarten_db.get_children_page(after=deep_key)
+            deep_ms = (time.perf_counter() - start) * 1000
+            
+            print(f"{size:>7} | {all_ms:>8.0f} | {all_mb:>8.1f} | {page_ms:>12.1f} | {page_mb:>12.2f} | {deep_ms:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Бенчмарк объединения обновлений страницы (update_scheduler.py)
+
+Вместо клиента Flet — страница-счетчик с настоящим циклом событий и
+пулом потоков: считается, сколько page.update() реально выполнено на
+действие, и сравнивается с числом запросов (раньше каждый запрос был
+отдельным page.update()). Действия: загрузка списка групп, назначение
+ребенка в группу (_assign_child вместе с обновлением текущего
+представления), серия событий изменения размера окна.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from common import temp_database, seed_group
+from database import Group
+from settings.config import RESIZE_THROTTLE_MS, UPDATE_FRAME_MS
+from update_scheduler import get_scheduler, request_update
+from view.groups_view import GroupsView
+
+RESIZE_EVENTS = 100
+RESIZE_INTERVAL_MS = 10  # событие изменения размера каждые 10 мс, как при перетаскивании
+
+
+class CountingPage:
+    """Страница без клиента: цикл событий, пул потоков и счетчик page.update()"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.updates = 0
+        self.overlay = []
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def run_thread(self, handler, *args):
+        self.loop.call_soon_threadsafe(self.loop.run_in_executor, self.executor, partial(handler, *args))
+
+    def update(self, *controls):
+        self.updates += 1
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.executor.shutdown()
+
+
+def settle():
+    """Дождаться отложенных обновлений"""
+    time.sleep(max(UPDATE_FRAME_MS, RESIZE_THROTTLE_MS) * 3 / 1000)
+
+
+def main():
+    with temp_database() as kindergarten_db:
+        group_id = seed_group(30)
+        other_group = Group.create(group_name="Вторая", age_category="Средняя (4-5 лет)").group_id
+        page = CountingPage()
+        view = GroupsView(kindergarten_db, on_refresh=lambda: view.refresh(), page=page)
+
+        rows = []
+        view.load_groups()
+        settle()
+        rows.append(("Загрузка групп", page.updates))
+
+        page.updates = 0
+        child_id = kindergarten_db.get_children_by_group(group_id)[0]['child_id']
+        view._assign_child(child_id, other_group)
+        settle()
+        rows.append(("Назначение ребенка в группу", page.updates))
+
+        page.updates = 0
+        for _ in range(RESIZE_EVENTS):
+            request_update(page, action="resize", throttle_ms=RESIZE_THROTTLE_MS)
+            time.sleep(RESIZE_INTERVAL_MS / 1000)
+        settle()
+        rows.append((f"{RESIZE_EVENTS} событий изменения размера", page.updates))
+        page.close()
+
+        print(f"{'Действие':<34} {'page.update()':>13}")
+        for name, updates in rows:
+            print(f"{name:<34} {updates:>13}")
+        print()
+        print(get_scheduler(page).format_report())
+
+
+if __name__ == "__main__":
+    main()
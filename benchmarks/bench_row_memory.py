@@ -0,0 +1,46 @@
+"""
+Бенчмарк памяти строк списка: словари против записей ChildRow
+
+Для 50 000 детей измеряет, сколько памяти удерживает список, который
+представление хранит после загрузки (get_all_children): словари из
+курсора и записи ChildRow из fetch_rows (поля в __slots__, повторяющиеся
+значения — общие объекты). Время чтения — bench_row_path.py.
+"""
+import tracemalloc
+
+from common import temp_database, seed_roster, cursor_dicts
+from database import Child
+from settings.children_settings import ChildrenSettings
+from settings.models import fetch_rows, ChildRow
+
+ROW_COUNT = 50000
+
+
+def retained(func):
+    """Результат func и удерживаемая им память (МБ)"""
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024
+
+
+def main():
+    with temp_database():
+        seed_roster(ROW_COUNT)
+        query = ChildrenSettings()._list_query().order_by(Child.last_name, Child.first_name)
+
+        dicts, dicts_mb = retained(lambda: cursor_dicts(query.clone()))
+        del dicts
+        rows, rows_mb = retained(lambda: fetch_rows(query.clone(), ChildRow))
+        assert len(rows) == ROW_COUNT
+
+        print(f"Детей: {ROW_COUNT}")
+        print(f"{'Строки':<12} {'Память, МБ':>11} {'Байт/строку':>12}")
+        for name, mb in [("dict", dicts_mb), ("ChildRow", rows_mb)]:
+            print(f"{name:<12} {mb:>11.1f} {mb * 1024 * 1024 / ROW_COUNT:>12.0f}")
+        print(f"Экономия: {(1 - rows_mb / dicts_mb) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
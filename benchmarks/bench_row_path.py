@@ -0,0 +1,72 @@
+"""
+Бенчмарк чтения строк списка: модели peewee против словарей из курсора
+
+На 100 000 детей сравнивает стоимость строки для прежнего пути
+(select(Child, Group) -> экземпляры моделей -> _child_to_row), словарей
+из курсора и записей ChildRow (ChildrenSettings._list_query -> fetch_rows),
+отдельно время SQL без построения строк. Проверяет, что все пути дают
+одинаковые строки.
+"""
+import time
+
+from common import temp_database, seed_roster, cursor_dicts
+from database import Child, Group, JOIN
+from settings.children_settings import ChildrenSettings
+from settings.models import fetch_rows, ChildRow
+
+ROW_COUNT = 100000
+REPEATS = 3
+
+
+def best_time(func) -> float:
+    """Лучшее время func из REPEATS запусков, секунды"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    with temp_database():
+        seed_roster(ROW_COUNT)
+        settings = ChildrenSettings()
+
+        model_query = (Child
+                       .select(Child, Group)
+                       .join(Group, JOIN.LEFT_OUTER)
+                       .order_by(Child.last_name, Child.first_name))
+        dict_query = settings._list_query().order_by(Child.last_name, Child.first_name)
+
+        def model_path():
+            return [settings._child_to_row(child) for child in model_query.clone()]
+
+        def dict_path():
+            return cursor_dicts(dict_query.clone())
+
+        def row_path():
+            return fetch_rows(dict_query.clone(), ChildRow)
+
+        def sql_only():
+            cursor = Child._meta.database.execute(dict_query.clone())
+            for _ in cursor:
+                pass
+
+        model_rows, dict_rows, rows = model_path(), dict_path(), row_path()
+        assert len(model_rows) == len(dict_rows) == len(rows) == ROW_COUNT
+        assert model_rows == dict_rows == rows, "пути возвращают разные строки"
+
+        print(f"Строк: {ROW_COUNT}, лучший из {REPEATS} запусков")
+        print(f"{'Путь':<28} {'Всего, мс':>10} {'На строку, мкс':>15}")
+        for name, func in [("Модели + _child_to_row", model_path),
+                           ("Словари из курсора", dict_path),
+                           ("fetch_rows (ChildRow)", row_path),
+                           ("Только SQL (курсор)", sql_only)]:
+            elapsed = best_time(func)
+            print(f"{name:<28} {elapsed * 1000:>10.1f} {elapsed / ROW_COUNT * 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Бенчмарк строки поиска: набор текста с отложенным фоновым поиском
+
+Имитирует быстрый набор фамилии в SearchBar над 50 000 детей и сравнивает
+прежнее поведение (запрос и построение списка на каждый символ прямо
+в обработчике) с отложенным поиском в пуле db_worker: сколько запросов
+выполнено, сколько результатов отброшено и сколько в худшем случае
+занимает обработчик ввода.
+"""
+import threading
+import time
+
+from common import temp_database, seed_roster
+from components import SearchBar
+
+RECORDS = 50000
+TYPED_TEXT = "Ковалев"
+KEYSTROKE_INTERVAL = 0.08  # секунд между символами
+
+
+def type_text(on_change):
+    """Набрать TYPED_TEXT посимвольно, вернуть наибольшее время обработчика в мс"""
+    worst = 0.0
+    for length in range(1, len(TYPED_TEXT) + 1):
+        start = time.perf_counter()
+        on_change(TYPED_TEXT[:length])
+        handler_time = time.perf_counter() - start
+        worst = max(worst, handler_time)
+        time.sleep(max(0.0, KEYSTROKE_INTERVAL - handler_time))
+    return worst * 1000
+
+
+def main():
+    with temp_database() as kindergarten_db:
+        seed_roster(RECORDS)
+        fetch = lambda query: kindergarten_db.search_children(query) if query else kindergarten_db.get_all_children()
+        
+        # Прежнее поведение: запрос на каждый символ в обработчике
+        queries = 0
+        
+        def on_change_sync(query):
+            nonlocal queries
+            queries += 1
+            fetch(query)
+        
+        worst_ms = type_text(on_change_sync)
+        print(f"Без задержки:      запросов {queries}/{len(TYPED_TEXT)}, худший обработчик ввода {worst_ms:.1f} мс")
+        
+        # SearchBar: отложенный поиск в пуле db_worker
+        fetched, shown = [], []
+        done = threading.Event()
+        
+        def counting_fetch(query):
+            fetched.append(query)
+            return fetch(query)
+        
+        def on_results(query, results):
+            shown.append(query)
+            if query == TYPED_TEXT:
+                done.set()
+        
+        search_bar = SearchBar(fetch=counting_fetch, on_results=on_results)
+        worst_ms = type_text(search_bar.schedule)
+        done.wait(timeout=10)
+        print(f"SearchBar ({search_bar.debounce * 1000:.0f} мс): запросов {len(fetched)}/{len(TYPED_TEXT)}, "
+              f"показано {len(shown)}, худший обработчик ввода {worst_ms:.2f} мс")
+        print(f"Показан результат для: {shown[-1] if shown else '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Бенчмарк записи посещаемости для профилей SQLite
+
+Для каждого профиля из DATABASE_PROFILES (и для настроек SQLite
+по умолчанию) замеряет:
+  - одиночные отметки: update_attendance_record, каждая своей транзакцией
+    (так пишет журнал при кликах);
+  - массовую запись: bulk_upsert_attendance на месяц всей группы.
+"""
+import calendar
+import time
+
+from common import temp_database, seed_group
+from database import Child
+from settings.config import DATABASE_PROFILES
+
+# Настройки SQLite без профиля — для сравнения
+DATABASE_PROFILES.setdefault("sqlite-default", {
+    'busy_timeout': 0,
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'cache_size': -2000,
+    'mmap_size': 0,
+    'temp_store': 'default'
+})
+
+CHILDREN = 100
+SINGLE_MARKS = 1000
+YEAR, MONTH = 2024, 3
+
+
+def main():
+    days_in_month = calendar.monthrange(YEAR, MONTH)[1]
+    print(f"{'Профиль':<15} | {'Одиночные, отметок/с':>21} | {'Массово, отметок/с':>19}")
+    print("-" * 63)
+    for profile in ["sqlite-default"] + [p for p in DATABASE_PROFILES if p != "sqlite-default"]:
+        with temp_database(profile) as kindergarten_db:
+            group_id = seed_group(CHILDREN)
+            child_ids = [c.child_id for c in Child.select(Child.child_id).where(Child.group == group_id)]
+            
+            start = time.perf_counter()
+            for i in range(SINGLE_MARKS):
+                child_id = child_ids[i % CHILDREN]
+                day = i // CHILDREN + 1
+                kindergarten_db.update_attendance_record(child_id, f"{YEAR}-{MONTH:02d}-{day:02d}", "Отсутствует")
+            single_rate = SINGLE_MARKS / (time.perf_counter() - start)
+            
+            records = [
+                (child_id, f"{YEAR}-{MONTH:02d}-{day:02d}", "Болеет", None)
+                for child_id in child_ids
+                for day in range(1, days_in_month + 1)
+            ]
+            start = time.perf_counter()
+            kindergarten_db.bulk_upsert_attendance(records)
+            bulk_rate = len(records) / (time.perf_counter() - start)
+            
+            print(f"{profile:<15} | {single_rate:>21.0f} | {bulk_rate:>19.0f}")
+
+
+if __name__ == "__main__":
+    main()
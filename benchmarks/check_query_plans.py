@@ -0,0 +1,115 @@
+"""
+Проверка планов выполнения горячих запросов
+
+Вызывает методы KindergartenDB, которые используются представлениями,
+перехватывает выполненный SQL и прогоняет его через EXPLAIN QUERY PLAN.
+Скрипт завершается с ошибкой, если запрос читает таблицу целиком там,
+где это не нужно, или сортирует через временное B-дерево. Полный
+просмотр разрешен только спискам "все записи" — и только по индексу,
+задающему порядок сортировки.
+
+Запуск: python benchmarks/check_query_plans.py
+"""
+import sys
+
+from common import temp_database, QueryCounter, seed_group, seed_attendance
+from database import db, Teacher, Group
+
+# Поиск по подстроке (LIKE '%...%') индексом не ускоряется, его не проверяем
+SKIPPED_MARKERS = ("LIKE",)
+
+
+def hot_calls(kindergarten_db, group_id: int, teacher_id: int, child_id: int, parent_id: int):
+    """
+    Горячие вызовы фасада: (название, функция, допустимо полных просмотров)
+    
+    Четвертый элемент (необязательный) помечает агрегат по всей таблице:
+    для него допустимы просмотр без индекса порядка и сортировка во временном
+    B-дереве — сортируются только строки результата.
+    """
+    # Ключи первых строк списков: следующая страница начинается после них
+    children_key = kindergarten_db.children_page_key(kindergarten_db.get_children_page(limit=1)[0])
+    parents_key = kindergarten_db.parents_page_key(kindergarten_db.get_parents_page(limit=1)[0])
+    teachers_key = kindergarten_db.teachers_page_key(kindergarten_db.get_teachers_page(limit=1)[0])
+    
+    return [
+        ("get_all_children", lambda: kindergarten_db.get_all_children(), 1),
+        # Страницы списков: первая — просмотр индекса порядка до LIMIT, следующие — поиск по ключу
+        ("get_children_page", lambda: kindergarten_db.get_children_page(), 1),
+        ("get_children_page(after)", lambda: kindergarten_db.get_children_page(children_key), 0),
+        ("get_parents_page", lambda: kindergarten_db.get_parents_page(), 1),
+        ("get_parents_page(after)", lambda: kindergarten_db.get_parents_page(parents_key), 0),
+        ("get_teachers_page", lambda: kindergarten_db.get_teachers_page(), 1),
+        ("get_teachers_page(after)", lambda: kindergarten_db.get_teachers_page(teachers_key), 0),
+        # Буквы указателя: DISTINCT по индексу фамилий, результат кэшируется фасадом
+        ("get_children_letters", lambda: kindergarten_db.get_children_letters(), 1, True),
+        ("get_parents_letters", lambda: kindergarten_db.get_parents_letters(), 1, True),
+        ("get_teachers_letters", lambda: kindergarten_db.get_teachers_letters(), 1, True),
+        ("get_child_by_id", lambda: kindergarten_db.get_child_by_id(child_id), 0),
+        ("get_children_by_group", lambda: kindergarten_db.get_children_by_group(group_id), 0),
+        ("get_children_by_groups", lambda: kindergarten_db.get_children_by_groups([group_id, group_id + 1]), 0),
+        ("get_children_without_group", lambda: kindergarten_db.get_children_without_group(), 0),
+        ("get_all_groups", lambda: kindergarten_db.get_all_groups(), 1),
+        # GROUP BY по группам: сортируются только строки групп, дети читаются по индексу
+        ("get_all_groups(with_counts)", lambda: kindergarten_db.get_all_groups(with_counts=True), 1, True),
+        ("get_groups_by_teacher", lambda: kindergarten_db.get_groups_by_teacher(teacher_id), 0),
+        ("get_all_teachers", lambda: kindergarten_db.get_all_teachers(), 1),
+        ("get_all_parents", lambda: kindergarten_db.get_all_parents(), 1),
+        ("get_parents_by_child", lambda: kindergarten_db.get_parents_by_child(child_id), 0),
+        ("get_children_by_parent", lambda: kindergarten_db.get_children_by_parent(parent_id), 0),
+        ("get_medical_record", lambda: kindergarten_db.get_medical_record(child_id), 0),
+        ("get_attendance_by_group_and_date", lambda: kindergarten_db.get_attendance_by_group_and_date(group_id, "2024-03-05"), 0),
+        ("get_attendance_matrix", lambda: kindergarten_db.get_attendance_matrix(group_id, 2024, 3), 0),
+        ("authenticate_user", lambda: kindergarten_db.authenticate_user("admin", "admin"), 0),
+        # Счетчики всех записей: по одному просмотру (покрывающего индекса) на таблицу
+        ("get_dashboard_summary", lambda: kindergarten_db.get_dashboard_summary("2024-03-05"), 4),
+    ]
+
+
+def find_problems(plan_rows, allowed_scans: int, aggregate: bool = False) -> list:
+    """Строки плана, означающие лишний полный просмотр таблицы или сортировку"""
+    problems = []
+    scans = 0
+    for row in plan_rows:
+        detail = row[-1]
+        if detail.startswith("SCAN ") and detail != "SCAN CONSTANT ROW":
+            scans += 1
+            if ("USING" not in detail and not aggregate) or scans > allowed_scans:
+                problems.append(detail)
+        elif "TEMP B-TREE" in detail and not aggregate:
+            problems.append(detail)
+    return problems
+
+
+def main():
+    failed = False
+    with temp_database() as kindergarten_db:
+        teacher_id = kindergarten_db.add_teacher("Смирнова", "Ольга")
+        group_id = seed_group(50)
+        Group.update(teacher=teacher_id).where(Group.group_id == group_id).execute()
+        seed_group(50, group_name="Вторая")
+        seed_attendance(group_id, 2024, 3)
+        child_id = kindergarten_db.get_children_by_group(group_id)[0]['child_id']
+        parent_id = kindergarten_db.add_parent("Иванова", "Мария")
+        kindergarten_db.add_parent_child_relation(parent_id, child_id, "Мама")
+        kindergarten_db.create_or_update_medical_record(child_id, blood_type="I (0)")
+        
+        for name, call, allowed_scans, *aggregate in hot_calls(kindergarten_db, group_id, teacher_id, child_id, parent_id):
+            with QueryCounter() as counter:
+                call()
+            for sql, params in counter.statements:
+                if not sql.lstrip().upper().startswith("SELECT") or any(m in sql for m in SKIPPED_MARKERS):
+                    continue
+                plan = db.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+                problems = find_problems(plan, allowed_scans, *aggregate)
+                status = "ОШИБКА" if problems else "ok"
+                print(f"[{status:>6}] {name}: " + "; ".join(row[-1] for row in plan))
+                failed = failed or bool(problems)
+    
+    if failed:
+        print("ОШИБКА: есть запросы без подходящего индекса")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Общие утилиты для бенчмарков
+
+Бенчмарки запускаются из корня проекта, например:
+    python benchmarks/bench_attendance_matrix.py
+Каждый бенчмарк работает со своей временной базой данных,
+рабочий файл kindergarten.db не затрагивается.
+"""
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from settings.config import DATABASE_PROFILE
+from database import KindergartenDB, db, Child, Group, Teacher, Parent, AttendanceRecord
+from db_worker import shutdown_worker
+from async_database import shutdown_async_database
+
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Волков", "Соколов", "Лебедев", "Козлов"]
+FIRST_NAMES_M = ["Иван", "Петр", "Алексей", "Дмитрий", "Сергей", "Андрей", "Михаил", "Егор"]
+FIRST_NAMES_F = ["Анна", "Мария", "Елена", "Ольга", "Софья", "Дарья", "Алиса", "Ева"]
+
+# Слоги для разнообразных фамилий (seed_roster): поиск по ним избирателен
+SYLLABLES = ["ко", "ва", "ле", "ив", "ан", "пе", "тр", "зу", "бо", "ми", "ро", "на", "се", "ли", "да", "го"]
+ENDINGS = ["ов", "ев", "ин", "ский", "енко", "ук"]
+ROSTER_FIRST_NAMES = ["Анна", "Иван", "Петр", "Мария", "Алексей", "Ольга", "Дмитрий", "Софья", "Егор", "Алена"]
+
+
+@contextmanager
+def temp_database(profile: str = DATABASE_PROFILE):
+    """Временная база данных с созданными таблицами"""
+    tmp_dir = tempfile.mkdtemp(prefix="kindergarten_bench_")
+    kindergarten_db = KindergartenDB(os.path.join(tmp_dir, "bench.db"), profile=profile)
+    kindergarten_db.connect()
+    kindergarten_db.ensure_schema()
+    try:
+        yield kindergarten_db
+    finally:
+        shutdown_worker()
+        shutdown_async_database(kindergarten_db)
+        kindergarten_db.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class QueryCounter(logging.Handler):
+    """Счетчик SQL-запросов (peewee пишет каждый запрос в логгер 'peewee')"""
+    
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.count = 0
+        self.statements = []
+    
+    def emit(self, record):
+        self.count += 1
+        if isinstance(record.msg, tuple):
+            self.statements.append(record.msg)
+    
+    def __enter__(self):
+        self._logger = logging.getLogger("peewee")
+        self._previous_level = self._logger.level
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.addHandler(self)
+        return self
+    
+    def __exit__(self, *exc):
+        self._logger.removeHandler(self)
+        self._logger.setLevel(self._previous_level)
+
+
+def measure(func, *args, **kwargs):
+    """Выполнить функцию, вернуть (результат, число запросов, время в секундах)"""
+    with QueryCounter() as counter:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return result, counter.count, elapsed
+
+
+def cursor_dicts(query) -> list:
+    """Строки запроса словарями из курсора (путь списков до записей ChildRow и т.п.)"""
+    cursor = db.execute(query)
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+
+def seed_group(children_count: int, group_name: str = "Бенчмарк") -> int:
+    """Создать группу с заданным количеством детей, вернуть ID группы"""
+    group = Group.create(group_name=group_name, age_category="Средняя (4-5 лет)")
+    rows = []
+    for i in range(children_count):
+        gender = "М" if i % 2 == 0 else "Ж"
+        first_names = FIRST_NAMES_M if gender == "М" else FIRST_NAMES_F
+        rows.append({
+            'last_name': random.choice(LAST_NAMES) + ("" if gender == "М" else "а"),
+            'first_name': random.choice(first_names),
+            'birth_date': date(2019, 1, 1) + timedelta(days=random.randint(0, 1500)),
+            'gender': gender,
+            'group': group.group_id,
+            'enrollment_date': date(2023, 9, 1),
+        })
+    with db.atomic():
+        for start in range(0, len(rows), 100):
+            Child.insert_many(rows[start:start + 100]).execute()
+    return group.group_id
+
+
+def random_last_name() -> str:
+    syllables = "".join(random.choice(SYLLABLES) for _ in range(random.randint(1, 3)))
+    return (syllables + random.choice(ENDINGS)).capitalize()
+
+
+def seed_roster(children_count: int, seed: int = 42) -> int:
+    """Создать группу с детьми со случайными фамилиями из слогов, вернуть ID группы"""
+    random.seed(seed)
+    group = Group.create(group_name="Бенчмарк", age_category="Средняя (4-5 лет)")
+    rows = [
+        {
+            'last_name': random_last_name(),
+            'first_name': random.choice(ROSTER_FIRST_NAMES),
+            'birth_date': '2020-01-01',
+            'gender': random.choice(["М", "Ж"]),
+            'group': group.group_id,
+            'enrollment_date': '2023-09-01',
+        }
+        for _ in range(children_count)
+    ]
+    with db.atomic():
+        for start in range(0, len(rows), 100):
+            Child.insert_many(rows[start:start + 100]).execute()
+    return group.group_id
+
+
+def seed_attendance(group_id: int, year: int, month: int, fill_ratio: float = 0.3):
+    """Заполнить часть отметок посещаемости группы за месяц"""
+    import calendar
+    days_in_month = calendar.monthrange(year, month)[1]
+    child_ids = [c.child_id for c in Child.select(Child.child_id).where(Child.group == group_id)]
+    rows = []
+    for child_id in child_ids:
+        for day in range(1, days_in_month + 1):
+            if random.random() < fill_ratio:
+                rows.append({
+                    'child': child_id,
+                    'date': date(year, month, day),
+                    'status': random.choice(["Присутствует", "Отсутствует", "Болеет"]),
+                })
+    with db.atomic():
+        for start in range(0, len(rows), 100):
+            AttendanceRecord.insert_many(rows[start:start + 100]).execute()
@@ -0,0 +1,59 @@
+"""
+Профиль действий представлений через профилировщик фасада (profiler.py)
+
+Создает основные разделы приложения над заполненной временной базой,
+выполняет типичные действия (поиск, прокрутка, журнал, переключение
+отметки) и печатает отчет: какие методы фасада дороже всего, сколько
+SQL-запросов и строк на них приходится. Медленные запросы пишутся
+в журнал рядом с временной базой.
+"""
+import os
+
+from common import temp_database, seed_group, seed_roster, seed_attendance
+from view.children_view import ChildrenView
+from view.electronic_journal_view import ElectronicJournalView
+from view.home_view import HomeView
+
+YEAR, MONTH = 2024, 3
+
+
+def main():
+    with temp_database() as kindergarten_db:
+        seed_roster(20000)
+        group_id = seed_group(30)
+        seed_attendance(group_id, YEAR, MONTH)
+        
+        log_path = os.path.join(os.path.dirname(kindergarten_db.db_path), "slow_queries.log")
+        profiler = kindergarten_db.enable_profiler(slow_query_ms=5, log_path=log_path)
+        
+        HomeView(kindergarten_db)
+        children_view = ChildrenView(kindergarten_db)
+        for query in ["К", "Ко", "Ков", "Ковал"]:
+            children_view.show_children(children_view.fetch_children(query))
+        children_view.load_children().result()
+        for _ in range(5):
+            children_view.children_list.load_more().result()
+        
+        journal = ElectronicJournalView(kindergarten_db)
+        journal.selected_group = group_id
+        journal.current_year, journal.current_month = YEAR, MONTH
+        journal.build_journal().result()
+        for day in range(1, 11):
+            journal.toggle_attendance(next(iter(journal.month_statuses)), day).result()
+        
+        print(profiler.format_report())
+        print()
+        slowest = profiler.report()[0]
+        print(f"Самые частые запросы в {slowest['method']}:")
+        for sql, count in slowest['statements'][:3]:
+            print(f"  {count} × {sql[:100]}")
+        with open(log_path, encoding="utf-8") as log:
+            slow_lines = log.readlines()
+        print(f"\nЗапросов дольше 5 мс в журнале: {len(slow_lines)}")
+        for line in slow_lines[:3]:
+            print("  " + line.strip()[:140])
+        kindergarten_db.disable_profiler()
+
+
+if __name__ == "__main__":
+    main()
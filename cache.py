@@ -0,0 +1,113 @@
+"""
+Кэш справочных данных для фасада KindergartenDB
+
+Результаты чтения (группы, воспитатели) запоминаются вместе с версиями
+таблиц, от которых они зависят. Любое добавление, изменение или удаление
+через фасад увеличивает версию своей таблицы, и зависящие от нее записи
+кэша перестают считаться действительными. Дополнительно записи живут не
+дольше ttl секунд (на случай изменений в обход фасада), а самые давно
+использованные вытесняются при превышении max_entries.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from settings.config import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+
+# Методы чтения -> таблицы, от которых зависит результат
+CACHED_METHODS = {
+    'get_all_groups': ('groups', 'teachers', 'children'),
+    'get_group_by_id': ('groups', 'teachers'),
+    'get_groups_by_teacher': ('groups', 'teachers'),
+    'get_all_teachers': ('teachers',),
+    'get_teacher_by_id': ('teachers',),
+    # Алфавитный указатель: DISTINCT по всей таблице при каждой загрузке списка
+    'get_children_letters': ('children',),
+    'get_parents_letters': ('parents',),
+    'get_teachers_letters': ('teachers',),
+}
+
+# Методы записи -> таблицы, которые они меняют
+WRITE_METHODS = {
+    'add_group': ('groups',),
+    'update_group': ('groups',),
+    'delete_group': ('groups', 'children'),
+    'add_teacher': ('teachers',),
+    'update_teacher': ('teachers',),
+    'delete_teacher': ('teachers', 'groups'),
+    'add_child': ('children',),
+    'update_child': ('children',),
+    'delete_child': ('children',),
+    'transfer_child_to_group': ('children',),
+    'bulk_transfer_children': ('children',),
+    'add_parent': ('parents',),
+    'update_parent': ('parents',),
+    'delete_parent': ('parents',),
+}
+
+
+class EntityCache:
+    """Кэш результатов чтения с версиями таблиц, TTL и ограничением размера"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._versions: Dict[str, int] = {}
+        self._entries: "OrderedDict[tuple, Tuple[Any, tuple, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _snapshot(self, tables: Iterable[str]) -> tuple:
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def call(self, name: str, func: Callable, args: tuple, kwargs: dict):
+        """Вернуть результат func(*args, **kwargs) из кэша или вызвать и запомнить"""
+        tables = CACHED_METHODS[name]
+        key = (name, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, versions, expires_at = entry
+                if versions == self._snapshot(tables) and now < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+            self.misses += 1
+            versions = self._snapshot(tables)
+
+        value = func(*args, **kwargs)
+        with self._lock:
+            # Если за время запроса таблицу изменили, результат уже устарел
+            if versions == self._snapshot(tables):
+                self._entries[key] = (value, versions, now + self.ttl)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def invalidate(self, *tables: str):
+        """Сделать недействительными записи, зависящие от tables"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        """Удалить все записи (счетчики попаданий сохраняются)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Счетчики кэша: попадания, промахи, доля попаданий, число записей"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'versions': dict(self._versions),
+            }
@@ -1,8 +1,14 @@
 """
 Переиспользуемые UI компоненты
 """
+import threading
+from concurrent.futures import Future
+from itertools import islice
 import flet as ft
-from typing import Callable, Optional
+from typing import Callable, List, Optional
+from settings.config import SEARCH_DEBOUNCE_MS, LIST_PAGE_SIZE
+from db_worker import get_worker
+from update_scheduler import request_update
 
 
 class ConfirmDialog(ft.AlertDialog):
@@ -24,13 +30,13 @@ class ConfirmDialog(ft.AlertDialog):
     
     def close(self):
         self.open = False
-        self.page.update()
+        request_update(self.page)
     
     def confirm_and_close(self, on_confirm: Callable):
         on_confirm(True)  # Передаем True как параметр confirmed
         self.close()
         if self.page:
-            self.page.update()
+            request_update(self.page)
 
 
 class InfoCard(ft.Container):
@@ -143,12 +149,29 @@ class DataTable(ft.Container):
 
 
 class SearchBar(ft.Container):
-    """Строка поиска"""
-    def __init__(self, on_search: Callable, placeholder: str = "Поиск..."):
+    """
+    Строка поиска
+
+    Запрос выполняется не на каждый символ, а после паузы во вводе
+    (debounce_ms) в общем пуле db_worker: fetch(query) получает данные,
+    on_results(query, results) показывает их. Запрос, устаревший к началу
+    выполнения, пропускается, а результат запроса, устаревшего из-за нового
+    ввода, отбрасывается. Enter запускает поиск без ожидания.
+    """
+    def __init__(self, fetch: Callable[[str], list], on_results: Callable[[str, list], None],
+                 placeholder: str = "Поиск...", debounce_ms: int = SEARCH_DEBOUNCE_MS):
+        self.fetch = fetch
+        self.on_results = on_results
+        self.debounce = debounce_ms / 1000
+        self._lock = threading.Lock()
+        self._generation = 0  # номер последнего ввода
+        self._timer = None  # ожидание паузы во вводе
+        
         self.search_field = ft.TextField(
             hint_text=placeholder,
             prefix_icon=ft.Icons.SEARCH,
-            on_change=lambda e: on_search(e.control.value),
+            on_change=lambda e: self.schedule(e.control.value),
+            on_submit=lambda e: self.schedule(e.control.value, delay=0),
             expand=True,
         )
         
@@ -156,3 +179,167 @@ class SearchBar(ft.Container):
             content=self.search_field,
             padding=10,
         )
+    
+    def schedule(self, query: str, delay: float = None):
+        """Запланировать поиск; предыдущий незавершенный запрос становится устаревшим"""
+        with self._lock:
+            self._generation += 1
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce if delay is None else delay,
+                                          self._submit, args=(query, self._generation))
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def cancel(self):
+        """Отменить ожидающий и выполняющийся поиск: их результаты не будут показаны"""
+        with self._lock:
+            self._generation += 1
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+    
+    def will_unmount(self):
+        self.cancel()
+    
+    def _is_current(self, generation: int) -> bool:
+        with self._lock:
+            return generation == self._generation
+    
+    def _submit(self, query: str, generation: int):
+        """Пауза во вводе выдержана: выполнить запрос в пуле db_worker"""
+        if not self._is_current(generation):
+            return
+        get_worker().submit(
+            self.page,
+            lambda: self.fetch(query) if self._is_current(generation) else None,
+            on_done=lambda results: self._show(query, generation, results),
+            on_error=lambda ex: print(f"Ошибка поиска: {ex}"),
+            key=("search", id(self)),
+        )
+    
+    def _show(self, query: str, generation: int, results: list):
+        # Проверка и показ под блокировкой: ввод, начатый после проверки, ждет показа
+        # и затем заменяет результат, а не наоборот
+        with self._lock:
+            if generation == self._generation:
+                self.on_results(query, results)
+
+
+class PagedList(ft.ListView):
+    """
+    Список с подгрузкой страниц при прокрутке
+
+    Элементы создаются постранично: первая страница — при show/show_rows,
+    следующие — когда прокрутка подходит к концу списка. Страницы загружаются
+    в пуле db_worker, ввод во время загрузки не блокируется. load_page(after, limit)
+    возвращает строки после ключа after (см. keyset_page в settings/models.py),
+    page_key(row) — ключ последней загруженной строки.
+    """
+    def __init__(self, create_item: Callable[[dict], ft.Control], page_size: int = LIST_PAGE_SIZE,
+                 load_threshold: int = 300, **kwargs):
+        super().__init__(on_scroll=self._on_scroll, on_scroll_interval=100, **kwargs)
+        self.create_item = create_item
+        self.page_size = page_size
+        self.load_threshold = load_threshold  # пикселей до конца, когда грузить следующую страницу
+        self._load_page = None
+        self._page_key = None
+        self._after = None
+        self._exhausted = True
+        self._loading = False  # страница загружается в пуле
+        self._shown = 0  # номер показа: страница прежнего показа не добавляется
+        self._lock = threading.Lock()
+    
+    def show(self, load_page: Callable[[Optional[tuple], int], list], page_key: Callable[[dict], tuple],
+             after: Optional[tuple] = None, first_rows: Optional[list] = None):
+        """
+        Показать список с начала (или с ключа after) и загрузить первую страницу
+
+        first_rows — первая страница, если она уже получена (например, в фоне
+        вместе с другими данными представления), тогда load_page вызывается
+        только для следующих.
+        """
+        with self._lock:
+            self._load_page = load_page
+            self._page_key = page_key
+            self._after = after
+            self._exhausted = False
+            self._loading = False
+            self._shown += 1
+            self.controls = []
+            if first_rows is not None:
+                self._append(first_rows)
+        if first_rows is None:
+            self.load_more()
+    
+    def show_rows(self, rows: list):
+        """Показать уже полученные строки (например, результаты поиска), создавая элементы постранично"""
+        remaining = iter(rows)
+        self.show(lambda after, limit: list(islice(remaining, limit)), page_key=lambda row: None,
+                  first_rows=list(islice(remaining, self.page_size)))
+    
+    def load_more(self) -> Future:
+        """
+        Загрузить следующую страницу в пуле db_worker
+
+        Returns:
+            Future со строками страницы; пустой список, если строк больше нет
+            или страница уже загружается
+        """
+        with self._lock:
+            if self._exhausted or self._loading:
+                nothing = Future()
+                nothing.set_result([])
+                return nothing
+            self._loading = True
+            load_page, after, shown = self._load_page, self._after, self._shown
+        return get_worker().submit(
+            self.page,
+            lambda: load_page(after, self.page_size),
+            on_done=lambda rows: self._loaded(shown, rows),
+            on_error=lambda ex: self._failed(shown, ex),
+            key=("page", id(self)),
+        )
+    
+    def _loaded(self, shown: int, rows: list):
+        with self._lock:
+            if shown != self._shown:
+                return
+            self._loading = False
+            self._append(rows)
+    
+    def _failed(self, shown: int, ex: Exception):
+        with self._lock:
+            if shown == self._shown:
+                self._loading = False
+        print(f"Ошибка загрузки страницы: {ex}")
+    
+    def _append(self, rows: list):
+        self.controls.extend(self.create_item(row) for row in rows)
+        if rows:
+            self._after = self._page_key(rows[-1])
+        self._exhausted = len(rows) < self.page_size
+    
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        # Страница показывается вместе с обновлением страницы после задачи пула
+        if e.max_scroll_extent - e.pixels <= self.load_threshold:
+            self.load_more()
+
+
+class AlphabetBar(ft.Row):
+    """Алфавитный указатель: кнопки первых букв, нажатие вызывает on_select(letter)"""
+    def __init__(self, on_select: Callable[[str], None]):
+        super().__init__(spacing=0, wrap=True)
+        self.on_select = on_select
+    
+    def set_letters(self, letters: List[str]):
+        """Показать кнопки для букв letters"""
+        self.controls = [
+            ft.TextButton(
+                letter,
+                on_click=lambda e, letter=letter: self.on_select(letter),
+                style=ft.ButtonStyle(padding=ft.padding.symmetric(horizontal=6)),
+            )
+            for letter in letters
+        ]
+
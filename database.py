@@ -1,9 +1,30 @@
 from peewee import *
+import importlib
+import threading
+import time
 from datetime import datetime
+from functools import wraps
 from typing import List, Optional
+from settings.config import DATABASE_PROFILE, DATABASE_PROFILES, PROFILER_ENABLED
+from fulltext import normalize_name
+from cache import EntityCache, CACHED_METHODS, WRITE_METHODS
+
+class KindergartenSqliteDatabase(SqliteDatabase):
+    """SqliteDatabase, которая сообщает о каждом запросе профилировщику, если он подключен"""
+    profiler = None
+    
+    def execute_sql(self, sql, params=None):
+        if self.profiler is None:
+            return super().execute_sql(sql, params)
+        start = time.perf_counter()
+        try:
+            return super().execute_sql(sql, params)
+        finally:
+            self.profiler.record_statement(sql, params, time.perf_counter() - start)
+
 
 # Инициализация базы данных
-db = SqliteDatabase(None)
+db = KindergartenSqliteDatabase(None)
 
 
 class BaseModel(Model):
@@ -12,7 +33,51 @@ class BaseModel(Model):
         database = db
 
 
-class Teacher(BaseModel):
+class PersonModel(BaseModel):
+    """
+    Базовая модель людей: колонки *_norm (см. fulltext.py) заполняются при
+    каждой записи имени — create, save, insert, insert_many и update
+    """
+    
+    @classmethod
+    def _with_normalized(cls, data: dict) -> dict:
+        """Добавить к записываемым данным колонки *_norm измененных имен"""
+        normalized = dict(data)
+        for field, value in data.items():
+            norm_field = cls._meta.fields.get(f'{field.name}_norm')
+            if norm_field is not None:
+                normalized[norm_field] = normalize_name(value)
+        return normalized
+    
+    @classmethod
+    def insert(cls, __data=None, **insert):
+        return super().insert(cls._with_normalized(cls._normalize_data(__data, insert)))
+    
+    @classmethod
+    def insert_many(cls, rows, fields=None):
+        # Строки приводятся к словарям: кортежи сопоставляются с fields (по умолчанию,
+        # как в peewee, — все поля кроме автоинкрементного ключа) по позиции
+        if fields is not None:
+            columns = [cls._meta.fields[field] if isinstance(field, str) else field for field in fields]
+        else:
+            columns = cls._meta.sorted_fields[1:] if cls._meta.auto_increment else cls._meta.sorted_fields
+        dict_rows = []
+        for row in rows:
+            if isinstance(row, dict):
+                data = cls._normalize_data(row, {})
+                if fields is not None:
+                    data = {column: data[column] for column in columns if column in data}
+            else:
+                data = dict(zip(columns, row))
+            dict_rows.append(cls._with_normalized(data))
+        return super().insert_many(dict_rows)
+    
+    @classmethod
+    def update(cls, __data=None, **update):
+        return super().update(cls._with_normalized(cls._normalize_data(__data, update)))
+
+
+class Teacher(PersonModel):
     """Модель воспитателя"""
     teacher_id = AutoField(primary_key=True)
     last_name = CharField(null=False)
@@ -24,10 +89,18 @@ class Teacher(BaseModel):
     address = TextField(null=True)
     education = TextField(null=True)
     experience = IntegerField(null=True)
+    last_name_norm = CharField(null=True)  # Для поиска: нижний регистр, ё -> е
+    first_name_norm = CharField(null=True)
+    middle_name_norm = CharField(null=True)
     created_at = DateTimeField(default=datetime.now)
     
     class Meta:
         table_name = 'teachers'
+        indexes = (
+            (('last_name', 'first_name'), False),
+            (('last_name_norm',), False),  # Поиск по началу фамилии
+            (('first_name_norm',), False),
+        )
 
 
 class Group(BaseModel):
@@ -40,9 +113,12 @@ class Group(BaseModel):
     
     class Meta:
         table_name = 'groups'
+        indexes = (
+            (('group_name',), False),
+        )
 
 
-class Parent(BaseModel):
+class Parent(PersonModel):
     """Модель родителя"""
     parent_id = AutoField(primary_key=True)
     last_name = CharField(null=False)
@@ -51,13 +127,21 @@ class Parent(BaseModel):
     phone = CharField(null=True)
     email = CharField(null=True)
     address = CharField(null=True)
+    last_name_norm = CharField(null=True)  # Для поиска: нижний регистр, ё -> е
+    first_name_norm = CharField(null=True)
+    middle_name_norm = CharField(null=True)
     created_at = DateTimeField(default=datetime.now)
     
     class Meta:
         table_name = 'parents'
+        indexes = (
+            (('last_name', 'first_name'), False),
+            (('last_name_norm',), False),  # Поиск по началу фамилии
+            (('first_name_norm',), False),
+        )
 
 
-class Child(BaseModel):
+class Child(PersonModel):
     """Модель ребенка"""
     child_id = AutoField(primary_key=True)
     last_name = CharField(null=False)
@@ -67,12 +151,17 @@ class Child(BaseModel):
     gender = CharField(null=False, constraints=[Check("gender IN ('М', 'Ж')")])
     group = ForeignKeyField(Group, backref='children', null=True, column_name='group_id')
     enrollment_date = DateField(null=False)
+    last_name_norm = CharField(null=True)  # Для поиска: нижний регистр, ё -> е
+    first_name_norm = CharField(null=True)
     created_at = DateTimeField(default=datetime.now)
     
     class Meta:
         table_name = 'children'
         indexes = (
             (('last_name', 'first_name'), False),
+            (('group', 'last_name', 'first_name'), False),  # Дети группы по алфавиту
+            (('last_name_norm',), False),  # Поиск по началу фамилии
+            (('first_name_norm',), False),
         )
 
 
@@ -102,6 +191,7 @@ class AttendanceRecord(BaseModel):
         table_name = 'attendance_records'
         indexes = (
             (('child', 'date'), True),  # Уникальная запись на дату для ребенка
+            (('date', 'status'), False),  # Отметки всех групп на дату
         )
 
 
@@ -137,35 +227,68 @@ class User(BaseModel):
         table_name = 'users'
 
 
+MODELS = [Teacher, Group, Parent, Child, ParentChild, AttendanceRecord, MedicalRecord, User]
+
+
+def create_default_admin():
+    """Создать администратора по умолчанию"""
+    try:
+        User.get(User.username == 'admin')
+    except:
+        import hashlib
+        password_hash = hashlib.sha256('admin'.encode()).hexdigest()
+        User.create(username='admin', password=password_hash, role='admin')
+
+
+def profiled(method):
+    """Учитывать вызовы метода фасада в профилировщике, если он включен"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+        return self.profiler.call(method.__name__, method, (self,) + args, kwargs)
+    return wrapper
+
+
+# Настройки, которым делегирует фасад: атрибут -> (модуль, класс).
+# Модуль импортируется, а объект создается при первом обращении к атрибуту
+SETTINGS_CLASSES = {
+    '_children_settings': ('settings.children_settings', 'ChildrenSettings'),
+    '_teachers_settings': ('settings.teachers_settings', 'TeachersSettings'),
+    '_parents_settings': ('settings.parents_settings', 'ParentsSettings'),
+    '_groups_settings': ('settings.groups_settings', 'GroupsSettings'),
+    '_attendance_settings': ('settings.attendance_settings', 'AttendanceSettings'),
+    '_medical_card_settings': ('settings.medical_card_settings', 'MedicalCardSettings'),
+    '_statistics': ('kindergarten_stats', 'KindergartenStatistics'),
+}
+
+
 class KindergartenDB:
     """Класс для работы с базой данных детского сада через Peewee ORM"""
     
-    def __init__(self, db_path: str = "kindergarten.db"):
+    def __init__(self, db_path: str = "kindergarten.db", profile: str = DATABASE_PROFILE):
         """
         Инициализация подключения к базе данных
         
         Args:
             db_path: путь к файлу базы данных SQLite
+            profile: профиль производительности SQLite из DATABASE_PROFILES
         """
+        if profile not in DATABASE_PROFILES:
+            raise ValueError(f"Неизвестный профиль базы данных: {profile}")
         self.db_path = db_path
+        self.profile = profile
         self.connection = None
-        from settings.children_settings import ChildrenSettings
-        from settings.teachers_settings import TeachersSettings
-        from settings.parents_settings import ParentsSettings
-        from settings.groups_settings import GroupsSettings
-        from settings.attendance_settings import AttendanceSettings
-        from settings.medical_card_settings import MedicalCardSettings
-        self._children_settings = ChildrenSettings()
-        self._teachers_settings = TeachersSettings()
-        self._parents_settings = ParentsSettings()
-        self._groups_settings = GroupsSettings()
-        self._attendance_settings = AttendanceSettings()
-        self._medical_card_settings = MedicalCardSettings()
+        self.cache = EntityCache()
+        self.profiler = None
+        if PROFILER_ENABLED:
+            self.enable_profiler()
     
     def connect(self):
         """Установить соединение с базой данных"""
-        db.init(self.db_path)
-        db.connect()
+        if db.database != self.db_path:
+            db.init(self.db_path, pragmas=DATABASE_PROFILES[self.profile])
+        db.connect(reuse_if_open=True)
         self.connection = db
         return self.connection
     
@@ -176,41 +299,91 @@ class KindergartenDB:
     
     def create_tables(self):
         """Создать таблицы в базе данных"""
-        db.create_tables([Teacher, Group, Parent, Child, ParentChild, AttendanceRecord, MedicalRecord, User])
-        # Создаем администратора по умолчанию
-        try:
-            User.get(User.username == 'admin')
-        except:
-            import hashlib
-            password_hash = hashlib.sha256('admin'.encode()).hexdigest()
-            User.create(username='admin', password=password_hash, role='admin')
+        db.create_tables(MODELS)
+        create_default_admin()
         print("Tables created successfully")
     
+    def ensure_schema(self):
+        """Привести схему к актуальной версии (см. migrations.py)"""
+        from migrations import run_migrations
+        if run_migrations(db):
+            self.cache.clear()
+    
+    def enable_profiler(self, **options):
+        """
+        Включить профилировщик запросов (см. profiler.py)
+        
+        Args:
+            **options: параметры QueryProfiler (slow_query_ms, log_path)
+        
+        Returns:
+            профилировщик; отчет — profiler.report() или profiler.format_report()
+        """
+        from profiler import QueryProfiler
+        self.profiler = QueryProfiler(**options)
+        db.profiler = self.profiler
+        return self.profiler
+    
+    def disable_profiler(self):
+        """Выключить профилировщик, вернуть его с собранной статистикой"""
+        profiler, self.profiler = self.profiler, None
+        db.profiler = None
+        return profiler
+    
     def __getattr__(self, name):
-        """Динамическое делегирование методов к соответствующим настройкам"""
+        """
+        Динамическое делегирование методов к соответствующим настройкам
+
+        Методы чтения из cache.CACHED_METHODS отвечают из кэша, методы записи
+        из cache.WRITE_METHODS после вызова сбрасывают кэш своих таблиц.
+        Объекты настроек (SETTINGS_CLASSES) создаются при первом обращении.
+        """
+        if name in SETTINGS_CLASSES:
+            module_name, class_name = SETTINGS_CLASSES[name]
+            settings = getattr(importlib.import_module(module_name), class_name)()
+            setattr(self, name, settings)
+            return settings
+        method = self._resolve_method(name)
+        if name in CACHED_METHODS:
+            settings_method = method
+            method = lambda *args, **kwargs: self.cache.call(name, settings_method, args, kwargs)
+        elif name in WRITE_METHODS:
+            settings_method = method
+            def method(*args, **kwargs):
+                try:
+                    return settings_method(*args, **kwargs)
+                finally:
+                    self.cache.invalidate(*WRITE_METHODS[name])
+        if self.profiler is not None:
+            profiler, target = self.profiler, method
+            return lambda *args, **kwargs: profiler.call(name, target, args, kwargs)
+        return method
+    
+    def _resolve_method(self, name):
+        """Найти метод настроек, которому делегируется вызов фасада"""
         # Методы для работы с воспитателями
-        teacher_methods = ['add_teacher', 'get_all_teachers', 'get_teacher_by_id', 'update_teacher', 'delete_teacher', 'search_teachers']
+        teacher_methods = ['add_teacher', 'get_all_teachers', 'get_teachers_page', 'teachers_page_key', 'get_teachers_letters', 'get_teacher_by_id', 'update_teacher', 'delete_teacher', 'search_teachers']
         if name in teacher_methods:
             return getattr(self._teachers_settings, name)
         
         # Методы для работы с родителями
-        parent_methods = ['add_parent', 'get_all_parents', 'get_parent_by_id', 'update_parent', 'delete_parent', 'search_parents']
+        parent_methods = ['add_parent', 'get_all_parents', 'get_parents_page', 'parents_page_key', 'get_parents_letters', 'get_parent_by_id', 'update_parent', 'delete_parent', 'search_parents']
         if name in parent_methods:
             return getattr(self._parents_settings, name)
         
         # Методы для работы с группами
-        group_methods = ['add_group', 'get_all_groups', 'get_group_by_id', 'update_group', 'delete_group']
+        group_methods = ['add_group', 'get_all_groups', 'get_group_by_id', 'get_groups_by_teacher', 'update_group', 'delete_group']
         if name in group_methods:
             return getattr(self._groups_settings, name)
         
         # Методы для работы с детьми
-        child_methods = ['add_child', 'get_all_children', 'get_child_by_id', 'get_children_by_group', 'search_children', 
+        child_methods = ['add_child', 'get_all_children', 'get_children_page', 'children_page_key', 'get_children_letters', 'get_child_by_id', 'get_children_by_group', 'get_children_by_groups', 'search_children', 
                         'update_child', 'delete_child', 'transfer_child_to_group', 'bulk_transfer_children', 'get_children_without_group']
         if name in child_methods:
             return getattr(self._children_settings, name)
         
         # Методы для работы с посещаемостью
-        attendance_methods = ['add_attendance_record', 'update_attendance_record']
+        attendance_methods = ['add_attendance_record', 'update_attendance_record', 'bulk_upsert_attendance']
         if name in attendance_methods:
             return getattr(self._attendance_settings, name)
         
@@ -219,39 +392,55 @@ class KindergartenDB:
         if name in medical_methods:
             return getattr(self._medical_card_settings, name)
         
+        # Методы для статистики
+        statistics_methods = ['get_dashboard_summary', 'get_group_statistics', 'get_general_statistics']
+        if name in statistics_methods:
+            return getattr(self._statistics, name)
+        
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
     
+    @profiled
     def add_parent_child_relation(self, parent_id: int, child_id: int, relationship: str):
         """Добавить связь родитель-ребенок"""
         ParentChild.create(parent=parent_id, child=child_id, relationship=relationship)
     
+    @profiled
     def remove_parent_child_relation(self, parent_id: int, child_id: int):
         """Удалить связь родитель-ребенок"""
         ParentChild.delete().where((ParentChild.parent == parent_id) & (ParentChild.child == child_id)).execute()
     
+    @profiled
     def get_children_by_parent(self, parent_id: int):
         """Получить детей родителя"""
         relations = (ParentChild.select(ParentChild, Child, Group).join(Child).join(Group, JOIN.LEFT_OUTER).where(ParentChild.parent == parent_id))
         result = []
         for relation in relations:
-            child_data = self._children_settings._child_to_dict(relation.child)
+            child_data = self._children_settings._child_to_row(relation.child)
             child_data['relationship'] = relation.relationship
             result.append(child_data)
         return result
     
+    @profiled
     def get_parents_by_child(self, child_id: int):
         """Получить родителей ребенка"""
         relations = (ParentChild.select(ParentChild, Parent).join(Parent).where(ParentChild.child == child_id))
         result = []
         for relation in relations:
-            parent_data = self._parents_settings._parent_to_dict(relation.parent)
+            parent_data = self._parents_settings._parent_to_row(relation.parent)
             parent_data['relationship'] = relation.relationship
             result.append(parent_data)
         return result
     
+    @profiled
     def get_attendance_by_group_and_date(self, group_id: int, date: str):
         return self._attendance_settings.get_attendance_by_group_and_date(group_id, date, self._children_settings)
     
+    @profiled
+    def get_attendance_matrix(self, group_id: int, year: int, month: int):
+        """Получить посещаемость группы за месяц (ребенок × день)"""
+        return self._attendance_settings.get_attendance_matrix(group_id, year, month, self._children_settings)
+    
+    @profiled
     def authenticate_user(self, username: str, password: str):
         """Проверка авторизации пользователя"""
         import hashlib
@@ -270,3 +459,31 @@ class KindergartenDB:
     
 
     
+
+
+# Общий для всего приложения экземпляр базы данных
+_database_instance = None
+_database_lock = threading.Lock()
+
+
+def get_database(db_path: str = "kindergarten.db") -> KindergartenDB:
+    """
+    Получить общий экземпляр KindergartenDB
+    
+    При первом вызове создает подключение и при необходимости схему,
+    последующие вызовы (повторный вход, новые сессии) возвращают тот же объект.
+    Сессии веб-версии стартуют в разных потоках: создание под блокировкой,
+    чтобы фасад (и его кэш) был один и миграции не выполнялись дважды.
+    """
+    global _database_instance
+    with _database_lock:
+        if _database_instance is None:
+            kindergarten_db = KindergartenDB(db_path)
+            kindergarten_db.connect()
+            kindergarten_db.ensure_schema()
+            if kindergarten_db.profiler is not None:
+                # PROFILER_ENABLED: отчет по методам фасада при завершении
+                import atexit
+                atexit.register(lambda: print(kindergarten_db.profiler.format_report()))
+            _database_instance = kindergarten_db
+        return _database_instance
@@ -0,0 +1,153 @@
+"""
+Фоновое выполнение запросов к базе для обработчиков событий Flet
+
+Обработчик передает работу с базой в пул потоков и сразу возвращается:
+    get_worker().submit(page, work, on_done=show, loading=progress_bar)
+work() выполняется в пуле, затем on_done(result) (или on_error(ex))
+применяет результат на странице (page.run_thread) и страница обновляется
+через update_scheduler вместе с другими запросами кадра. Пока работа не
+завершена, элемент loading виден.
+
+Задачи с одинаковым key — «последняя побеждает»: результат задачи, после
+которой с тем же key запущена новая, не применяется (повторная загрузка
+списка не перетрет более свежую). work не должна ждать другие задачи
+пула — только запускать их.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+
+from settings.config import DB_WORKERS
+from update_scheduler import request_update
+
+
+class DbWorker:
+    """Пул потоков для запросов к базе с применением результата на странице"""
+
+    def __init__(self, max_workers: int = DB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._generations = {}  # key -> номер последней задачи
+        self._pending = {}  # id(элемента загрузки) -> число незавершенных задач
+
+    def submit(self, page, work: Callable[[], Any], on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None, loading=None,
+               key: Optional[Hashable] = None) -> Future:
+        """
+        Выполнить work() в пуле и применить результат
+
+        Args:
+            page: страница Flet, на которой применяется результат (None — в потоке пула)
+            work: работа с базой, без обращения к элементам интерфейса
+            on_done: применить результат work к интерфейсу
+            on_error: показать ошибку (по умолчанию — печать в консоль)
+            loading: элемент, видимый, пока задача не завершена
+            key: задачи с одинаковым key применяют только последний результат
+
+        Returns:
+            Future с результатом work, завершается после применения on_done
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            if key is not None:
+                self._generations[key] = generation
+        self._show_loading(loading)
+        done = Future()
+        self._executor.submit(self._run, page, work, on_done, on_error, loading, key, generation, done)
+        return done
+
+    def _run(self, page, work, on_done, on_error, loading, key, generation, done: Future):
+        result = error = None
+        try:
+            result = work()
+        except Exception as ex:
+            error = ex
+        handler, value = (on_done, result) if error is None else (on_error or _print_error, error)
+        with self._lock:
+            if key is not None and self._generations.get(key) != generation:
+                handler = None  # уже запущена более новая задача с тем же key
+        if page is not None:
+            try:
+                page.run_thread(self._apply, page, handler, value, loading, result, error, done)
+                return
+            except Exception:
+                # Сессия страницы закрыта: применять результат некуда
+                page, handler = None, None
+        self._apply(page, handler, value, loading, result, error, done)
+
+    def _apply(self, page, handler, value, loading, result, error, done: Future):
+        """Применить результат: скрыть загрузку, вызвать обработчик, обновить страницу"""
+        try:
+            self._hide_loading(loading)
+            if handler is not None:
+                handler(value)
+            if page is not None:
+                # Действие для счетчиков — метод, запустивший задачу (без «.<locals>.<lambda>»)
+                action = getattr(handler, '__qualname__', "DbWorker").split('.<locals>')[0]
+                request_update(page, action=action)
+        except Exception as ex:
+            print(f"Ошибка применения результата: {ex}")
+        finally:
+            if error is not None:
+                done.set_exception(error)
+            else:
+                done.set_result(result)
+
+    def _show_loading(self, loading):
+        if loading is None:
+            return
+        with self._lock:
+            count = self._pending.get(id(loading), 0)
+            self._pending[id(loading)] = count + 1
+        if count == 0:
+            loading.visible = True
+            request_update(loading.page, loading)
+
+    def _hide_loading(self, loading):
+        if loading is None:
+            return
+        with self._lock:
+            count = self._pending.get(id(loading), 1) - 1
+            if count:
+                self._pending[id(loading)] = count
+            else:
+                self._pending.pop(id(loading), None)
+        if not count:
+            loading.visible = False
+
+    def shutdown(self, wait: bool = True):
+        """Остановить пул (после завершения запущенных задач)"""
+        self._executor.shutdown(wait=wait)
+
+
+def _print_error(ex: Exception):
+    print(f"Ошибка фоновой задачи: {ex}")
+
+
+# Общий для всего приложения пул
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker() -> DbWorker:
+    """Получить общий экземпляр DbWorker"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = DbWorker()
+        return _worker
+
+
+def shutdown_worker():
+    """
+    Остановить общий пул, дождавшись запущенных задач
+
+    Потоки пула держат свои соединения с базой (peewee открывает их на поток),
+    поэтому пул останавливается перед закрытием базы или переключением на
+    другой файл; следующий get_worker() создаст новый.
+    """
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.shutdown()
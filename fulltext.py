@@ -0,0 +1,201 @@
+"""
+Полнотекстовый поиск по детям, родителям и воспитателям (SQLite FTS5)
+
+Для каждой таблицы создается внешний (external content) индекс FTS5,
+который синхронизируется триггерами на INSERT/UPDATE/DELETE. Поиск идет
+по префиксам слов с сортировкой по релевантности (bm25). Если SQLite
+собран без FTS5, индексы не создаются и поиск идет по нормализованным
+колонкам.
+
+Встроенные lower() и LIKE в SQLite меняют регистр только у латиницы,
+поэтому у фамилий и имен есть теневые колонки *_norm: строка в нижнем
+регистре с заменой ё на е (normalize_name). Их заполняет приложение при
+каждой записи имен (PersonModel в database.py), а не триггеры: база
+остается доступной для записи из любых клиентов SQLite. Строки, записанные
+в обход приложения, не найдутся по имени до следующего изменения через
+приложение. По колонкам *_norm построены индексы (префиксный поиск —
+просмотр диапазона индекса) и полнотекстовые индексы.
+"""
+import re
+from typing import List, Optional
+
+from peewee import JOIN, Expression, Table
+
+# Индексируемые таблицы: индекс -> (таблица, первичный ключ, колонки)
+FTS_TABLES = {
+    'children_fts': ('children', 'child_id', ['last_name_norm', 'first_name_norm']),
+    'parents_fts': ('parents', 'parent_id', ['last_name_norm', 'first_name_norm', 'middle_name_norm', 'phone', 'email']),
+    'teachers_fts': ('teachers', 'teacher_id', ['last_name_norm', 'first_name_norm', 'middle_name_norm', 'phone', 'email']),
+}
+
+# Нормализуемые колонки: таблица -> (первичный ключ, колонки)
+NORMALIZED_COLUMNS = {
+    'children': ('child_id', ['last_name', 'first_name']),
+    'parents': ('parent_id', ['last_name', 'first_name', 'middle_name']),
+    'teachers': ('teacher_id', ['last_name', 'first_name', 'middle_name']),
+}
+
+# Наличие индексов по пути к базе, проверяется один раз на базу
+_available_indexes = {}
+
+
+def normalize_name(value: Optional[str]) -> Optional[str]:
+    """Привести строку к виду для поиска: нижний регистр, ё -> е"""
+    if value is None:
+        return None
+    return value.strip().lower().replace('ё', 'е')
+
+
+def fill_normalized_columns(database, table: str, columns: List[str] = None):
+    """
+    Заполнить колонки *_norm для имеющихся строк таблицы
+
+    columns по умолчанию берутся из NORMALIZED_COLUMNS; миграции передают
+    свой список, как и для create_fts_index.
+    """
+    key, default_columns = NORMALIZED_COLUMNS[table]
+    columns = columns or default_columns
+    column_list = ', '.join(columns)
+    assignments = ', '.join(f'{column}_norm = ?' for column in columns)
+    rows = database.execute_sql(f"SELECT {key}, {column_list} FROM {table}").fetchall()
+    database.cursor().executemany(
+        f"UPDATE {table} SET {assignments} WHERE {key} = ?",
+        [[normalize_name(value) for value in row[1:]] + [row[0]] for row in rows],
+    )
+
+
+def prefix_condition(field, prefix: str):
+    """Условие "колонка начинается с prefix" в виде диапазона, который покрывает индекс"""
+    upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return (field >= prefix) & (field < upper_bound)
+
+
+def normalized_prefix_condition(fields: list, search_term: str):
+    """
+    Условие поиска по колонкам *_norm без полнотекстового индекса
+
+    Каждое слово строки должно быть началом одной из колонок fields.
+    Возвращает None, если в строке нет слов.
+    """
+    condition = None
+    for word in search_words(search_term):
+        word_condition = prefix_condition(fields[0], word)
+        for field in fields[1:]:
+            word_condition |= prefix_condition(field, word)
+        condition = word_condition if condition is None else condition & word_condition
+    return condition
+
+
+def fts5_supported(database) -> bool:
+    """Собран ли SQLite с поддержкой FTS5"""
+    options = [row[0] for row in database.execute_sql('PRAGMA compile_options').fetchall()]
+    return 'ENABLE_FTS5' in options
+
+
+def create_fts_index(database, fts_table: str, columns: List[str] = None):
+    """
+    Создать индекс FTS5, триггеры синхронизации и заполнить индекс
+
+    columns по умолчанию берутся из FTS_TABLES; миграции передают свой
+    список, чтобы не зависеть от последующих изменений FTS_TABLES.
+    """
+    table, key, default_columns = FTS_TABLES[fts_table]
+    columns = columns or default_columns
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+
+    database.execute_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='{key}', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    database.execute_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.{key}, {new_values}); END"
+    )
+    database.execute_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.{key}, {old_values}); END"
+    )
+    database.execute_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.{key}, {old_values}); "
+        f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.{key}, {new_values}); END"
+    )
+    database.execute_sql(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    _available_indexes.pop(database.database, None)
+
+
+def drop_fts_index(database, fts_table: str):
+    """Удалить индекс FTS5 вместе с триггерами синхронизации"""
+    for suffix in ('ai', 'ad', 'au'):
+        database.execute_sql(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+    database.execute_sql(f"DROP TABLE IF EXISTS {fts_table}")
+    _available_indexes.pop(database.database, None)
+
+
+def fts_available(database, fts_table: str) -> bool:
+    """Есть ли в базе индекс FTS5"""
+    if database.database not in _available_indexes:
+        _available_indexes[database.database] = set(database.get_tables()) & set(FTS_TABLES)
+    return fts_table in _available_indexes[database.database]
+
+
+def search_words(search_term: str) -> List[str]:
+    """Нормализованные слова строки поиска: "Фёдор Ив" -> ['федор', 'ив']"""
+    return re.findall(r'\w+', normalize_name(search_term))
+
+
+def match_expression(search_term: str) -> Optional[str]:
+    """
+    Преобразовать строку поиска в запрос FTS5
+
+    Каждое слово ищется как префикс, слова объединяются через AND:
+    "Иван Пет" -> '"иван"* "пет"*'. Возвращает None, если в строке нет слов.
+    """
+    words = search_words(search_term)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def fts_search(query, model, fts_table: str, search_term: str, substring_fields: list = ()):
+    """
+    Ограничить запрос модели результатами полнотекстового поиска
+
+    Индекс находит слова только по началу, поэтому колонки substring_fields
+    (телефон, email) дополнительно ищутся по подстроке: "45-67" находит
+    "+7 (912) 345-67-89". Такие строки идут после найденных индексом.
+
+    Returns:
+        запрос, отсортированный по релевантности, или None, если индекс
+        недоступен либо строку поиска нельзя выразить запросом FTS5
+    """
+    database = model._meta.database
+    match = match_expression(search_term)
+    if match is None or not fts_available(database, fts_table):
+        return None
+
+    index = Table(fts_table)
+    key = model._meta.primary_key
+    if not substring_fields:
+        return (query
+                .join_from(model, index, on=(index.c.rowid == key))
+                .where(Expression(getattr(index.c, fts_table), 'MATCH', match))
+                .order_by(index.c.rank, model.last_name, model.first_name))
+
+    # MATCH нельзя объединить через OR с другими условиями: совпадения
+    # индекса — подзапрос, присоединенный слева
+    matches = (index
+               .select(index.c.rowid.alias('rowid'), index.c.rank.alias('rank'))
+               .where(Expression(getattr(index.c, fts_table), 'MATCH', match))
+               .alias('matches'))
+    pattern = f"%{search_term.strip()}%"
+    condition = matches.c.rowid.is_null(False)
+    for field in substring_fields:
+        condition |= (field ** pattern)
+    return (query
+            .join_from(model, matches, JOIN.LEFT_OUTER, on=(matches.c.rowid == key))
+            .where(condition)
+            .order_by(matches.c.rank.is_null(), matches.c.rank, model.last_name, model.first_name))
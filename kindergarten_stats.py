@@ -1,8 +1,9 @@
 """
 Модуль для работы со статистикой детского сада
 """
+from datetime import date
 from typing import List
-from peewee import fn, Case, JOIN
+from peewee import fn, Case, JOIN, Select
 
 
 # Импортируем модели локально чтобы избежать циклических зависимостей
@@ -11,6 +12,15 @@ def get_models():
     return Child, Group, Teacher
 
 
+def children_count_columns(Child) -> list:
+    """Агрегаты по детям группы: всего, мальчиков, девочек"""
+    return [
+        fn.COUNT(Child.child_id).alias('children_count'),
+        fn.SUM(Case(None, [(Child.gender == 'М', 1)], 0)).alias('boys_count'),
+        fn.SUM(Case(None, [(Child.gender == 'Ж', 1)], 0)).alias('girls_count')
+    ]
+
+
 class KindergartenStatistics:
     """Класс для получения статистики детского сада"""
     
@@ -23,9 +33,7 @@ class KindergartenStatistics:
                     Group.group_id,
                     Group.group_name,
                     Group.age_category,
-                    fn.COUNT(Child.child_id).alias('children_count'),
-                    fn.SUM(Case(None, [(Child.gender == 'М', 1)], 0)).alias('boys_count'),
-                    fn.SUM(Case(None, [(Child.gender == 'Ж', 1)], 0)).alias('girls_count')
+                    *children_count_columns(Child)
                 )
                 .join(Child, JOIN.LEFT_OUTER)
                 .group_by(Group.group_id, Group.group_name, Group.age_category)
@@ -115,4 +123,50 @@ class KindergartenStatistics:
             'total_groups': total_groups,
             'total_teachers': total_teachers,
             'average_age': round(average_age or 0, 1)
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    def get_dashboard_summary(today: str = None) -> dict:
+        """
+        Получить все счетчики главной страницы одним запросом
+        
+        Args:
+            today: дата в формате YYYY-MM-DD (по умолчанию сегодня)
+        
+        Returns:
+            словарь с total_children, total_groups, total_teachers,
+            total_parents и present_today
+        """
+        Child, Group, Teacher = get_models()
+        from database import db, Parent, AttendanceRecord
+        today = today or date.today().strftime("%Y-%m-%d")
+        
+        # Дети в группах без отметки считаются присутствующими,
+        # поэтому из них вычитаются отметки "не присутствует" на дату
+        children_in_groups = Child.select(fn.COUNT(Child.child_id)).where(Child.group.is_null(False))
+        not_present_today = (AttendanceRecord
+                             .select(fn.COUNT(AttendanceRecord.record_id))
+                             .join(Child)
+                             .where(
+                                 (AttendanceRecord.date == today) &
+                                 (AttendanceRecord.status != 'Присутствует') &
+                                 (Child.group.is_null(False))
+                             ))
+        
+        query = Select(columns=[
+            Child.select(fn.COUNT(Child.child_id)).alias('total_children'),
+            Group.select(fn.COUNT(Group.group_id)).alias('total_groups'),
+            Teacher.select(fn.COUNT(Teacher.teacher_id)).alias('total_teachers'),
+            Parent.select(fn.COUNT(Parent.parent_id)).alias('total_parents'),
+            children_in_groups.alias('children_in_groups'),
+            not_present_today.alias('not_present_today')
+        ]).bind(db)
+        
+        row = query.dicts().get()
+        return {
+            'total_children': row['total_children'],
+            'total_groups': row['total_groups'],
+            'total_teachers': row['total_teachers'],
+            'total_parents': row['total_parents'],
+            'present_today': row['children_in_groups'] - row['not_present_today']
+        }
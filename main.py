@@ -2,20 +2,28 @@
 Главный файл приложения
 """
 import flet as ft
+import importlib
 import os
-from database import KindergartenDB
-from view.children_view import ChildrenView
-from view.groups_view import GroupsView
-from view.teachers_view import TeachersView
-from view.parents_view import ParentsView
-from view.attendance_view import AttendanceView
-from view.electronic_journal_view import ElectronicJournalView
-from view.events_view import EventsView
-from view.settings_view import SettingsView
-from view.home_view import HomeView
+from database import get_database
+from db_worker import get_worker
+from update_scheduler import request_update, update_now, get_scheduler
 from view.login_view import LoginView
 from navigation_drawer import AppNavigationDrawer
-from settings.config import APP_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, DATABASE_NAME
+from settings.config import APP_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, DATABASE_NAME, RESIZE_THROTTLE_MS, PROFILER_ENABLED
+
+# Представления: имя -> (модуль, класс, метод загрузки данных).
+# Модуль импортируется при первом переходе к представлению
+VIEW_CLASSES = {
+    "home": ("view.home_view", "HomeView", "load_home"),
+    "children": ("view.children_view", "ChildrenView", "refresh"),
+    "groups": ("view.groups_view", "GroupsView", "load_groups"),
+    "teachers": ("view.teachers_view", "TeachersView", "load_teachers"),
+    "parents": ("view.parents_view", "ParentsView", "load_parents"),
+    "attendance": ("view.attendance_view", "AttendanceView", "refresh"),
+    "electronic_journal": ("view.electronic_journal_view", "ElectronicJournalView", "refresh"),
+    "events": ("view.events_view", "EventsView", "load_events"),
+    "settings": ("view.settings_view", "SettingsView", "load_settings"),
+}
 
 
 def main(page: ft.Page):
@@ -27,12 +35,12 @@ def main(page: ft.Page):
     page.window.height = WINDOW_HEIGHT
     page.padding = 0
     
-    # Обработчик изменения размера окна
+    # Единое подключение к базе данных на весь процесс
+    db = get_database(DATABASE_NAME)
+    
+    # Обработчик изменения размера окна: обновления во время перетаскивания ограничены
     def on_resize(e):
-        try:
-            page.update()
-        except:
-            pass
+        request_update(page, action="resize", throttle_ms=RESIZE_THROTTLE_MS)
     
     page.on_resized = on_resize
     
@@ -83,7 +91,7 @@ def main(page: ft.Page):
         
         # Обновляем цвет заголовка в зависимости от темы
         header_container.bgcolor = ft.Colors.ON_SURFACE_VARIANT
-        page.update()
+        request_update(page, action="toggle_theme")
 
     theme_switch = ft.Switch(
         label="Тема приложения",
@@ -94,130 +102,93 @@ def main(page: ft.Page):
     
     def show_login():
         """Показать экран авторизации"""
-        # Инициализируем базу данных для авторизации
-        db = KindergartenDB(DATABASE_NAME)
-        db.connect()
-        db.create_tables()
-        
         page.controls.clear()
         login_view = LoginView(show_main_app, db, page)
         page.add(login_view)
-        page.update()
     
     def show_main_app():
         """Показать основное приложение"""
         page.controls.clear()
-        init_main_app(page, header_container, theme_switch)
-        page.update()
+        init_main_app(page, db, header_container, theme_switch)
+    
+    if PROFILER_ENABLED:
+        # Отчет по обновлениям страницы вместе с отчетом профилировщика запросов
+        import atexit
+        atexit.register(lambda: print(get_scheduler(page).format_report()))
     
     # Всегда показываем экран авторизации при запуске
     show_login()
 
-def init_main_app(page, header_container, theme_switch):
+def init_main_app(page, db, header_container, theme_switch):
     """Инициализация основного приложения"""
-    # Инициализация базы данных
-    db = KindergartenDB(DATABASE_NAME)
-    db.connect()
-    db.create_tables()
-    
     # Контейнер для текущего представления
     content_container = ft.Container(expand=True, key="content_container")
     
-    # Создаем представления
-    home_view = HomeView(db, lambda: refresh_current_view(), page)
-    children_view = ChildrenView(db, lambda: refresh_current_view(), page)
-    groups_view = GroupsView(db, lambda: refresh_current_view(), page)
-    teachers_view = TeachersView(db, lambda: refresh_current_view())
-    parents_view = ParentsView(db, lambda: refresh_current_view(), page)
-    attendance_view = AttendanceView(db, lambda: refresh_current_view(), page)
-    events_view = EventsView(db, lambda: refresh_current_view(), page)
-    settings_view = SettingsView(page, theme_switch)
-    
-    # Создаем electronic_journal_view после добавления страницы
-    electronic_journal_view = None
+    # Представления создаются при первом переходе (см. VIEW_CLASSES)
+    views = {}
+    
+    # Текущее представление (имя)
+    current_view = [None]
+    
+    # Виден, пока данные представления загружаются в фоне
+    loading_bar = ft.ProgressBar(visible=False)
+    
+    def get_view(view_name):
+        """Представление по имени; создается при первом обращении"""
+        if view_name not in views:
+            module_name, class_name, _ = VIEW_CLASSES[view_name]
+            view_class = getattr(importlib.import_module(module_name), class_name)
+            if view_name == "settings":
+                views[view_name] = view_class(page, theme_switch)
+            else:
+                views[view_name] = view_class(db, refresh_current_view, page)
+        return views[view_name]
+    
+    def load_view(view_name):
+        """Загрузить данные представления, если оно все еще показано"""
+        if current_view[0] != view_name:
+            return
+        loader = VIEW_CLASSES[view_name][2]
+        try:
+            getattr(views[view_name], loader)()
+        except Exception as ex:
+            print(f"Ошибка загрузки данных ({view_name}): {ex}")
     
-    # Текущее представление
-    current_view = [home_view]
+    def submit_load(view_name):
+        """Загрузить данные представления в пуле запросов к базе; страница обновится по готовности"""
+        return get_worker().submit(page, lambda: load_view(view_name), loading=loading_bar, key="view")
     
     def refresh_current_view():
         """Обновить текущее представление"""
-        if current_view[0] == home_view:
-            home_view.load_home()
-        elif current_view[0] == children_view:
-            children_view.load_children()
-        elif current_view[0] == groups_view:
-            groups_view.load_groups()
-        elif current_view[0] == teachers_view:
-            teachers_view.load_teachers()
-        elif current_view[0] == parents_view:
-            parents_view.load_parents()
-        elif current_view[0] == attendance_view:
-            attendance_view.load_attendance()
-        elif current_view[0] == electronic_journal_view:
-            if hasattr(electronic_journal_view, 'build_journal'):
-                electronic_journal_view.build_journal()
-        elif current_view[0] == settings_view:
-            settings_view.load_settings()
+        if current_view[0]:
+            submit_load(current_view[0])
     
     def switch_view(view_name, e=None):
         """Переключить представление"""
-        view_map = {
-            "home": home_view,
-            "children": children_view,
-            "groups": groups_view,
-            "teachers": teachers_view,
-            "parents": parents_view,
-            "attendance": attendance_view,
-            "electronic_journal": electronic_journal_view,
-            "events": events_view,
-            "settings": settings_view
-        }
-        
-        view = view_map.get(view_name)
-        if not view:
+        if view_name not in VIEW_CLASSES:
             return
-            
-        current_view[0] = view
-        content_container.content = view
-        
-        # Загрузить данные для представления
-        if view == home_view:
-            home_view.load_home()
-        elif view == children_view:
-            children_view.load_children()
-        elif view == groups_view:
-            groups_view.load_groups()
-        elif view == teachers_view:
-            teachers_view.load_teachers()
-        elif view == parents_view:
-            parents_view.load_parents()
-        elif view == attendance_view:
-            attendance_view.load_attendance()
-        elif view == electronic_journal_view:
-            electronic_journal_view.page = page
-            if hasattr(electronic_journal_view, 'build_journal'):
-                electronic_journal_view.build_journal()
-        elif view == events_view:
-            events_view.load_events()
-        elif view == settings_view:
-            settings_view.load_settings()
         
+        view = get_view(view_name)
+        current_view[0] = view_name
+        content_container.content = view
         page.drawer.open = False
-        page.update()
-
-
+        # Представление должно быть на клиенте до загрузки в него данных
+        update_now(page, action="switch_view")
+        
+        # Данные загружаются после показа экрана, в фоновом потоке
+        submit_load(view_name)
 
     page.drawer = AppNavigationDrawer(switch_view)
     
     # Добавляем элементы на страницу
-    page.add(header_container, ft.Divider(), content_container)
-    
-    # Создаем electronic_journal_view после инициализации страницы
-    electronic_journal_view = ElectronicJournalView(db, lambda: refresh_current_view(), page)
+    page.add(header_container, ft.Divider(), loading_bar, content_container)
     
     # Загружаем начальное представление
     switch_view("home")
 
 
 if __name__ == "__main__":
+    # База открывается (и при необходимости мигрирует) один раз при запуске процесса,
+    # до первой сессии
+    get_database(DATABASE_NAME)
     ft.app(target=main)
@@ -0,0 +1,310 @@
+"""
+Миграции схемы базы данных
+
+Версия схемы хранится в PRAGMA user_version файла базы. Каждая миграция
+получает номер версии и применяется ровно один раз: при запуске
+выполняются только миграции с номером больше текущей версии, каждая
+в своей транзакции вместе с записью нового user_version. Если версия
+актуальна, никаких DDL-запросов не выполняется.
+
+Новая миграция добавляется в конец файла:
+
+    @migration(<следующая версия>, "Описание")
+    def my_migration(database):
+        ...
+"""
+from collections import namedtuple
+from datetime import datetime
+from typing import Callable, List
+
+from peewee import (AutoField, CharField, Check, CompositeKey, DateField, DateTimeField, FloatField,
+                    ForeignKeyField, IntegerField, Model, TextField)
+
+Migration = namedtuple('Migration', ['version', 'description', 'apply'])
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, description: str):
+    """Декоратор регистрации миграции"""
+    def decorator(func: Callable):
+        if MIGRATIONS and version <= MIGRATIONS[-1].version:
+            raise ValueError(f"Миграции должны идти по возрастанию версий: {version}")
+        MIGRATIONS.append(Migration(version, description, func))
+        return func
+    return decorator
+
+
+def get_schema_version(database) -> int:
+    """Текущая версия схемы (PRAGMA user_version)"""
+    return database.pragma('user_version')
+
+
+def get_latest_version() -> int:
+    """Версия схемы после применения всех миграций"""
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def run_migrations(database) -> int:
+    """
+    Применить недостающие миграции
+
+    Args:
+        database: база данных Peewee
+
+    Returns:
+        количество примененных миграций
+    """
+    current_version = get_schema_version(database)
+    if current_version >= get_latest_version():
+        return 0
+
+    applied = 0
+    for step in MIGRATIONS:
+        if step.version <= current_version:
+            continue
+        with database.atomic():
+            step.apply(database)
+            database.pragma('user_version', step.version)
+        print(f"Применена миграция {step.version}: {step.description}")
+        applied += 1
+    return applied
+
+
+def add_index(database, model, columns: List[str], unique: bool = False, name: str = None):
+    """Создать индекс по колонкам модели, если его еще нет"""
+    fields = [getattr(model, column) for column in columns]
+    index = model.index(*fields, unique=unique, name=name)
+    database.execute(index.safe(True))
+
+
+def add_column(database, model, column: str):
+    """Добавить колонку модели в таблицу, если ее еще нет"""
+    from playhouse.migrate import SqliteMigrator, migrate
+    table_name = model._meta.table_name
+    if column in {existing.name for existing in database.get_columns(table_name)}:
+        return
+    migrate(SqliteMigrator(database).add_column(table_name, column, model._meta.fields[column]))
+
+
+def rebuild_table(database, model):
+    """
+    Пересоздать таблицу по текущему описанию модели с сохранением данных
+
+    Нужна для изменений, которые SQLite не умеет делать через ALTER TABLE
+    (ограничения, типы колонок). Порядок шагов — как рекомендует документация
+    SQLite: новая таблица, копирование общих колонок, удаление старой,
+    переименование новой, пересоздание индексов. Триггеры таблицы
+    (например, синхронизации FTS из fulltext.py) удаляются вместе со старой
+    таблицей — их нужно создать заново в той же миграции.
+    """
+    table_name = model._meta.table_name
+    new_table_name = f"{table_name}__new"
+    old_columns = {column.name for column in database.get_columns(table_name)}
+    common_columns = ', '.join(
+        f'"{field.column_name}"' for field in model._meta.sorted_fields
+        if field.column_name in old_columns
+    )
+
+    model._meta.set_table_name(new_table_name)
+    try:
+        model._schema.create_table(safe=False)
+    finally:
+        model._meta.set_table_name(table_name)
+
+    database.execute_sql(
+        f'INSERT INTO "{new_table_name}" ({common_columns}) SELECT {common_columns} FROM "{table_name}"'
+    )
+    database.execute_sql(f'DROP TABLE "{table_name}"')
+    database.execute_sql(f'ALTER TABLE "{new_table_name}" RENAME TO "{table_name}"')
+    model._schema.create_indexes(safe=True)
+
+
+def baseline_models(target_database) -> list:
+    """
+    Таблицы начальной схемы (миграция 1)
+
+    Копия моделей database.py на момент появления миграций: миграция 1
+    не должна меняться вместе с моделями, иначе на старой базе она создаст
+    индексы по колонкам, которые добавляют только следующие миграции.
+    """
+    class BaselineModel(Model):
+        class Meta:
+            database = target_database
+
+    class Teacher(BaselineModel):
+        teacher_id = AutoField(primary_key=True)
+        last_name = CharField(null=False)
+        first_name = CharField(null=False)
+        middle_name = CharField(null=True)
+        phone = CharField(null=True)
+        email = CharField(null=True)
+        birth_date = CharField(null=True)
+        address = TextField(null=True)
+        education = TextField(null=True)
+        experience = IntegerField(null=True)
+        created_at = DateTimeField(default=datetime.now)
+
+        class Meta:
+            table_name = 'teachers'
+
+    class Group(BaselineModel):
+        group_id = AutoField(primary_key=True)
+        group_name = CharField(null=False)
+        age_category = CharField(null=False)
+        teacher = ForeignKeyField(Teacher, null=True, column_name='teacher_id')
+        created_at = DateTimeField(default=datetime.now)
+
+        class Meta:
+            table_name = 'groups'
+
+    class Parent(BaselineModel):
+        parent_id = AutoField(primary_key=True)
+        last_name = CharField(null=False)
+        first_name = CharField(null=False)
+        middle_name = CharField(null=True)
+        phone = CharField(null=True)
+        email = CharField(null=True)
+        address = CharField(null=True)
+        created_at = DateTimeField(default=datetime.now)
+
+        class Meta:
+            table_name = 'parents'
+
+    class Child(BaselineModel):
+        child_id = AutoField(primary_key=True)
+        last_name = CharField(null=False)
+        first_name = CharField(null=False)
+        middle_name = CharField(null=True)
+        birth_date = DateField(null=False)
+        gender = CharField(null=False, constraints=[Check("gender IN ('М', 'Ж')")])
+        group = ForeignKeyField(Group, null=True, column_name='group_id')
+        enrollment_date = DateField(null=False)
+        created_at = DateTimeField(default=datetime.now)
+
+        class Meta:
+            table_name = 'children'
+            indexes = (
+                (('last_name', 'first_name'), False),
+            )
+
+    class ParentChild(BaselineModel):
+        parent = ForeignKeyField(Parent, column_name='parent_id')
+        child = ForeignKeyField(Child, column_name='child_id')
+        relationship = CharField(null=False)
+        created_at = DateTimeField(default=datetime.now)
+
+        class Meta:
+            table_name = 'parent_child'
+            primary_key = CompositeKey('parent', 'child')
+
+    class AttendanceRecord(BaselineModel):
+        record_id = AutoField(primary_key=True)
+        child = ForeignKeyField(Child, column_name='child_id')
+        date = DateField(null=False)
+        status = CharField(null=False)
+        notes = TextField(null=True)
+        created_at = DateTimeField(default=datetime.now)
+        updated_at = DateTimeField(default=datetime.now)
+
+        class Meta:
+            table_name = 'attendance_records'
+            indexes = (
+                (('child', 'date'), True),
+            )
+
+    class MedicalRecord(BaselineModel):
+        record_id = AutoField(primary_key=True)
+        child = ForeignKeyField(Child, column_name='child_id')
+        blood_type = CharField(null=True)
+        allergies = TextField(null=True)
+        chronic_diseases = TextField(null=True)
+        vaccinations = TextField(null=True)
+        height = FloatField(null=True)
+        weight = FloatField(null=True)
+        doctor_notes = TextField(null=True)
+        emergency_contact = CharField(null=True)
+        last_checkup = DateField(null=True)
+        created_at = DateTimeField(default=datetime.now)
+        updated_at = DateTimeField(default=datetime.now)
+
+        class Meta:
+            table_name = 'medical_records'
+
+    class User(BaselineModel):
+        user_id = AutoField(primary_key=True)
+        username = CharField(unique=True, null=False)
+        password = CharField(null=False)
+        role = CharField(default='admin')
+        created_at = DateTimeField(default=datetime.now)
+
+        class Meta:
+            table_name = 'users'
+
+    return [Teacher, Group, Parent, Child, ParentChild, AttendanceRecord, MedicalRecord, User]
+
+
+@migration(1, "Начальная схема")
+def initial_schema(database):
+    from database import create_default_admin
+    database.create_tables(baseline_models(database))
+    create_default_admin()
+
+
+@migration(2, "Индексы для списков, групп и посещаемости")
+def hot_query_indexes(database):
+    from database import Teacher, Group, Parent, Child, AttendanceRecord
+    add_index(database, Teacher, ['last_name', 'first_name'])
+    add_index(database, Group, ['group_name'])
+    add_index(database, Parent, ['last_name', 'first_name'])
+    add_index(database, Child, ['group', 'last_name', 'first_name'])
+    add_index(database, AttendanceRecord, ['date', 'status'])
+
+
+@migration(3, "Полнотекстовые индексы FTS5 для поиска")
+def fulltext_indexes(database):
+    from fulltext import fts5_supported, create_fts_index
+    if not fts5_supported(database):
+        print("SQLite собран без FTS5, поиск будет использовать LIKE")
+        return
+    person_columns = ['last_name', 'first_name', 'middle_name', 'phone', 'email']
+    create_fts_index(database, 'children_fts', ['last_name', 'first_name'])
+    create_fts_index(database, 'parents_fts', person_columns)
+    create_fts_index(database, 'teachers_fts', person_columns)
+
+
+@migration(4, "Нормализованные колонки имен для поиска без учета регистра и ё")
+def normalized_name_columns(database):
+    from database import Teacher, Parent, Child
+    from fulltext import fill_normalized_columns, create_fts_index, drop_fts_index
+    normalized_columns = {
+        Teacher: ['last_name', 'first_name', 'middle_name'],
+        Parent: ['last_name', 'first_name', 'middle_name'],
+        Child: ['last_name', 'first_name'],
+    }
+    person_columns = ['last_name_norm', 'first_name_norm', 'middle_name_norm', 'phone', 'email']
+    fts_columns = {
+        'children_fts': ['last_name_norm', 'first_name_norm'],
+        'parents_fts': person_columns,
+        'teachers_fts': person_columns,
+    }
+    # Полнотекстовые индексы переводятся на нормализованные колонки: старые
+    # удаляются до изменения таблиц, чтобы их триггеры не срабатывали на заполнение
+    rebuild_fts = [fts_table for fts_table in fts_columns if fts_table in database.get_tables()]
+    for fts_table in rebuild_fts:
+        drop_fts_index(database, fts_table)
+
+    for model, columns in normalized_columns.items():
+        table_name = model._meta.table_name
+        # Колонки *_norm заполняет приложение; триггеры с функцией normalize_name
+        # из ранней версии этой миграции не давали другим клиентам SQLite менять имена
+        database.execute_sql(f"DROP TRIGGER IF EXISTS {table_name}_norm_ai")
+        database.execute_sql(f"DROP TRIGGER IF EXISTS {table_name}_norm_au")
+        for column in columns:
+            add_column(database, model, f'{column}_norm')
+        add_index(database, model, ['last_name_norm'])
+        add_index(database, model, ['first_name_norm'])
+        fill_normalized_columns(database, table_name, columns)
+
+    for fts_table in rebuild_fts:
+        create_fts_index(database, fts_table, fts_columns[fts_table])
@@ -3,6 +3,7 @@
 """
 import flet as ft
 from typing import Callable
+from update_scheduler import request_update
 
 
 class AppNavigationDrawer(ft.NavigationDrawer):
@@ -77,4 +78,4 @@ class AppNavigationDrawer(ft.NavigationDrawer):
         """Обработчик изменения состояния drawer"""
         self.open = False
         if self.page:
-            self.page.update()
\ No newline at end of file
+            request_update(self.page)
\ No newline at end of file
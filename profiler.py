@@ -0,0 +1,144 @@
+"""
+Профилировщик запросов фасада KindergartenDB
+
+Включается явно (KindergartenDB.enable_profiler или PROFILER_ENABLED
+в settings/config.py). Для каждого метода фасада собирает число вызовов,
+суммарное время и 95-й перцентиль, выполненные SQL-запросы и число
+возвращенных строк. Запросы дольше порога пишутся в журнал медленных
+запросов. Отчет — report() (список словарей) или format_report() (текст).
+
+Время SQL — выполнение запроса курсором; чтение строк и построение
+словарей входят только во время метода, поэтому большая разница между
+ними указывает на дорогую обработку результата, а не на сам запрос.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, List, Optional
+
+from settings.config import SLOW_QUERY_LOG, SLOW_QUERY_MS
+
+# Запросы, выполненные не из метода фасада (миграции, представления напрямую)
+OUTSIDE_FACADE = "<вне фасада>"
+
+# Сколько последних длительностей хранить для перцентиля
+DURATION_SAMPLES = 1000
+
+
+class MethodStats:
+    """Статистика одного метода фасада"""
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.durations = deque(maxlen=DURATION_SAMPLES)
+        self.rows = 0
+        self.statements = Counter()
+        self.sql_time = 0.0
+
+    def p95(self) -> float:
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        return ordered[math.ceil(len(ordered) * 0.95) - 1]
+
+
+class QueryProfiler:
+    """Сбор статистики по методам фасада и SQL-запросам"""
+
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS, log_path: Optional[str] = SLOW_QUERY_LOG):
+        self.slow_query_ms = slow_query_ms
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._current = threading.local()
+        self.slow_log = logging.getLogger("kindergarten.slow_queries")
+        if log_path and not any(getattr(handler, 'baseFilename', None) == os.path.abspath(log_path)
+                                for handler in self.slow_log.handlers):
+            handler = logging.FileHandler(log_path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.slow_log.addHandler(handler)
+            self.slow_log.setLevel(logging.INFO)
+
+    def _method_stats(self, name: str) -> MethodStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = MethodStats()
+        return stats
+
+    def call(self, name: str, func: Callable, args: tuple, kwargs: dict):
+        """Вызвать метод фасада, записав время, запросы и число строк"""
+        outer = getattr(self._current, 'method', None)
+        self._current.method = name
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._current.method = outer
+            with self._lock:
+                stats = self._method_stats(name)
+                stats.calls += 1
+                stats.total += elapsed
+                stats.durations.append(elapsed)
+        with self._lock:
+            stats.rows += _count_rows(result)
+        return result
+
+    def record_statement(self, sql: str, params, elapsed: float):
+        """Учесть SQL-запрос (вызывается из KindergartenSqliteDatabase.execute_sql)"""
+        method = getattr(self._current, 'method', None) or OUTSIDE_FACADE
+        with self._lock:
+            stats = self._method_stats(method)
+            stats.statements[sql] += 1
+            stats.sql_time += elapsed
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= self.slow_query_ms:
+            self.slow_log.info("%.1f мс [%s] %s %r", elapsed_ms, method, sql, tuple(params or ()))
+
+    def reset(self):
+        """Очистить собранную статистику"""
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> List[dict]:
+        """Статистика по методам, самые затратные (по суммарному времени) первыми"""
+        with self._lock:
+            rows = [
+                {
+                    'method': name,
+                    'calls': stats.calls,
+                    'total_ms': stats.total * 1000,
+                    'avg_ms': stats.total * 1000 / stats.calls if stats.calls else 0.0,
+                    'p95_ms': stats.p95() * 1000,
+                    'sql_count': sum(stats.statements.values()),
+                    'sql_ms': stats.sql_time * 1000,
+                    'rows': stats.rows,
+                    'statements': stats.statements.most_common(),
+                }
+                for name, stats in self._stats.items()
+            ]
+        return sorted(rows, key=lambda row: max(row['total_ms'], row['sql_ms']), reverse=True)
+
+    def format_report(self, limit: int = 20) -> str:
+        """Отчет в виде текстовой таблицы"""
+        lines = [f"{'Метод':<36} {'Вызовы':>7} {'Всего, мс':>10} {'p95, мс':>8} {'SQL':>6} {'SQL, мс':>8} {'Строк':>8}"]
+        for row in self.report()[:limit]:
+            lines.append(
+                f"{row['method']:<36} {row['calls']:>7} {row['total_ms']:>10.1f} {row['p95_ms']:>8.1f} "
+                f"{row['sql_count']:>6} {row['sql_ms']:>8.1f} {row['rows']:>8}"
+            )
+        return "\n".join(lines)
+
+
+def _count_rows(result) -> int:
+    """Число строк в результате метода: длина списка, сумма списков словаря, 1 для одной записи"""
+    if result is None or isinstance(result, bool):
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict) and result and all(isinstance(value, list) for value in result.values()):
+        return sum(len(value) for value in result.values())
+    return 1
@@ -1,7 +1,9 @@
 from peewee import *
 from typing import List, Optional
-from datetime import datetime
-from database import AttendanceRecord, Child, Group, JOIN, DoesNotExist
+from datetime import datetime, date
+import calendar
+from database import db, AttendanceRecord, Child, Group, JOIN, DoesNotExist
+from settings.models import fetch_rows, AttendanceRow
 
 
 class AttendanceSettings:
@@ -18,39 +20,108 @@ class AttendanceSettings:
     
     def update_attendance_record(self, child_id: int, date: str, status: str, notes: str = None):
         """Обновить запись о посещаемости"""
-        try:
-            record = AttendanceRecord.get(
-                (AttendanceRecord.child == child_id) & 
-                (AttendanceRecord.date == date)
-            )
-            record.status = status
-            record.notes = notes
-            record.updated_at = datetime.now()
-            record.save()
-        except DoesNotExist:
-            self.add_attendance_record(child_id, date, status, notes)
+        self.bulk_upsert_attendance([(child_id, date, status, notes)])
     
-    def get_attendance_by_group_and_date(self, group_id: int, date: str, children_settings):
+    def bulk_upsert_attendance(self, records: List[tuple]) -> int:
+        """
+        Массово записать посещаемость одной транзакцией
+        
+        Существующие записи (child_id, date) обновляются,
+        недостающие создаются (INSERT ... ON CONFLICT DO UPDATE).
+        
+        Args:
+            records: список кортежей (child_id, date, status, notes)
+        
+        Returns:
+            количество записанных отметок
+        """
+        now = datetime.now()
+        rows = [
+            {
+                'child': child_id,
+                'date': date,
+                'status': status,
+                'notes': notes,
+                'created_at': now,
+                'updated_at': now
+            }
+            for child_id, date, status, notes in records
+        ]
+        
+        with db.atomic():
+            # По 100 строк, чтобы не превысить лимит параметров SQLite
+            for start in range(0, len(rows), 100):
+                (AttendanceRecord
+                 .insert_many(rows[start:start + 100])
+                 .on_conflict(
+                     conflict_target=[AttendanceRecord.child, AttendanceRecord.date],
+                     update={
+                         AttendanceRecord.status: EXCLUDED.status,
+                         AttendanceRecord.notes: EXCLUDED.notes,
+                         AttendanceRecord.updated_at: EXCLUDED.updated_at
+                     }
+                 )
+                 .execute())
+        
+        return len(rows)
+    
+    def get_attendance_by_group_and_date(self, group_id: int, date: str, children_settings) -> List[AttendanceRow]:
         """Получить посещаемость группы на дату"""
+        # Один запрос: дети группы LEFT JOIN отметки на дату,
+        # отсутствующая отметка означает 'Присутствует'
+        children = (children_settings._list_query()
+                    .select_extend(
+                        fn.COALESCE(AttendanceRecord.status, 'Присутствует').alias('status'),
+                        fn.COALESCE(AttendanceRecord.notes, '').alias('notes'),
+                        AttendanceRecord.record_id
+                    )
+                    .switch(Child)
+                    .join(AttendanceRecord, JOIN.LEFT_OUTER, on=(
+                        (AttendanceRecord.child == Child.child_id) &
+                        (AttendanceRecord.date == date)
+                    ))
+                    .where(Child.group == group_id)
+                    .order_by(Child.last_name, Child.first_name))
+        return fetch_rows(children, AttendanceRow)
+    
+    def get_attendance_matrix(self, group_id: int, year: int, month: int, children_settings) -> List[AttendanceRow]:
+        """
+        Получить посещаемость группы за месяц (ребенок × день)
+        
+        Args:
+            group_id: ID группы
+            year: год
+            month: месяц (1-12)
+            children_settings: настройки для получения детей группы
+        
+        Returns:
+            список детей группы, у каждого ключ 'days' — словарь {день: статус}
+            на каждый день месяца (по умолчанию 'Присутствует')
+        """
+        days_in_month = calendar.monthrange(year, month)[1]
         children = children_settings.get_children_by_group(group_id)
-        result = []
         
+        # Один диапазонный запрос по всем отметкам группы за месяц
+        records = (AttendanceRecord
+                   .select(AttendanceRecord.child, AttendanceRecord.date, AttendanceRecord.status)
+                   .join(Child)
+                   .where(
+                       (Child.group == group_id) &
+                       (AttendanceRecord.date.between(date(year, month, 1), date(year, month, days_in_month)))
+                   )
+                   .tuples())
+        
+        statuses = {}
+        for child_id, record_date, status in records:
+            day = record_date.day if hasattr(record_date, 'day') else int(str(record_date)[8:10])
+            statuses[(child_id, day)] = status
+        
+        result = []
         for child in children:
-            try:
-                record = AttendanceRecord.get(
-                    (AttendanceRecord.child == child['child_id']) & 
-                    (AttendanceRecord.date == date)
-                )
-                child_data = child.copy()
-                child_data['status'] = record.status
-                child_data['notes'] = record.notes or ''
-                child_data['record_id'] = record.record_id
-            except DoesNotExist:
-                child_data = child.copy()
-                child_data['status'] = 'Присутствует'
-                child_data['notes'] = ''
-                child_data['record_id'] = None
-            
-            result.append(child_data)
-        
-        return result
\ No newline at end of file
+            days = {
+                day: statuses.get((child['child_id'], day), 'Присутствует')
+                for day in range(1, days_in_month + 1)
+            }
+            result.append(AttendanceRow(**child, days=days))
+        
+        return result
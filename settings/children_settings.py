@@ -1,6 +1,9 @@
 from peewee import *
-from typing import List, Optional
+from typing import Dict, List, Optional
 from database import Child, Group, JOIN
+from fulltext import fts_search, normalized_prefix_condition
+from settings.config import LIST_PAGE_SIZE
+from settings.models import keyset_page, first_letters, fetch_rows, ChildRow, or_empty, iso_datetime
 
 
 class ChildrenSettings:
@@ -35,49 +38,90 @@ class ChildrenSettings:
         )
         return child.child_id
     
-    def get_all_children(self) -> List[dict]:
+    def _list_query(self):
+        """
+        Запрос детей для списков: только колонки записи ребенка (см. _child_to_row)
+        
+        Значения приводятся к нужному виду в SQL, строки читаются через
+        fetch_rows без создания моделей Child и Group. У детей без группы
+        group_id, group_name и age_category — None.
+        """
+        return (Child
+                .select(Child.child_id, Child.last_name, Child.first_name, or_empty(Child.middle_name),
+                        Child.birth_date, Child.gender, Group.group_id, Child.enrollment_date,
+                        iso_datetime(Child.created_at), Group.group_name, Group.age_category)
+                .join(Group, JOIN.LEFT_OUTER))
+    
+    def get_all_children(self) -> List[ChildRow]:
         """Получить список всех детей"""
-        children = (Child
-                   .select(Child, Group)
-                   .join(Group, JOIN.LEFT_OUTER)
-                   .order_by(Child.last_name, Child.first_name))
-        return [self._child_to_dict(child) for child in children]
+        return fetch_rows(self._list_query().order_by(Child.last_name, Child.first_name), ChildRow)
+    
+    def get_children_page(self, after: Optional[tuple] = None, limit: int = LIST_PAGE_SIZE) -> List[ChildRow]:
+        """
+        Получить страницу детей по алфавиту
+        
+        Args:
+            after: ключ последней строки предыдущей страницы (children_page_key),
+                   None — с начала списка
+            limit: размер страницы
+        """
+        return fetch_rows(keyset_page(self._list_query(), Child, after, limit), ChildRow)
+    
+    @staticmethod
+    def children_page_key(child: dict) -> tuple:
+        """Ключ строки для get_children_page: (фамилия, имя, id)"""
+        return (child['last_name'], child['first_name'], child['child_id'])
     
-    def get_child_by_id(self, child_id: int) -> Optional[dict]:
+    def get_children_letters(self) -> List[str]:
+        """Первые буквы фамилий детей"""
+        return first_letters(Child)
+    
+    def get_child_by_id(self, child_id: int) -> Optional[ChildRow]:
         """Получить информацию о ребенке по ID"""
-        try:
-            child = (Child
-                    .select(Child, Group)
-                    .join(Group, JOIN.LEFT_OUTER)
-                    .where(Child.child_id == child_id)
-                    .get())
-            return self._child_to_dict(child)
-        except DoesNotExist:
-            return None
-    
-    def get_children_by_group(self, group_id: int) -> List[dict]:
+        children = fetch_rows(self._list_query().where(Child.child_id == child_id), ChildRow)
+        return children[0] if children else None
+    
+    def get_children_by_group(self, group_id: int) -> List[ChildRow]:
         """Получить список детей в группе"""
-        children = (Child
-                   .select()
-                   .where(Child.group == group_id)
-                   .order_by(Child.last_name, Child.first_name))
-        return [self._child_to_dict(child) for child in children]
+        return fetch_rows(self._list_query()
+                          .where(Child.group == group_id)
+                          .order_by(Child.last_name, Child.first_name), ChildRow)
     
-    def search_children(self, search_term: str) -> List[dict]:
+    def get_children_by_groups(self, group_ids: List[int]) -> Dict[int, List[ChildRow]]:
+        """
+        Получить детей нескольких групп одним запросом
+        
+        Returns:
+            словарь {group_id: список детей}; у групп без детей — пустой список
+        """
+        result = {group_id: [] for group_id in group_ids}
+        if not group_ids:
+            return result
+        children = fetch_rows(self._list_query()
+                              .where(Child.group.in_(group_ids))
+                              .order_by(Child.group, Child.last_name, Child.first_name), ChildRow)
+        for child in children:
+            result[child['group_id']].append(child)
+        return result
+    
+    def search_children(self, search_term: str) -> List[ChildRow]:
         """Поиск детей по фамилии или имени"""
         if not search_term.strip():
             return self.get_all_children()
         
-        search_pattern = f"%{search_term}%"
-        children = (Child
-                   .select(Child, Group)
-                   .join(Group, JOIN.LEFT_OUTER)
-                   .where(
-                       (Child.last_name ** search_pattern) |
-                       (Child.first_name ** search_pattern)
-                   )
-                   .order_by(Child.last_name, Child.first_name))
-        return [self._child_to_dict(child) for child in children]
+        query = self._list_query()
+        # Полнотекстовый индекс, если он есть, иначе поиск по началу слов
+        children = fts_search(query, Child, 'children_fts', search_term)
+        if children is None:
+            children = self._search_children_normalized(query, search_term)
+        return fetch_rows(children, ChildRow) if children else []
+    
+    def _search_children_normalized(self, query, search_term: str):
+        """Поиск детей по началу фамилии или имени (колонки *_norm) — без полнотекстового индекса"""
+        condition = normalized_prefix_condition([Child.last_name_norm, Child.first_name_norm], search_term)
+        if condition is None:
+            return []
+        return query.where(condition).order_by(Child.last_name, Child.first_name)
     
     def update_child(self, child_id: int, **kwargs):
         """
@@ -116,30 +160,25 @@ class ChildrenSettings:
                 .where(Child.child_id.in_(child_ids))
                 .execute())
     
-    def get_children_without_group(self) -> List[dict]:
+    def get_children_without_group(self) -> List[ChildRow]:
         """Получить детей без группы"""
-        children = (Child
-                   .select()
-                   .where(Child.group.is_null())
-                   .order_by(Child.last_name, Child.first_name))
-        return [self._child_to_dict(child) for child in children]
-    
-    def _child_to_dict(self, child: Child) -> dict:
-        """Преобразовать модель ребенка в словарь"""
-        result = {
-            'child_id': child.child_id,
-            'last_name': child.last_name,
-            'first_name': child.first_name,
-            'middle_name': child.middle_name or '',
-            'birth_date': child.birth_date.isoformat() if hasattr(child.birth_date, 'isoformat') else str(child.birth_date),
-            'gender': child.gender,
-            'group_id': child.group_id if child.group else None,
-            'enrollment_date': child.enrollment_date.isoformat() if hasattr(child.enrollment_date, 'isoformat') else str(child.enrollment_date),
-            'created_at': child.created_at.isoformat() if child.created_at else None
-        }
-        
-        if hasattr(child, 'group') and child.group:
-            result['group_name'] = child.group.group_name
-            result['age_category'] = child.group.age_category
-        
-        return result
\ No newline at end of file
+        return fetch_rows(self._list_query()
+                          .where(Child.group.is_null())
+                          .order_by(Child.last_name, Child.first_name), ChildRow)
+    
+    def _child_to_row(self, child: Child) -> ChildRow:
+        """Преобразовать модель ребенка в запись (как в _list_query: без группы group_name и age_category — None)"""
+        group = child.group if child.group_id is not None else None
+        return ChildRow(
+            child_id=child.child_id,
+            last_name=child.last_name,
+            first_name=child.first_name,
+            middle_name=child.middle_name or '',
+            birth_date=child.birth_date.isoformat() if hasattr(child.birth_date, 'isoformat') else str(child.birth_date),
+            gender=child.gender,
+            group_id=group.group_id if group else None,
+            enrollment_date=child.enrollment_date.isoformat() if hasattr(child.enrollment_date, 'isoformat') else str(child.enrollment_date),
+            created_at=child.created_at.isoformat() if child.created_at else None,
+            group_name=group.group_name if group else None,
+            age_category=group.age_category if group else None
+        )
\ No newline at end of file
@@ -5,11 +5,70 @@
 # Настройки базы данных
 DATABASE_NAME = "kindergarten.db"
 
+# Профиль производительности SQLite (ключ из DATABASE_PROFILES)
+DATABASE_PROFILE = "desktop"
+
+# Прагмы SQLite, применяемые при подключении
+DATABASE_PROFILES = {
+    # Одиночное настольное приложение
+    "desktop": {
+        'busy_timeout': 5000,       # мс ожидания блокировки
+        'journal_mode': 'wal',
+        'synchronous': 'normal',    # в режиме WAL надежно и быстро
+        'cache_size': -64000,       # 64 МБ
+        'mmap_size': 268435456,     # 256 МБ
+        'temp_store': 'memory'
+    },
+    # Веб-режим (flet --web): несколько сессий пишут одновременно
+    "web-multiuser": {
+        'busy_timeout': 15000,
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'cache_size': -16000,       # 16 МБ на соединение
+        'mmap_size': 268435456,
+        'temp_store': 'memory'
+    },
+    # Массовый импорт: скорость важнее сохранности при сбое питания
+    "bulk-import": {
+        'busy_timeout': 5000,
+        'journal_mode': 'wal',
+        'synchronous': 'off',
+        'cache_size': -256000,      # 256 МБ
+        'mmap_size': 1073741824,    # 1 ГБ
+        'temp_store': 'memory'
+    }
+}
+
+# Кэш справочных данных (группы, воспитатели), см. cache.py
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SECONDS = 300
+
+# Профилировщик запросов (profiler.py): выключен, включается явно
+PROFILER_ENABLED = False
+SLOW_QUERY_MS = 100  # запросы дольше порога пишутся в журнал
+SLOW_QUERY_LOG = "slow_queries.log"
+
+# Потоков для запросов к базе из обработчиков событий (db_worker.py)
+DB_WORKERS = 2
+# Потоков-читателей асинхронного API базы (async_database.py); писатель — один
+ASYNC_DB_READERS = 4
+
 # Настройки интерфейса
 APP_TITLE = "Учет детей в детском саду"
 WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 800
 
+# Обновления страницы объединяются за кадр (update_scheduler.py), мс
+UPDATE_FRAME_MS = 16
+# Не чаще одного обновления за интервал при изменении размера окна, мс
+RESIZE_THROTTLE_MS = 100
+
+# Пауза во вводе перед поиском, мс
+SEARCH_DEBOUNCE_MS = 300
+
+# Строк на страницу в списках детей, родителей и воспитателей
+LIST_PAGE_SIZE = 50
+
 # Цвета
 PRIMARY_COLOR = "#2196F3"
 SECONDARY_COLOR = "#FFC107"
@@ -1,6 +1,8 @@
 from peewee import *
 from typing import List, Optional
 from database import Group, Teacher, Child, JOIN
+from kindergarten_stats import children_count_columns
+from settings.models import GroupRow
 
 
 class GroupsSettings:
@@ -25,22 +27,53 @@ class GroupsSettings:
         )
         return group.group_id
     
-    def get_all_groups(self) -> List[dict]:
-        """Получить список всех групп"""
+    def get_all_groups(self, with_counts: bool = False) -> List[GroupRow]:
+        """
+        Получить список всех групп
+        
+        Args:
+            with_counts: добавить children_count, boys_count и girls_count
+                         (считаются тем же запросом через GROUP BY)
+        """
+        if not with_counts:
+            groups = (Group
+                     .select(Group, Teacher)
+                     .join(Teacher, JOIN.LEFT_OUTER)
+                     .order_by(Group.group_name))
+            return [self._group_to_row(group) for group in groups]
+        
         groups = (Group
-                 .select(Group, Teacher)
+                 .select(Group, Teacher, *children_count_columns(Child))
                  .join(Teacher, JOIN.LEFT_OUTER)
+                 .switch(Group)
+                 .join(Child, JOIN.LEFT_OUTER)
+                 .group_by(Group.group_name, Group.group_id)
                  .order_by(Group.group_name))
-        return [self._group_to_dict(group) for group in groups]
+        result = []
+        for group in groups:
+            group_data = self._group_to_row(group)
+            group_data['children_count'] = group.children_count or 0
+            group_data['boys_count'] = group.boys_count or 0
+            group_data['girls_count'] = group.girls_count or 0
+            result.append(group_data)
+        return result
     
-    def get_group_by_id(self, group_id: int) -> Optional[dict]:
+    def get_group_by_id(self, group_id: int) -> Optional[GroupRow]:
         """Получить информацию о группе по ID"""
         try:
             group = Group.get_by_id(group_id)
-            return self._group_to_dict(group)
+            return self._group_to_row(group)
         except DoesNotExist:
             return None
     
+    def get_groups_by_teacher(self, teacher_id: int) -> List[GroupRow]:
+        """Получить группы, закрепленные за воспитателем"""
+        groups = (Group
+                 .select(Group, Teacher)
+                 .join(Teacher, JOIN.LEFT_OUTER)
+                 .where(Group.teacher == teacher_id))
+        return [self._group_to_row(group) for group in groups]
+    
     def update_group(self, group_id: int, **kwargs):
         """Обновить информацию о группе"""
         updates = {}
@@ -60,15 +93,15 @@ class GroupsSettings:
         Child.update(group=None).where(Child.group == group_id).execute()
         return Group.delete().where(Group.group_id == group_id).execute()
     
-    def _group_to_dict(self, group: Group) -> dict:
-        """Преобразовать модель группы в словарь"""
-        result = {
-            'group_id': group.group_id,
-            'group_name': group.group_name,
-            'age_category': group.age_category,
-            'teacher_id': group.teacher_id if group.teacher else None,
-            'created_at': group.created_at.isoformat() if group.created_at else None
-        }
+    def _group_to_row(self, group: Group) -> GroupRow:
+        """Преобразовать модель группы в запись"""
+        result = GroupRow(
+            group_id=group.group_id,
+            group_name=group.group_name,
+            age_category=group.age_category,
+            teacher_id=group.teacher_id if group.teacher else None,
+            created_at=group.created_at.isoformat() if group.created_at else None
+        )
         
         if hasattr(group, 'teacher') and group.teacher:
             result['teacher_name'] = f"{group.teacher.last_name} {group.teacher.first_name}"
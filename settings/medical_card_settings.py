@@ -14,7 +14,7 @@ class MedicalCardSettings:
             record = MedicalRecord.get(MedicalRecord.child == child_id)
             return {
                 'record_id': record.record_id,
-                'child_id': record.child.child_id,
+                'child_id': record.child_id,
                 'blood_type': record.blood_type,
                 'allergies': record.allergies,
                 'chronic_diseases': record.chronic_diseases,
@@ -1,8 +1,10 @@
 """
 Модели данных и вспомогательные функции
 """
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from peewee import Tuple, Value, fn
 from database import Child, Group, Teacher # Import Peewee models
 
 
@@ -24,3 +26,167 @@ def validate_date(date_str: str) -> bool:
         return True
     except:
         return False
+
+
+def keyset_page(query, model, after: Optional[tuple], limit: int):
+    """
+    Страница запроса по алфавиту: порядок (фамилия, имя, id), строки после ключа after
+
+    В отличие от OFFSET, стоимость страницы не растет с ее номером:
+    SQLite начинает чтение индекса (last_name, first_name) сразу с ключа.
+    """
+    primary_key = model._meta.primary_key
+    if after is not None:
+        query = query.where(Tuple(model.last_name, model.first_name, primary_key) > Tuple(*after))
+    return query.order_by(model.last_name, model.first_name, primary_key).limit(limit)
+
+
+def letter_key(letter: str) -> tuple:
+    """Ключ keyset_page, с которого начинаются фамилии на букву letter"""
+    return (letter, "", 0)
+
+
+def first_letters(model) -> List[str]:
+    """Первые буквы фамилий, для алфавитного указателя"""
+    rows = model.select(fn.DISTINCT(fn.substr(model.last_name, 1, 1))).tuples()
+    return sorted({letter.upper() for (letter,) in rows if letter})
+
+
+def fetch_rows(query, row_type) -> list:
+    """
+    Строки запроса записями row_type (ChildRow, ParentRow, ...) напрямую из курсора SQLite
+
+    Быстрый путь для списков: без экземпляров моделей и без преобразования
+    значений полями peewee. Запрос сам выбирает нужные колонки (с alias)
+    в том виде, в каком их возвращают методы настроек; колонки сопоставляются
+    полям записи по именам, а если идут в порядке полей — позиционно.
+    Повторяющиеся значения полей row_type._shared (пол, группа, имена)
+    хранятся одним объектом на весь список.
+    """
+    cursor = query.model._meta.database.execute(query)
+    names = tuple(column[0] for column in cursor.description)
+    if names == row_type._fields[:len(names)]:
+        make = row_type
+    else:
+        make = lambda *values: row_type(**dict(zip(names, values)))
+    shared = [index for index, name in enumerate(names) if name in row_type._shared]
+    if not shared:
+        return [make(*row) for row in cursor]
+    
+    seen = {}
+    rows = []
+    for row in cursor:
+        row = list(row)
+        for index in shared:
+            value = row[index]
+            row[index] = seen.setdefault(value, value)
+        rows.append(make(*row))
+    return rows
+
+
+def or_empty(field):
+    """Колонка с пустой строкой вместо NULL (как `value or ''`)"""
+    return fn.COALESCE(field, '').alias(field.column_name)
+
+
+def iso_datetime(field):
+    """Дата и время в формате datetime.isoformat() ('2024-03-01T10:00:00')"""
+    return fn.REPLACE(field, ' ', 'T').alias(field.column_name)
+
+
+def full_name(model):
+    """'Фамилия Имя Отчество' одной колонкой; отчество добавляется, если оно не пустое"""
+    middle = fn.COALESCE(Value(' ').concat(fn.NULLIF(model.middle_name, '')), '')
+    return model.last_name.concat(' ').concat(model.first_name).concat(middle)
+
+
+class Row(Mapping):
+    """
+    Запись списка: поля в __slots__, чтение как у словаря
+
+    Методы настроек возвращают записи вместо словарей: ключи не хранятся
+    в каждой строке, запись занимает в несколько раз меньше памяти.
+    Доступ row['key'], row.get('key'), 'key' in row, keys()/items(),
+    сравнение со словарем и **row работают как раньше. Поле, которое не
+    заполнено, считается отсутствующим ключом (как необязательные ключи
+    прежних словарей). Присвоить можно только объявленное поле.
+    """
+    __slots__ = ()
+    _fields = ()
+    _shared = frozenset()  # поля с повторяющимися значениями, см. fetch_rows
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls._fields + tuple(cls.__dict__.get('__slots__', ()))
+        cls._field_set = frozenset(cls._fields)
+
+    def __init__(self, *values, **fields):
+        for name, value in zip(self._fields, values):
+            setattr(self, name, value)
+        for name, value in fields.items():
+            self[name] = value
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self._field_set:
+            raise KeyError(f"{type(self).__name__} не имеет поля {key!r}")
+        setattr(self, key, value)
+
+    def __iter__(self):
+        for name in self._fields:
+            if hasattr(self, name):
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+    def copy(self):
+        """Поверхностная копия записи (как dict.copy)"""
+        return type(self)(**self)
+
+
+class ChildRow(Row):
+    """Ребенок; group_name и age_category — None без группы, relationship — в списке детей родителя"""
+    __slots__ = ('child_id', 'last_name', 'first_name', 'middle_name', 'birth_date', 'gender',
+                 'group_id', 'enrollment_date', 'created_at', 'group_name', 'age_category',
+                 'relationship')
+    _shared = frozenset(('last_name', 'first_name', 'middle_name', 'birth_date', 'gender',
+                         'enrollment_date', 'group_name', 'age_category'))
+
+
+class AttendanceRow(ChildRow):
+    """Ребенок с посещаемостью: отметка на дату (status, notes, record_id) или месяц (days)"""
+    __slots__ = ('status', 'notes', 'record_id', 'days')
+    _shared = ChildRow._shared | {'status', 'notes'}
+
+
+class ParentRow(Row):
+    """Родитель; relationship — в списке родителей ребенка"""
+    __slots__ = ('parent_id', 'last_name', 'first_name', 'middle_name', 'full_name',
+                 'phone', 'email', 'address', 'created_at', 'relationship')
+    _shared = frozenset(('last_name', 'first_name', 'middle_name'))
+
+
+class TeacherRow(Row):
+    """Воспитатель"""
+    __slots__ = ('teacher_id', 'last_name', 'first_name', 'middle_name', 'full_name',
+                 'phone', 'email', 'birth_date', 'address', 'education', 'experience',
+                 'created_at')
+    _shared = frozenset(('last_name', 'first_name', 'middle_name', 'education'))
+
+
+class GroupRow(Row):
+    """Группа; teacher_name — если назначен воспитатель, *_count — при with_counts"""
+    __slots__ = ('group_id', 'group_name', 'age_category', 'teacher_id', 'created_at',
+                 'teacher_name', 'children_count', 'boys_count', 'girls_count')
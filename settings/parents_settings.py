@@ -1,6 +1,9 @@
 from peewee import *
 from typing import List, Optional
 from database import Parent
+from fulltext import fts_search, normalized_prefix_condition
+from settings.config import LIST_PAGE_SIZE
+from settings.models import keyset_page, first_letters, fetch_rows, ParentRow, or_empty, iso_datetime, full_name
 
 
 class ParentsSettings:
@@ -32,18 +35,46 @@ class ParentsSettings:
         )
         return parent.parent_id
     
-    def get_all_parents(self) -> List[dict]:
+    def _list_query(self):
+        """
+        Запрос для списков: колонки записи родителя (см. _parent_to_row)
+        
+        full_name и пустые строки вместо NULL вычисляются в SQL, строки
+        читаются через fetch_rows без создания моделей Parent.
+        """
+        return (Parent
+                .select(Parent.parent_id, Parent.last_name, Parent.first_name, or_empty(Parent.middle_name),
+                        full_name(Parent).alias('full_name'), or_empty(Parent.phone), or_empty(Parent.email),
+                        or_empty(Parent.address), iso_datetime(Parent.created_at)))
+    
+    def get_all_parents(self) -> List[ParentRow]:
         """Получить список всех родителей"""
-        parents = Parent.select().order_by(Parent.last_name, Parent.first_name)
-        return [self._parent_to_dict(parent) for parent in parents]
+        return fetch_rows(self._list_query().order_by(Parent.last_name, Parent.first_name), ParentRow)
+    
+    def get_parents_page(self, after: Optional[tuple] = None, limit: int = LIST_PAGE_SIZE) -> List[ParentRow]:
+        """
+        Получить страницу родителей по алфавиту
+        
+        Args:
+            after: ключ последней строки предыдущей страницы (parents_page_key),
+                   None — с начала списка
+            limit: размер страницы
+        """
+        return fetch_rows(keyset_page(self._list_query(), Parent, after, limit), ParentRow)
     
-    def get_parent_by_id(self, parent_id: int) -> Optional[dict]:
+    @staticmethod
+    def parents_page_key(parent: dict) -> tuple:
+        """Ключ строки для get_parents_page: (фамилия, имя, id)"""
+        return (parent['last_name'], parent['first_name'], parent['parent_id'])
+    
+    def get_parents_letters(self) -> List[str]:
+        """Первые буквы фамилий родителей"""
+        return first_letters(Parent)
+    
+    def get_parent_by_id(self, parent_id: int) -> Optional[ParentRow]:
         """Получить информацию о родителе по ID"""
-        try:
-            parent = Parent.get_by_id(parent_id)
-            return self._parent_to_dict(parent)
-        except DoesNotExist:
-            return None
+        parents = fetch_rows(self._list_query().where(Parent.parent_id == parent_id), ParentRow)
+        return parents[0] if parents else None
     
     def update_parent(self, parent_id: int, **kwargs):
         """Обновить информацию о родителе"""
@@ -57,35 +88,41 @@ class ParentsSettings:
         """Удалить родителя"""
         return Parent.delete().where(Parent.parent_id == parent_id).execute()
     
-    def search_parents(self, search_term: str) -> List[dict]:
+    def search_parents(self, search_term: str) -> List[ParentRow]:
         """Поиск родителей по ФИО, телефону или email"""
         if not search_term.strip():
             return self.get_all_parents()
         
+        # Полнотекстовый индекс (ФИО по началу слов, телефон и email по подстроке), если он есть
+        parents = fts_search(self._list_query(), Parent, 'parents_fts', search_term,
+                             substring_fields=[Parent.phone, Parent.email])
+        if parents is None:
+            parents = self._search_parents_normalized(search_term)
+        return fetch_rows(parents, ParentRow)
+    
+    def _search_parents_normalized(self, search_term: str):
+        """Поиск родителей по началу ФИО (колонки *_norm) или подстроке телефона и email — без полнотекстового индекса"""
         search_pattern = f"%{search_term}%"
-        parents = (Parent
-                   .select()
-                   .where(
-                       (Parent.last_name ** search_pattern) |
-                       (Parent.first_name ** search_pattern) |
-                       (Parent.middle_name ** search_pattern) |
-                       (Parent.phone ** search_pattern) |
-                       (Parent.email ** search_pattern)
-                   )
-                   .order_by(Parent.last_name, Parent.first_name))
-        return [self._parent_to_dict(parent) for parent in parents]
+        condition = (Parent.phone ** search_pattern) | (Parent.email ** search_pattern)
+        name_condition = normalized_prefix_condition(
+            [Parent.last_name_norm, Parent.first_name_norm, Parent.middle_name_norm], search_term)
+        if name_condition is not None:
+            condition |= name_condition
+        return (self._list_query()
+                .where(condition)
+                .order_by(Parent.last_name, Parent.first_name))
     
-    def _parent_to_dict(self, parent: Parent) -> dict:
-        """Преобразовать модель родителя в словарь"""
-        return {
-            'parent_id': parent.parent_id,
-            'last_name': parent.last_name,
-            'first_name': parent.first_name,
-            'middle_name': parent.middle_name or '',
-            'full_name': f"{parent.last_name} {parent.first_name}" + 
+    def _parent_to_row(self, parent: Parent) -> ParentRow:
+        """Преобразовать модель родителя в запись"""
+        return ParentRow(
+            parent_id=parent.parent_id,
+            last_name=parent.last_name,
+            first_name=parent.first_name,
+            middle_name=parent.middle_name or '',
+            full_name=f"{parent.last_name} {parent.first_name}" + 
                         (f" {parent.middle_name}" if parent.middle_name else ""),
-            'phone': parent.phone or '',
-            'email': parent.email or '',
-            'address': parent.address or '',
-            'created_at': parent.created_at.isoformat() if parent.created_at else None
-        }
\ No newline at end of file
+            phone=parent.phone or '',
+            email=parent.email or '',
+            address=parent.address or '',
+            created_at=parent.created_at.isoformat() if parent.created_at else None
+        )
\ No newline at end of file
@@ -1,6 +1,9 @@
 from peewee import *
 from typing import List, Optional
 from database import Teacher
+from fulltext import fts_search, normalized_prefix_condition
+from settings.config import LIST_PAGE_SIZE
+from settings.models import keyset_page, first_letters, fetch_rows, TeacherRow, or_empty, iso_datetime, full_name
 
 
 class TeachersSettings:
@@ -38,18 +41,47 @@ class TeachersSettings:
         )
         return teacher.teacher_id
     
-    def get_all_teachers(self) -> List[dict]:
+    def _list_query(self):
+        """
+        Запрос для списков: колонки записи воспитателя (TeacherRow)
+        
+        full_name и пустые строки вместо NULL вычисляются в SQL, строки
+        читаются через fetch_rows без создания моделей Teacher.
+        """
+        return (Teacher
+                .select(Teacher.teacher_id, Teacher.last_name, Teacher.first_name, or_empty(Teacher.middle_name),
+                        full_name(Teacher).alias('full_name'), or_empty(Teacher.phone), or_empty(Teacher.email),
+                        or_empty(Teacher.birth_date), or_empty(Teacher.address),
+                        or_empty(Teacher.education), Teacher.experience, iso_datetime(Teacher.created_at)))
+    
+    def get_all_teachers(self) -> List[TeacherRow]:
         """Получить список всех воспитателей"""
-        teachers = Teacher.select().order_by(Teacher.last_name, Teacher.first_name)
-        return [self._teacher_to_dict(teacher) for teacher in teachers]
+        return fetch_rows(self._list_query().order_by(Teacher.last_name, Teacher.first_name), TeacherRow)
     
-    def get_teacher_by_id(self, teacher_id: int) -> Optional[dict]:
+    def get_teachers_page(self, after: Optional[tuple] = None, limit: int = LIST_PAGE_SIZE) -> List[TeacherRow]:
+        """
+        Получить страницу воспитателей по алфавиту
+        
+        Args:
+            after: ключ последней строки предыдущей страницы (teachers_page_key),
+                   None — с начала списка
+            limit: размер страницы
+        """
+        return fetch_rows(keyset_page(self._list_query(), Teacher, after, limit), TeacherRow)
+    
+    @staticmethod
+    def teachers_page_key(teacher: dict) -> tuple:
+        """Ключ строки для get_teachers_page: (фамилия, имя, id)"""
+        return (teacher['last_name'], teacher['first_name'], teacher['teacher_id'])
+    
+    def get_teachers_letters(self) -> List[str]:
+        """Первые буквы фамилий воспитателей"""
+        return first_letters(Teacher)
+    
+    def get_teacher_by_id(self, teacher_id: int) -> Optional[TeacherRow]:
         """Получить информацию о воспитателе по ID"""
-        try:
-            teacher = Teacher.get_by_id(teacher_id)
-            return self._teacher_to_dict(teacher)
-        except DoesNotExist:
-            return None
+        teachers = fetch_rows(self._list_query().where(Teacher.teacher_id == teacher_id), TeacherRow)
+        return teachers[0] if teachers else None
     
     def update_teacher(self, teacher_id: int, **kwargs):
         """Обновить информацию о воспитателе"""
@@ -63,38 +95,26 @@ class TeachersSettings:
         """Удалить воспитателя"""
         return Teacher.delete().where(Teacher.teacher_id == teacher_id).execute()
     
-    def search_teachers(self, search_term: str) -> List[dict]:
+    def search_teachers(self, search_term: str) -> List[TeacherRow]:
         """Поиск воспитателей по ФИО, телефону или email"""
         if not search_term.strip():
             return self.get_all_teachers()
         
-        search_pattern = f"%{search_term}%"
-        teachers = (Teacher
-                   .select()
-                   .where(
-                       (Teacher.last_name ** search_pattern) |
-                       (Teacher.first_name ** search_pattern) |
-                       (Teacher.middle_name ** search_pattern) |
-                       (Teacher.phone ** search_pattern) |
-                       (Teacher.email ** search_pattern)
-                   )
-                   .order_by(Teacher.last_name, Teacher.first_name))
-        return [self._teacher_to_dict(teacher) for teacher in teachers]
+        # Полнотекстовый индекс (ФИО по началу слов, телефон и email по подстроке), если он есть
+        teachers = fts_search(self._list_query(), Teacher, 'teachers_fts', search_term,
+                             substring_fields=[Teacher.phone, Teacher.email])
+        if teachers is None:
+            teachers = self._search_teachers_normalized(search_term)
+        return fetch_rows(teachers, TeacherRow)
     
-    def _teacher_to_dict(self, teacher: Teacher) -> dict:
-        """Преобразовать модель воспитателя в словарь"""
-        return {
-            'teacher_id': teacher.teacher_id,
-            'last_name': teacher.last_name,
-            'first_name': teacher.first_name,
-            'middle_name': teacher.middle_name or '',
-            'full_name': f"{teacher.last_name} {teacher.first_name}" + 
-                        (f" {teacher.middle_name}" if teacher.middle_name else ""),
-            'phone': teacher.phone or '',
-            'email': teacher.email or '',
-            'birth_date': getattr(teacher, 'birth_date', None) or '',
-            'address': getattr(teacher, 'address', None) or '',
-            'education': getattr(teacher, 'education', None) or '',
-            'experience': getattr(teacher, 'experience', None),
-            'created_at': teacher.created_at.isoformat() if teacher.created_at else None
-        }
\ No newline at end of file
+    def _search_teachers_normalized(self, search_term: str):
+        """Поиск воспитателей по началу ФИО (колонки *_norm) или подстроке телефона и email — без полнотекстового индекса"""
+        search_pattern = f"%{search_term}%"
+        condition = (Teacher.phone ** search_pattern) | (Teacher.email ** search_pattern)
+        name_condition = normalized_prefix_condition(
+            [Teacher.last_name_norm, Teacher.first_name_norm, Teacher.middle_name_norm], search_term)
+        if name_condition is not None:
+            condition |= name_condition
+        return (self._list_query()
+                .where(condition)
+                .order_by(Teacher.last_name, Teacher.first_name))
@@ -0,0 +1,156 @@
+"""
+Планировщик обновлений страницы Flet с объединением по кадрам
+
+Каждый page.update() сравнивает дерево элементов и отправляет изменения
+клиенту. Вместо прямого вызова представления отмечают страницу (или
+отдельные элементы) как измененные:
+    request_update(self.page)
+и за кадр (UPDATE_FRAME_MS) все отметки объединяются в один page.update(),
+выполняемый в пуле потоков страницы. Частые события (изменение размера
+окна) дополнительно ограничиваются: не чаще одного обновления за
+throttle_ms. Если элементы должны оказаться на клиенте до следующего шага
+(например, перед загрузкой данных в показанное представление), вызывается
+update_now(page).
+
+Счетчики по действиям: сколько обновлений запрошено и сколько выполнено
+(scheduler.report(), format_report()). Действие по умолчанию — метод,
+запросивший обновление («Класс.метод»).
+"""
+import sys
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+
+from settings.config import UPDATE_FRAME_MS
+
+
+class UpdateScheduler:
+    """Объединение запросов page.update() одной страницы"""
+
+    def __init__(self, page, frame_ms: float = UPDATE_FRAME_MS):
+        self.page = page
+        self.frame = frame_ms / 1000
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._full = False  # обновить всю страницу
+        self._controls = {}  # id -> элемент, если обновляются только отдельные элементы
+        self._actions = set()  # действия, запросившие ожидающее обновление
+        self._last_flush = 0.0
+        self.stats: Dict[str, List[int]] = {}  # действие -> [запрошено, выполнено]
+
+    def request(self, *controls, action: Optional[str] = None, throttle_ms: float = 0):
+        """
+        Отметить страницу (или только controls) для обновления
+
+        Args:
+            controls: обновить только эти элементы (по умолчанию — всю страницу)
+            action: имя действия для счетчиков (по умолчанию — вызывающий метод)
+            throttle_ms: не обновлять чаще, чем раз в throttle_ms после предыдущего обновления
+        """
+        with self._lock:
+            self._mark(controls, action or _caller_action())
+            if self._scheduled:
+                return
+            self._scheduled = True
+            delay = max(self.frame, self._last_flush + throttle_ms / 1000 - time.monotonic())
+        self._schedule(delay)
+
+    def update_now(self, action: Optional[str] = None):
+        """Обновить всю страницу сразу, вместе с ожидающими запросами"""
+        with self._lock:
+            self._mark((), action or _caller_action())
+        self.flush()
+
+    def _mark(self, controls, action: str):
+        if controls:
+            for control in controls:
+                self._controls[id(control)] = control
+        else:
+            self._full = True
+        self._actions.add(action)
+        self.stats.setdefault(action, [0, 0])[0] += 1
+
+    def _schedule(self, delay: float):
+        loop = getattr(self.page, 'loop', None)
+        if loop is None or loop.is_closed():
+            # Страница без цикла событий (не запущена): обновить сразу
+            self.flush()
+            return
+        try:
+            loop.call_soon_threadsafe(loop.call_later, delay, self.page.run_thread, self.flush)
+        except RuntimeError:
+            # Цикл событий закрыт вместе с сессией: отправлять некуда
+            with self._lock:
+                self._scheduled = False
+
+    def flush(self):
+        """Выполнить ожидающее обновление сейчас (одним page.update())"""
+        with self._lock:
+            full, controls, actions = self._full, list(self._controls.values()), self._actions
+            self._scheduled, self._full, self._controls, self._actions = False, False, {}, set()
+            if not full and not controls:
+                return
+            for action in actions:
+                self.stats[action][1] += 1
+            self._last_flush = time.monotonic()
+        try:
+            if full:
+                self.page.update()
+            else:
+                mounted = [control for control in controls if control.page]
+                if mounted:
+                    self.page.update(*mounted)
+        except Exception as ex:
+            print(f"Ошибка обновления страницы: {ex}")
+
+    def report(self) -> List[dict]:
+        """Счетчики по действиям, больше всего запросов — первыми"""
+        rows = [
+            {'action': action, 'requested': requested, 'updates': updates}
+            for action, (requested, updates) in self.stats.items()
+        ]
+        return sorted(rows, key=lambda row: row['requested'], reverse=True)
+
+    def format_report(self) -> str:
+        """Отчет по действиям текстом"""
+        lines = [f"{'Действие':<40} {'Запрошено':>9} {'Обновлений':>10}"]
+        for row in self.report():
+            lines.append(f"{row['action']:<40} {row['requested']:>9} {row['updates']:>10}")
+        return "\n".join(lines)
+
+
+def _caller_action(depth: int = 2) -> str:
+    """«Класс.метод» (или имя функции), запросивший обновление"""
+    frame = sys._getframe(depth)
+    owner = frame.f_locals.get('self')
+    name = frame.f_code.co_name
+    return f"{type(owner).__name__}.{name}" if owner is not None else name
+
+
+# Один планировщик на страницу
+_schedulers = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(page) -> UpdateScheduler:
+    """Получить планировщик обновлений страницы"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(page)
+        if scheduler is None:
+            scheduler = _schedulers[page] = UpdateScheduler(page)
+        return scheduler
+
+
+def request_update(page, *controls, action: Optional[str] = None, throttle_ms: float = 0):
+    """Запросить обновление страницы (см. UpdateScheduler.request); без страницы — ничего"""
+    if page is None:
+        return
+    get_scheduler(page).request(*controls, action=action or _caller_action(), throttle_ms=throttle_ms)
+
+
+def update_now(page, action: Optional[str] = None):
+    """Обновить страницу сразу вместе со всеми ожидающими запросами"""
+    if page is None:
+        return
+    get_scheduler(page).update_now(action=action or _caller_action())
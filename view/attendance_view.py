@@ -1,10 +1,13 @@
 """
 Представление для управления журналом посещаемости
 """
+import threading
 import flet as ft
 from datetime import datetime, date
 from typing import Callable
+from db_worker import get_worker
 from settings.config import PRIMARY_COLOR
+from update_scheduler import request_update
 
 
 class AttendanceView(ft.Container):
@@ -17,16 +20,15 @@ class AttendanceView(ft.Container):
         self.page = page
         self.selected_date = date.today().strftime("%Y-%m-%d")
         self.selected_group_id = None
+        self.children_data = []
+        self.shown_date = None  # дата показанной таблицы
+        self.write_lock = threading.Lock()  # записи отметок в базу — по одной
         
-        # Выбор группы
-        groups = self.db.get_all_groups()
+        # Выбор группы (список заполняется в load_groups)
         self.group_dropdown = ft.Dropdown(
             label="Выберите группу",
             width=300,
-            options=[
-                ft.DropdownOption(str(g['group_id']), g['group_name']) 
-                for g in groups if g['group_id']
-            ],
+            options=[],
             on_change=self.on_group_change
         )
         
@@ -51,23 +53,46 @@ class AttendanceView(ft.Container):
             on_click=self.open_date_picker
         )
         
+        self.mark_all_button = ft.OutlinedButton(
+            "Все присутствуют",
+            icon=ft.Icons.DONE_ALL,
+            on_click=self.mark_all_present
+        )
+        
         # Контейнер для таблицы посещаемости
         self.attendance_container = ft.Container(
             content=ft.Text("Выберите группу для просмотра журнала", size=16),
             expand=True
         )
+        # Виден, пока запросы к базе выполняются в фоне
+        self.loading = ft.ProgressBar(visible=False)
         
         self.content = ft.Column([
             ft.Text("Журнал посещаемости", size=24, weight=ft.FontWeight.BOLD),
             ft.Row([
                 self.group_dropdown,
-                self.date_button
+                self.date_button,
+                self.mark_all_button
             ], spacing=20),
+            self.loading,
             self.attendance_container
         ], spacing=20, expand=True)
         
         self.page.overlay.append(self.date_picker)
     
+    def load_groups(self):
+        """Загрузка списка групп"""
+        groups = self.db.get_all_groups()
+        self.group_dropdown.options = [
+            ft.DropdownOption(str(g['group_id']), g['group_name']) 
+            for g in groups if g['group_id']
+        ]
+    
+    def refresh(self):
+        """Обновить данные"""
+        self.load_groups()
+        self.load_attendance()
+    
     def on_group_change(self, e):
         """Обработчик изменения группы"""
         self.selected_group_id = int(e.control.value) if e.control.value else None
@@ -76,7 +101,7 @@ class AttendanceView(ft.Container):
     def open_date_picker(self, e):
         """Открыть выбор даты"""
         self.date_picker.open = True
-        self.page.update()
+        request_update(self.page)
     
     def on_date_change(self, e):
         """Обработчик изменения даты"""
@@ -90,14 +115,23 @@ class AttendanceView(ft.Container):
             self.load_attendance()
     
     def load_attendance(self):
-        """Загрузка данных посещаемости"""
+        """Загрузка данных посещаемости: запрос в фоне, таблица показывается по готовности"""
         if not self.selected_group_id:
-            return
-        
-        children_data = self.db.get_attendance_by_group_and_date(
-            self.selected_group_id, 
-            self.selected_date
+            return None
+        group_id, selected_date = self.selected_group_id, self.selected_date
+        return get_worker().submit(
+            self.page,
+            lambda: self.db.get_attendance_by_group_and_date(group_id, selected_date),
+            on_done=lambda children_data: self.show_attendance(children_data, selected_date),
+            on_error=lambda ex: self.show_error(f"Ошибка загрузки: {ex}"),
+            loading=self.loading,
+            key=("attendance", id(self)),
         )
+    
+    def show_attendance(self, children_data: list, selected_date: str):
+        """Показать таблицу посещаемости группы на дату selected_date"""
+        self.children_data = children_data
+        self.shown_date = selected_date
         
         if not children_data:
             self.attendance_container.content = ft.Text(
@@ -105,7 +139,7 @@ class AttendanceView(ft.Container):
                 size=16
             )
             if self.page:
-                self.page.update()
+                request_update(self.page)
             return
         
         # Создаем таблицу с редактируемыми ячейками
@@ -119,7 +153,7 @@ class AttendanceView(ft.Container):
                     ft.DropdownOption("Отсутствует", "Отсутствует"),
                     ft.DropdownOption("Болеет", "Болеет")
                 ],
-                on_change=lambda e, child_id=child['child_id']: self.update_status(child_id, e.control.value, '')
+                on_change=lambda e, child=child: self.update_status(child, e.control.value)
             )
             
             rows.append(
@@ -143,22 +177,55 @@ class AttendanceView(ft.Container):
         )
         
         # Преобразуем дату для отображения
-        display_date = datetime.strptime(self.selected_date, "%Y-%m-%d").strftime("%d-%m-%Y")
+        display_date = datetime.strptime(selected_date, "%Y-%m-%d").strftime("%d-%m-%Y")
         self.attendance_container.content = ft.Column([
             ft.Text(f"Посещаемость на {display_date}", size=18, weight=ft.FontWeight.BOLD),
             attendance_table
         ], scroll=ft.ScrollMode.AUTO)
         
         if self.page:
-            self.page.update()
+            request_update(self.page)
     
-    def update_status(self, child_id: int, status: str, notes: str = ''):
-        """Обновление статуса посещаемости в реальном времени"""
-        try:
-            self.db.update_attendance_record(child_id, self.selected_date, status, notes)
-        except Exception as ex:
-            self.show_error(f"Ошибка при обновлении статуса: {str(ex)}")
+    def update_status(self, child: dict, status: str, notes: str = ''):
+        """
+        Обновление статуса посещаемости
+
+        Статус запоминается в строке ребенка сразу, запись в базу на дату
+        показанной таблицы идет в фоне.
+        """
+        child['status'] = status
+        shown_date = self.shown_date
+        
+        def write():
+            # Пишется статус строки на момент записи: при быстрых повторных
+            # изменениях последним в базу попадает последний выбор
+            with self.write_lock:
+                self.db.update_attendance_record(child['child_id'], shown_date, child['status'], notes)
+        
+        # Без страницы: таблица уже показывает выбранный статус
+        return get_worker().submit(
+            None, write, on_error=lambda ex: self.show_error(f"Ошибка при обновлении статуса: {str(ex)}"))
     
+    def mark_all_present(self, e):
+        """Отметить всю группу присутствующей одной записью в БД (в фоне), затем перезагрузить таблицу"""
+        if not self.selected_group_id or not self.children_data:
+            return None
+        records = [
+            (child['child_id'], self.shown_date, 'Присутствует', child['notes'] or None)
+            for child in self.children_data
+        ]
+        
+        def write():
+            with self.write_lock:
+                self.db.bulk_upsert_attendance(records)
+        
+        return get_worker().submit(
+            self.page,
+            write,
+            on_done=lambda _: self.load_attendance(),
+            on_error=lambda ex: self.show_error(f"Ошибка при обновлении статуса: {str(ex)}"),
+            loading=self.loading,
+        )
 
     
     def show_error(self, message: str):
@@ -169,4 +236,4 @@ class AttendanceView(ft.Container):
                 bgcolor=ft.Colors.ERROR
             )
             self.page.snack_bar.open = True
-            self.page.update()
\ No newline at end of file
+            request_update(self.page)
\ No newline at end of file
@@ -1,15 +1,19 @@
 """
 Представление для управления детьми
 """
+import asyncio
 import flet as ft
 from datetime import datetime
 from typing import Callable
-from settings.models import format_date
+from settings.models import format_date, letter_key
 from datetime import date # Import date for age calculation
-from components import ConfirmDialog, SearchBar
+from async_database import get_async_database
+from components import ConfirmDialog, SearchBar, PagedList, AlphabetBar
+from db_worker import get_worker
 from dialogs import show_confirm_dialog
 from settings.config import GENDERS
 from pages_styles.styles import AppStyles
+from update_scheduler import request_update
 
 
 class ChildrenView(ft.Container):
@@ -38,17 +42,11 @@ class ChildrenView(ft.Container):
         self.gender_dropdown = AppStyles.dropdown_field("Пол", [ft.DropdownOption(k, v) for k, v in GENDERS.items()], required=True)
         self.gender_error = AppStyles.error_text()
         
-        # Получаем список групп для dropdown
-        groups = self.db.get_all_groups()
+        # Список групп заполняется при загрузке данных (load_groups)
         self.group_dropdown = ft.Dropdown(
             label="Группа",
             width=300,
-            options=[
-                ft.DropdownOption("0", "Без группы")
-            ] + [
-                ft.DropdownOption(str(g['group_id']), g['group_name']) 
-                for g in groups
-            ]
+            options=[ft.DropdownOption("0", "Без группы")]
         )
         
         self.enrollment_date_field = AppStyles.text_field("Дата зачисления", required=True, hint_text="дд-мм-гггг", max_length=10, value=datetime.now().strftime("%d-%m-%Y"), on_change=self.format_date)
@@ -86,29 +84,67 @@ class ChildrenView(ft.Container):
         )
         
         # Поиск
-        self.search_bar = SearchBar(on_search=self.on_search)
+        self.search_bar = SearchBar(fetch=self.fetch_children, on_results=self.on_search_results)
         
-        # Список детей
-        self.children_list = ft.ListView(expand=True, spacing=10, padding=20)
+        # Список детей: страницы подгружаются при прокрутке
+        self.children_list = PagedList(self._create_child_item, expand=True, spacing=10, padding=20)
+        self.alphabet_bar = AlphabetBar(on_select=self.jump_to_letter)
+        # Виден, пока запросы к базе выполняются в фоне
+        self.loading = ft.ProgressBar(visible=False)
         
         # Кнопка добавления
         add_button = AppStyles.primary_button("Добавить ребенка", icon=ft.Icons.ADD, on_click=self.show_add_form)
         
-        # Загружаем данные
-        self.load_children()
-        
         self.content = AppStyles.form_column([
             AppStyles.page_header("Дети", "Добавить ребенка", self.show_add_form),
             self.form_container,
             self.search_bar,
+            self.alphabet_bar,
+            self.loading,
             ft.Container(content=self.children_list, expand=True)
         ], spacing=20)
         self.expand = True
     
+    def fetch_children(self, search_query: str = ""):
+        """Найти детей по строке поиска (None, если строка пустая — весь список по страницам)"""
+        return self.db.search_children(search_query) if search_query else None
+    
+    def fetch_children_list(self, search_query: str = "") -> tuple:
+        """Данные списка: (результаты поиска, None, None) или (None, буквы, первая страница всех детей)"""
+        children = self.fetch_children(search_query)
+        if children is not None:
+            return children, None, None
+        return None, self.db.get_children_letters(), self.db.get_children_page()
+    
     def load_children(self, search_query: str = ""):
-        """Загрузка списка детей"""
-        children = self.db.search_children(search_query) if search_query else self.db.get_all_children()
-        self.children_list.controls = [self._create_child_item(child) for child in children]
+        """Загрузка списка детей: запросы в фоне, список показывается по готовности"""
+        return get_worker().submit(
+            self.page,
+            lambda: self.fetch_children_list(search_query),
+            on_done=lambda data: self.show_children(data[0], letters=data[1], first_rows=data[2]),
+            on_error=lambda ex: self.show_error(f"Ошибка загрузки: {ex}"),
+            loading=self.loading,
+            key=("children", id(self)),
+        )
+    
+    def show_children(self, children: list = None, after: tuple = None, letters: list = None,
+                      first_rows: list = None):
+        """Показать результаты поиска или, если их нет, всех детей по алфавиту с ключа after"""
+        self.alphabet_bar.visible = children is None
+        if children is not None:
+            self.children_list.show_rows(children)
+            return
+        self.alphabet_bar.set_letters(self.db.get_children_letters() if letters is None else letters)
+        self.children_list.show(self.db.get_children_page, self.db.children_page_key,
+                                after=after, first_rows=first_rows)
+    
+    def jump_to_letter(self, letter: str):
+        """Перейти к фамилиям на букву letter"""
+        self.search_bar.cancel()
+        self.search_query = ""
+        self.search_bar.search_field.value = ""
+        self.show_children(after=letter_key(letter))
+        self.update()
     
     def _create_child_item(self, child):
         """Создать элемент списка для ребенка"""
@@ -131,7 +167,7 @@ class ChildrenView(ft.Container):
                 tooltip="",
                 items=[
                     ft.PopupMenuItem(text="Медкарта", icon=ft.Icons.MEDICAL_INFORMATION, on_click=lambda _, cid=child['child_id']: self.show_medical_card(str(cid))),
-                    ft.PopupMenuItem(text="Родители", icon=ft.Icons.FAMILY_RESTROOM, on_click=lambda _, cid=child['child_id']: self.manage_parents(str(cid))),
+                    ft.PopupMenuItem(text="Родители", icon=ft.Icons.FAMILY_RESTROOM, on_click=lambda _, cid=child['child_id']: self.page.run_task(self.manage_parents, str(cid))),
                     ft.PopupMenuItem(text="Редактировать", icon=ft.Icons.EDIT, on_click=lambda _, cid=child['child_id']: self.edit_child(str(cid))),
                     ft.PopupMenuItem(text="Удалить", icon=ft.Icons.DELETE, on_click=lambda _, cid=child['child_id']: self.delete_child(str(cid)))
                 ]
@@ -166,13 +202,13 @@ class ChildrenView(ft.Container):
     def delete_child(self, child_id: str):
         """Удалить ребенка"""
         def on_yes(e):
-            try:
-                self.db.delete_child(int(child_id))
-                self.load_children(self.search_query)
-                if self.on_refresh:
-                    self.on_refresh()
-            except Exception as ex:
-                self.show_error(f"Ошибка при удалении: {str(ex)}")
+            get_worker().submit(
+                self.page,
+                lambda: self.db.delete_child(int(child_id)),
+                on_done=lambda _: self.after_change(),
+                on_error=lambda ex: self.show_error(f"Ошибка при удалении: {str(ex)}"),
+                loading=self.loading,
+            )
 
         show_confirm_dialog(
             self.page,
@@ -231,30 +267,43 @@ class ChildrenView(ft.Container):
         if not self.validate_fields():
             return
         
-        try:
-            child_data = {
-                'last_name': self.last_name_field.value,
-                'first_name': self.first_name_field.value,
-                'middle_name': self.middle_name_field.value or None,
-                'birth_date': self.birth_date_field.value,
-                'gender': self.gender_dropdown.value,
-                'group_id': int(self.group_dropdown.value) if self.group_dropdown.value and self.group_dropdown.value != "0" else None,
-                'enrollment_date': self.enrollment_date_field.value
-            }
-            
-            if self.selected_child:
-                self.db.update_child(self.selected_child['child_id'], **child_data)
+        child_data = {
+            'last_name': self.last_name_field.value,
+            'first_name': self.first_name_field.value,
+            'middle_name': self.middle_name_field.value or None,
+            'birth_date': self.birth_date_field.value,
+            'gender': self.gender_dropdown.value,
+            'group_id': int(self.group_dropdown.value) if self.group_dropdown.value and self.group_dropdown.value != "0" else None,
+            'enrollment_date': self.enrollment_date_field.value
+        }
+        selected_child = self.selected_child
+        
+        def save():
+            if selected_child:
+                self.db.update_child(selected_child['child_id'], **child_data)
             else:
                 self.db.add_child(**child_data)
-            
+        
+        def on_saved(_):
+            self.save_button.disabled = False
             self.form_container.visible = False
-            self.load_children(self.search_query)
-            if self.on_refresh:
-                self.on_refresh()
-            self.update()
-            
-        except Exception as ex:
+            self.after_change()
+        
+        def on_failed(ex):
+            self.save_button.disabled = False
             self.show_error(f"Ошибка при сохранении: {str(ex)}")
+        
+        # Запись в фоне; форма остается открытой до успешного сохранения
+        self.save_button.disabled = True
+        self.update()
+        get_worker().submit(self.page, save, on_done=on_saved, on_error=on_failed, loading=self.loading)
+    
+    def after_change(self):
+        """Обновить список после добавления, изменения или удаления ребенка"""
+        if self.on_refresh:
+            self.on_refresh()
+        else:
+            self.load_children(self.search_query)
     
     def cancel_edit(self, e):
         """Отменить редактирование"""
@@ -273,83 +322,103 @@ class ChildrenView(ft.Container):
         self.enrollment_date_field.value = datetime.now().strftime("%d-%m-%Y")
         self.clear_field_errors()
     
-    def on_search(self, query: str):
-        """Обработка поиска"""
+    def on_search_results(self, query: str, children: list):
+        """Показать результаты поиска (вызывается из потока поиска)"""
         self.search_query = query
-        self.load_children(query)
+        self.show_children(children)
+        if self.page:
+            request_update(self.page)
     
-    def manage_parents(self, child_id: str):
-        """Управление родителями ребенка"""
+    async def manage_parents(self, child_id: str):
+        """Управление родителями ребенка: ребенок и родители загружаются параллельно, затем открывается диалог"""
+        adb = get_async_database(self.db)
+        self.loading.visible = True
+        self.update()
         try:
-            child = self.db.get_child_by_id(int(child_id))
-            if not child:
-                return
-            
-            all_parents = self.db.get_all_parents()
-            current_parents = self.db.get_parents_by_child(int(child_id))
-            current_parent_ids = [p['parent_id'] for p in current_parents]
+            child, all_parents, current_parents = await asyncio.gather(
+                adb.get_child_by_id(int(child_id)),
+                adb.get_all_parents(),
+                adb.get_parents_by_child(int(child_id)),
+            )
+        except Exception as ex:
+            self.show_error(f"Ошибка: {str(ex)}")
+            return
+        finally:
+            self.loading.visible = False
+            self.update()
+        if child:
+            self.show_parents_dialog(int(child_id), child, all_parents, current_parents)
+    
+    def show_parents_dialog(self, child_id: int, child, all_parents: list, current_parents: list):
+        """Диалог выбора родителей ребенка"""
+        current_parent_ids = [p['parent_id'] for p in current_parents]
+        
+        parent_checkboxes = []
+        relationship_fields = {}
+        parent_rows = []
+        
+        for parent in all_parents:
+            is_selected = parent['parent_id'] in current_parent_ids
+            current_relationship = next((p['relationship'] for p in current_parents if p['parent_id'] == parent['parent_id']), "")
             
-            parent_checkboxes = []
-            relationship_fields = {}
-            parent_rows = []
+            checkbox = ft.Checkbox(
+                label=f"{parent.get('last_name', '')} {parent.get('first_name', '')}",
+                value=is_selected,
+                data=parent['parent_id']
+            )
             
-            for parent in all_parents:
-                is_selected = parent['parent_id'] in current_parent_ids
-                current_relationship = next((p['relationship'] for p in current_parents if p['parent_id'] == parent['parent_id']), "")
-                
-                checkbox = ft.Checkbox(
-                    label=f"{parent.get('last_name', '')} {parent.get('first_name', '')}",
-                    value=is_selected,
-                    data=parent['parent_id']
-                )
-                
-                relationship_field = ft.TextField(
-                    label="Степень родства",
-                    value=current_relationship,
-                    width=150,
-                    hint_text="Мама, Папа..."
-                )
-                
-                parent_checkboxes.append(checkbox)
-                relationship_fields[parent['parent_id']] = relationship_field
-                parent_rows.append(ft.Row([checkbox, relationship_field], spacing=10))
+            relationship_field = ft.TextField(
+                label="Степень родства",
+                value=current_relationship,
+                width=150,
+                hint_text="Мама, Папа..."
+            )
             
-            def save_relations(e):
-                try:
-                    for parent_id in current_parent_ids:
-                        self.db.remove_parent_child_relation(parent_id, int(child_id))
-                    
-                    for checkbox in parent_checkboxes:
-                        if checkbox.value:
-                            relationship = relationship_fields[checkbox.data].value or "Родитель"
-                            self.db.add_parent_child_relation(checkbox.data, int(child_id), relationship)
-                    
-                    self.page.close(dialog)
-                except Exception as ex:
-                    self.show_error(f"Ошибка: {str(ex)}")
+            parent_checkboxes.append(checkbox)
+            relationship_fields[parent['parent_id']] = relationship_field
+            parent_rows.append(ft.Row([checkbox, relationship_field], spacing=10))
+        
+        def save_relations(e):
+            # Значения формы читаются сразу, запись идет в фоне
+            selected = [
+                (checkbox.data, relationship_fields[checkbox.data].value or "Родитель")
+                for checkbox in parent_checkboxes if checkbox.value
+            ]
             
-            def close_dialog(e):
-                self.page.close(dialog)
+            def save():
+                for parent_id in current_parent_ids:
+                    self.db.remove_parent_child_relation(parent_id, child_id)
+                for parent_id, relationship in selected:
+                    self.db.add_parent_child_relation(parent_id, child_id, relationship)
             
-            dialog = ft.AlertDialog(
-                modal=True,
-                title=ft.Text(f"Родители: {child['last_name']} {child['first_name']}"),
-                content=ft.Container(
-                    content=ft.Column(parent_rows, scroll=ft.ScrollMode.AUTO),
-                    width=400,
-                    height=300
-                ),
-                actions=[
-                    ft.TextButton("Отмена", on_click=close_dialog),
-                    ft.ElevatedButton("Сохранить", on_click=save_relations)
-                ]
+            get_worker().submit(
+                self.page,
+                save,
+                on_done=lambda _: self.page.close(dialog),
+                on_error=lambda ex: self.show_error(f"Ошибка: {str(ex)}"),
+                loading=self.loading,
             )
-            
-            self.page.overlay.append(dialog)
-            dialog.open = True
-            self.page.update()
-        except Exception as ex:
-            self.show_error(f"Ошибка: {str(ex)}")
+        
+        def close_dialog(e):
+            self.page.close(dialog)
+        
+        dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(f"Родители: {child['last_name']} {child['first_name']}"),
+            content=ft.Container(
+                content=ft.Column(parent_rows, scroll=ft.ScrollMode.AUTO),
+                width=400,
+                height=300
+            ),
+            actions=[
+                ft.TextButton("Отмена", on_click=close_dialog),
+                ft.ElevatedButton("Сохранить", on_click=save_relations)
+            ]
+        )
+        
+        self.page.overlay.append(dialog)
+        dialog.open = True
+        request_update(self.page)
     
     def show_medical_card(self, child_id: str):
         """Показать медицинскую карту ребёнка"""
@@ -385,7 +454,7 @@ class ChildrenView(ft.Container):
         
         self.page.overlay.append(dialog)
         dialog.open = True
-        self.page.update()
+        request_update(self.page)
     
     def show_error(self, message: str):
         """Показать ошибку"""
@@ -395,7 +464,7 @@ class ChildrenView(ft.Container):
                 bgcolor=ft.Colors.ERROR
             )
             self.page.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
     
 
     def format_date(self, e):
@@ -416,9 +485,8 @@ class ChildrenView(ft.Container):
         e.control.value = formatted
         e.control.update()
     
-    def refresh(self):
-        """Обновить данные"""
-        # Обновляем список групп в dropdown
+    def load_groups(self):
+        """Загрузка списка групп для формы"""
         groups = self.db.get_all_groups()
         self.group_dropdown.options = [
             ft.DropdownOption("0", "Без группы")
@@ -426,4 +494,8 @@ class ChildrenView(ft.Container):
             ft.DropdownOption(str(g['group_id']), g['group_name']) 
             for g in groups
         ]
+    
+    def refresh(self):
+        """Обновить данные"""
+        self.load_groups()
         self.load_children(self.search_query)
@@ -4,7 +4,21 @@
 import flet as ft
 from datetime import datetime, date, timedelta
 import calendar
+import threading
 from typing import Callable
+from components import PagedList
+from db_worker import get_worker
+from update_scheduler import request_update
+
+# Символы статусов в ячейках журнала
+STATUS_SYMBOLS = {
+    'Присутствует': "+",
+    'Отсутствует': "-",
+    'Болеет': "Б",
+}
+
+# Высота строки журнала, пикселей
+JOURNAL_ROW_HEIGHT = 28
 
 
 class ElectronicJournalView(ft.Container):
@@ -45,7 +59,16 @@ class ElectronicJournalView(ft.Container):
         )
         
         # Контейнер для журнала
-        self.journal_container = ft.Container()
+        self.journal_container = ft.Container(expand=True)
+        self.days_in_month = self.get_days_in_month()
+        self.status_colors = self._status_colors(False)
+        self.cell_style = ft.TextStyle(size=13, font_family="monospace")
+        self.month_statuses = {}  # child_id -> {день: статус} за показанный месяц
+        self.shown_month = (self.current_year, self.current_month)  # (год, месяц) показанного журнала
+        self.cell_spans = {}  # (child_id, день) -> ячейка, созданная на экране
+        self.write_lock = threading.Lock()  # записи отметок в базу — по одной
+        # Виден, пока журнал загружается в фоне
+        self.loading = ft.ProgressBar(visible=False)
         
         # Основной контент
         self.content = ft.Column([
@@ -56,10 +79,9 @@ class ElectronicJournalView(ft.Container):
                 ft.ElevatedButton("Обновить", on_click=self.refresh_journal)
             ], spacing=10),
             ft.Divider(),
+            self.loading,
             self.journal_container
-        ], expand=True, scroll=ft.ScrollMode.AUTO)
-        
-        self.load_groups()
+        ], expand=True)
     
     def load_groups(self):
         """Загрузка списка групп"""
@@ -69,8 +91,6 @@ class ElectronicJournalView(ft.Container):
                 ft.dropdown.Option(str(group['group_id']), group['group_name'])
                 for group in groups
             ]
-            if self.page:
-                self.page.update()
         except Exception as ex:
             print(f"Ошибка загрузки групп: {ex}")
     
@@ -89,6 +109,11 @@ class ElectronicJournalView(ft.Container):
         self.current_year = int(e.control.value)
         self.build_journal()
     
+    def refresh(self):
+        """Обновить данные: список групп и журнал"""
+        self.load_groups()
+        self.build_journal()
+    
     def refresh_journal(self, e):
         """Обновление журнала"""
         self.build_journal()
@@ -97,176 +122,189 @@ class ElectronicJournalView(ft.Container):
         """Получить количество дней в месяце"""
         return calendar.monthrange(self.current_year, self.current_month)[1]
     
+    def _status_colors(self, is_dark: bool) -> dict:
+        """Цвета фона и символа для статусов с учетом темы"""
+        return {
+            'Присутствует': (ft.Colors.GREEN_900 if is_dark else ft.Colors.GREEN_100,
+                             ft.Colors.GREEN_200 if is_dark else ft.Colors.GREEN_800),
+            'Отсутствует': (ft.Colors.RED_900 if is_dark else ft.Colors.RED_100,
+                            ft.Colors.RED_200 if is_dark else ft.Colors.RED_800),
+            'Болеет': (ft.Colors.ORANGE_900 if is_dark else ft.Colors.ORANGE_100,
+                       ft.Colors.ORANGE_200 if is_dark else ft.Colors.ORANGE_800),
+        }
+    
+    def _cell_span(self, child_id: int, day: int, status: str) -> ft.TextSpan:
+        """Ячейка дня: фрагмент строки ребенка, нажатие переключает статус"""
+        span = ft.TextSpan(on_click=lambda e, c_id=child_id, d=day: self.toggle_attendance(c_id, d))
+        self._apply_status(span, status)
+        self.cell_spans[(child_id, day)] = span
+        return span
+    
+    def _apply_status(self, span: ft.TextSpan, status: str):
+        """Показать статус в ячейке"""
+        bgcolor, color = self.status_colors.get(status, self.status_colors['Болеет'])
+        span.text = f" {STATUS_SYMBOLS.get(status, 'Б')} "
+        span.style = ft.TextStyle(bgcolor=bgcolor, color=color, weight=ft.FontWeight.BOLD)
+    
+    def _create_journal_row(self, child: dict) -> ft.Control:
+        """
+        Строка журнала: ФИО и все дни месяца одним текстом
+
+        Дни — фрагменты (TextSpan) одного моноширинного ft.Text, а не отдельные
+        контейнеры с текстом: на строку приходится 4 элемента и N легких
+        фрагментов вместо 2×(N+1) элементов.
+        """
+        days = ft.Text(
+            spans=[
+                self._cell_span(child['child_id'], day, child['days'].get(day, 'Присутствует'))
+                for day in range(1, self.days_in_month + 1)
+            ],
+            style=self.cell_style,
+        )
+        return ft.Row([
+            ft.Container(
+                content=ft.Text(f"{child['last_name']} {child['first_name']}", size=11, no_wrap=True),
+                width=200,
+                padding=ft.padding.symmetric(horizontal=5),
+            ),
+            days,
+        ], spacing=0, height=JOURNAL_ROW_HEIGHT)
+    
     def build_journal(self):
-        """Построение журнала посещаемости"""
+        """Построение журнала посещаемости: отметки за месяц загружаются в фоне"""
         if not self.selected_group:
             self.journal_container.content = ft.Text("Выберите группу для отображения журнала")
             if self.page:
-                self.page.update()
-            return
+                request_update(self.page)
+            return None
         
+        group_id, year, month = self.selected_group, self.current_year, self.current_month
+        return get_worker().submit(
+            self.page,
+            lambda: self.db.get_attendance_matrix(group_id, year, month),
+            on_done=lambda children: self.show_journal(children, year, month),
+            on_error=self.show_journal_error,
+            loading=self.loading,
+            key=("journal", id(self)),
+        )
+    
+    def show_journal_error(self, ex: Exception):
+        """Показать ошибку загрузки журнала"""
+        print(f"Ошибка построения журнала: {ex}")
+        self.journal_container.content = ft.Text(f"Ошибка: {ex}")
+    
+    def show_journal(self, children: list, year: int, month: int):
+        """Показать журнал по детям группы с отметками за месяц month года year"""
         # Адаптивные цвета для темы
         is_dark = self.page.theme_mode == ft.ThemeMode.DARK if self.page else False
         header_bg = ft.Colors.GREY_800 if is_dark else ft.Colors.GREY_200
-        row_bg = ft.Colors.GREY_900 if is_dark else ft.Colors.GREY_50
         border_color = ft.Colors.GREY_600 if is_dark else ft.Colors.OUTLINE
+        self.status_colors = self._status_colors(is_dark)
+        self.cell_style = ft.TextStyle(size=13, font_family="monospace")
         
-        # Адаптивные цвета для статусов
-        present_bg = ft.Colors.GREEN_100 if not is_dark else ft.Colors.GREEN_900
-        present_color = ft.Colors.GREEN_800 if not is_dark else ft.Colors.GREEN_200
-        absent_bg = ft.Colors.RED_100 if not is_dark else ft.Colors.RED_900
-        absent_color = ft.Colors.RED_800 if not is_dark else ft.Colors.RED_200
-        sick_bg = ft.Colors.ORANGE_100 if not is_dark else ft.Colors.ORANGE_900
-        sick_color = ft.Colors.ORANGE_800 if not is_dark else ft.Colors.ORANGE_200
+        if not children:
+            self.journal_container.content = ft.Text("В группе нет детей")
+            return
         
-        try:
-            # Получаем детей группы
-            children = self.db.get_children_by_group(self.selected_group)
-            if not children:
-                self.journal_container.content = ft.Text("В группе нет детей")
-                if self.page:
-                    self.page.update()
-                return
-            
-            # Получаем количество дней в месяце
-            days_in_month = self.get_days_in_month()
-            
-            # Создаем заголовок с днями
-            header_row = [ft.Container(
-                content=ft.Text("ФИО", weight=ft.FontWeight.BOLD, size=12),
-                width=200,
-                padding=5,
-                border=ft.border.all(1, border_color),
-                bgcolor=header_bg
-            )]
-            
-            for day in range(1, days_in_month + 1):
-                header_row.append(ft.Container(
-                    content=ft.Text(str(day), weight=ft.FontWeight.BOLD, size=10, text_align=ft.TextAlign.CENTER),
-                    width=30,
-                    height=30,
-                    padding=2,
-                    border=ft.border.all(1, border_color),
-                    bgcolor=header_bg
-                ))
-            
-            # Создаем строки для каждого ребенка
-            rows = [ft.Row(header_row, spacing=0)]
-            
-            for child in children:
-                child_row = [ft.Container(
-                    content=ft.Text(f"{child['last_name']} {child['first_name']}", size=11),
-                    width=200,
-                    padding=5,
-                    border=ft.border.all(1, border_color),
-                    bgcolor=row_bg
-                )]
-                
-                for day in range(1, days_in_month + 1):
-                    date_str = f"{self.current_year}-{self.current_month:02d}-{day:02d}"
-                    
-                    # Получаем статус посещаемости
-                    attendance_data = self.db.get_attendance_by_group_and_date(self.selected_group, date_str)
-                    child_attendance = next((item for item in attendance_data if item['child_id'] == child['child_id']), None)
-                    
-                    status = child_attendance['status'] if child_attendance else 'Присутствует'
-                    
-                    # Определяем цвет и символ
-                    if status == 'Присутствует':
-                        bgcolor = present_bg
-                        symbol = "+"
-                        color = present_color
-                    elif status == 'Отсутствует':
-                        bgcolor = absent_bg
-                        symbol = "-"
-                        color = absent_color
-                    else:  # Болеет
-                        bgcolor = sick_bg
-                        symbol = "Б"
-                        color = sick_color
-                    
-                    cell = ft.Container(
-                        content=ft.Text(symbol, size=10, weight=ft.FontWeight.BOLD, 
-                                       text_align=ft.TextAlign.CENTER, color=color),
-                        width=30,
-                        height=30,
-                        padding=2,
-                        border=ft.border.all(1, border_color),
-                        bgcolor=bgcolor,
-                        on_click=lambda e, c_id=child['child_id'], d=date_str: self.toggle_attendance(c_id, d)
-                    )
-                    child_row.append(cell)
-                
-                rows.append(ft.Row(child_row, spacing=0))
-            
-            # Легенда
-            legend = ft.Row([
+        # Модель месяца: отметки по детям и дням; клик меняет ее и одну ячейку
+        # Клик по ячейке пишет отметку за этот месяц, даже если выпадающие
+        # списки уже переключены на другой, который еще загружается
+        self.month_statuses = {child['child_id']: child['days'] for child in children}
+        self.shown_month = (year, month)
+        self.cell_spans = {}
+        
+        # Получаем количество дней в месяце
+        self.days_in_month = calendar.monthrange(year, month)[1]
+        
+        # Заголовок с днями: те же моноширинные ячейки по 3 символа
+        header = ft.Container(
+            content=ft.Row([
                 ft.Container(
-                    content=ft.Row([
-                        ft.Container(width=20, height=20, bgcolor=present_bg, 
-                                   border=ft.border.all(1, border_color)),
-                        ft.Text("+ Присутствует", size=12)
-                    ], spacing=5),
-                    padding=5
+                    content=ft.Text("ФИО", weight=ft.FontWeight.BOLD, size=12),
+                    width=200,
+                    padding=ft.padding.symmetric(horizontal=5),
                 ),
-                ft.Container(
-                    content=ft.Row([
-                        ft.Container(width=20, height=20, bgcolor=absent_bg,
-                                   border=ft.border.all(1, border_color)),
-                        ft.Text("- Отсутствует", size=12)
-                    ], spacing=5),
-                    padding=5
+                ft.Text(
+                    "".join(f"{day:^3}" for day in range(1, self.days_in_month + 1)),
+                    style=self.cell_style,
+                    weight=ft.FontWeight.BOLD,
                 ),
-                ft.Container(
-                    content=ft.Row([
-                        ft.Container(width=20, height=20, bgcolor=sick_bg,
-                                   border=ft.border.all(1, border_color)),
-                        ft.Text("Б Болеет", size=12)
-                    ], spacing=5),
-                    padding=5
-                )
-            ], spacing=20)
-            
-            self.journal_container.content = ft.Column([
-                ft.Text(f"Журнал посещаемости - {calendar.month_name[self.current_month]} {self.current_year}",
-                        size=18, weight=ft.FontWeight.BOLD),
-                ft.Container(height=10),
-                legend,
-                ft.Container(height=10),
-                ft.Column(rows, spacing=0, scroll=ft.ScrollMode.AUTO)
-            ])
-            
-            if self.page:
-                self.page.update()
-                
-        except Exception as ex:
-            print(f"Ошибка построения журнала: {ex}")
-            self.journal_container.content = ft.Text(f"Ошибка: {ex}")
-            if self.page:
-                self.page.update()
+            ], spacing=0, height=JOURNAL_ROW_HEIGHT),
+            bgcolor=header_bg,
+            border=ft.border.only(bottom=ft.BorderSide(1, border_color)),
+        )
+        
+        # Строки создаются постранично при прокрутке, Flutter строит только видимые
+        rows = PagedList(self._create_journal_row, item_extent=JOURNAL_ROW_HEIGHT, expand=True)
+        rows.show_rows(children)
+        
+        # Легенда
+        legend = ft.Row([
+            ft.Container(
+                content=ft.Row([
+                    ft.Container(width=20, height=20, bgcolor=self.status_colors[status][0],
+                                 border=ft.border.all(1, border_color)),
+                    ft.Text(f"{STATUS_SYMBOLS[status]} {status}", size=12)
+                ], spacing=5),
+                padding=5
+            )
+            for status in STATUS_SYMBOLS
+        ], spacing=20)
+        
+        self.journal_container.content = ft.Column([
+            ft.Text(f"Журнал посещаемости - {calendar.month_name[month]} {year}",
+                    size=18, weight=ft.FontWeight.BOLD),
+            ft.Container(height=10),
+            legend,
+            ft.Container(height=10),
+            header,
+            rows,
+        ], expand=True)
     
-    def toggle_attendance(self, child_id: int, date_str: str):
-        """Переключение статуса посещаемости"""
-        try:
-            # Получаем текущий статус
-            attendance_data = self.db.get_attendance_by_group_and_date(self.selected_group, date_str)
-            child_attendance = next((item for item in attendance_data if item['child_id'] == child_id), None)
-            
-            current_status = child_attendance['status'] if child_attendance else 'Присутствует'
-            
-            # Циклическое переключение статусов
-            if current_status == 'Присутствует':
-                new_status = 'Отсутствует'
-            elif current_status == 'Отсутствует':
-                new_status = 'Болеет'
-            else:
-                new_status = 'Присутствует'
-            
-            # Обновляем в базе данных
-            self.db.update_attendance_record(child_id, date_str, new_status)
-            
-            # Перестраиваем журнал
-            self.build_journal()
-            
-        except Exception as ex:
-            print(f"Ошибка переключения посещаемости: {ex}")
\ No newline at end of file
+    def toggle_attendance(self, child_id: int, day: int):
+        """
+        Переключение статуса посещаемости
+
+        Ячейка и модель месяца меняются сразу, запись в базу идет в фоне;
+        при ошибке записи ячейка возвращается к прежнему статусу. На клиент
+        отправляется только измененная ячейка.
+        """
+        days = self.month_statuses[child_id]
+        current_status = days.get(day, 'Присутствует')
+        
+        # Циклическое переключение статусов
+        if current_status == 'Присутствует':
+            new_status = 'Отсутствует'
+        elif current_status == 'Отсутствует':
+            new_status = 'Болеет'
+        else:
+            new_status = 'Присутствует'
+        
+        self._set_cell(child_id, day, new_status)
+        year, month = self.shown_month
+        date_str = f"{year}-{month:02d}-{day:02d}"
+        
+        def write():
+            # Пишется статус из модели на момент записи: при быстрых
+            # повторных нажатиях последней в базу попадает последняя отметка
+            with self.write_lock:
+                self.db.bulk_upsert_attendance([(child_id, date_str, days.get(day, 'Присутствует'), None)])
+        
+        def revert(ex):
+            print(f"Ошибка переключения посещаемости: {ex}")
+            # Только если журнал не перестроен и ячейку не переключили снова
+            if self.month_statuses.get(child_id) is days and days.get(day) == new_status:
+                self._set_cell(child_id, day, current_status)
+        
+        # Без страницы: результат не требует page.update() всего журнала
+        return get_worker().submit(None, write, on_error=revert)
+    
+    def _set_cell(self, child_id: int, day: int, status: str):
+        """Записать статус в модель месяца и обновить его ячейку"""
+        self.month_statuses[child_id][day] = status
+        span = self.cell_spans.get((child_id, day))
+        if span is None:
+            return
+        self._apply_status(span, status)
+        if span.page:
+            span.update()
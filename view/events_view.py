@@ -7,6 +7,7 @@ from typing import Callable
 
 from dialogs import show_confirm_dialog
 from pages_styles.styles import AppStyles
+from update_scheduler import request_update
 
 
 class EventsView(ft.Container):
@@ -119,7 +120,7 @@ class EventsView(ft.Container):
         for event in self.events_storage:
             self.events_list.controls.append(self._create_event_item(event))
         if self.page:
-            self.page.update()
+            request_update(self.page)
     
     def _create_event_item(self, event):
         """Создать элемент списка для мероприятия"""
@@ -210,12 +211,18 @@ class EventsView(ft.Container):
         event_groups = event.get('groups', [])
         participants_content = ft.Column([], spacing=10, scroll=ft.ScrollMode.AUTO)
         
+        # Группы и дети всех групп мероприятия загружаются одним запросом каждые
+        groups_by_id = {g['group_id']: g for g in self.db.get_all_groups()} if event_groups else {}
+        children_by_group = self.db.get_children_by_groups(
+            [group_id for group_id in event_groups if group_id in groups_by_id]
+        )
+        
         for group_id in event_groups:
-            group = next((g for g in self.db.get_all_groups() if g['group_id'] == group_id), None)
+            group = groups_by_id.get(group_id)
             if not group:
                 continue
                 
-            children = self.db.get_children_by_group(group_id)
+            children = children_by_group[group_id]
             
             group_card = ft.ExpansionTile(
                 title=ft.Text(f"Группа: {group['group_name']}", weight=ft.FontWeight.BOLD),
@@ -248,7 +255,7 @@ class EventsView(ft.Container):
         
         self.page.overlay.append(dialog)
         dialog.open = True
-        self.page.update()
+        request_update(self.page)
     
     def _calculate_age(self, birth_date_str):
         """Вычисление возраста"""
@@ -277,13 +284,11 @@ class EventsView(ft.Container):
     def _load_groups_for_form(self):
         """Загружает список групп в форму для выбора"""
         self.groups_list_view.controls.clear()
-        all_groups = self.db.get_all_groups()
+        all_groups = self.db.get_all_groups(with_counts=True)
         
         for group in all_groups:
-            children_count = len(self.db.get_children_by_group(group['group_id']))
-            
             checkbox = ft.Checkbox(
-                label=f"{group['group_name']} ({children_count} детей)",
+                label=f"{group['group_name']} ({group['children_count']} детей)",
                 value=False,
                 data=group['group_id']
             )
@@ -395,7 +400,7 @@ class EventsView(ft.Container):
                 bgcolor=ft.Colors.ERROR
             )
             self.page.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
     
     def refresh(self):
         """Обновить данные"""
@@ -1,12 +1,16 @@
 """
 Представление для управления группами
 """
+import asyncio
 import flet as ft
 from typing import Callable
+from async_database import get_async_database
 from components import InfoCard
+from db_worker import get_worker
 from dialogs import show_confirm_dialog
 from settings.config import AGE_CATEGORIES
 from pages_styles.styles import AppStyles
+from update_scheduler import request_update
 
 
 class GroupsView(ft.Container):
@@ -72,10 +76,13 @@ class GroupsView(ft.Container):
         
         # Список групп
         self.groups_list = ft.ListView(expand=True, spacing=10, padding=20)
+        # Виден, пока запросы к базе выполняются в фоне
+        self.loading = ft.ProgressBar(visible=False)
         
         self.content = AppStyles.form_column([
             AppStyles.page_header("Группы", "Добавить группу", self.show_add_form),
             self.form_container,
+            self.loading,
             ft.Container(content=self.groups_list, expand=True)
         ], spacing=20)
         self.expand = True
@@ -104,7 +111,7 @@ class GroupsView(ft.Container):
             if self.page:
                 self.page.overlay.append(dialog)
                 dialog.open = True
-                self.page.update()
+                request_update(self.page)
                 
         except Exception as ex:
             print(f"Ошибка получения информации о воспитателе: {ex}")
@@ -113,22 +120,29 @@ class GroupsView(ft.Container):
         """Закрыть диалог"""
         if self.page and self.page.overlay:
             self.page.overlay.clear()
-            self.page.update()
+            request_update(self.page)
     
     def load_groups(self):
-        """Загрузка списка групп"""
-        groups = self.db.get_all_groups()
+        """Загрузка списка групп: запрос в фоне, список показывается по готовности"""
+        return get_worker().submit(
+            self.page,
+            lambda: self.db.get_all_groups(with_counts=True),
+            on_done=self.show_groups,
+            on_error=lambda ex: self.show_error(f"Ошибка загрузки: {ex}"),
+            loading=self.loading,
+            key=("groups", id(self)),
+        )
+    
+    def show_groups(self, groups: list):
+        """Показать список групп"""
         self.groups_list.controls = [self._create_group_item(group) for group in groups]
         if self.page:
-            self.page.update()
+            request_update(self.page)
     
     def _create_group_item(self, group):
         """Создать элемент списка для группы"""
         teacher_name = group.get('teacher_name', 'Не назначен')
-        try:
-            children_count = len(self.db.get_children_by_group(group['group_id']))
-        except Exception:
-            children_count = group.get('children_count', 0)
+        children_count = group.get('children_count', 0)
         
         return ft.ListTile(
             title=ft.Text(group['group_name'], weight=ft.FontWeight.BOLD),
@@ -136,49 +150,60 @@ class GroupsView(ft.Container):
             trailing=ft.PopupMenuButton(
                 tooltip="",
                 items=[
-                    ft.PopupMenuItem(text="Редактировать", icon=ft.Icons.EDIT, on_click=lambda _, gid=group['group_id']: self.edit_group(str(gid))),
+                    ft.PopupMenuItem(text="Редактировать", icon=ft.Icons.EDIT, on_click=lambda _, gid=group['group_id']: self.page.run_task(self.edit_group, str(gid))),
                     ft.PopupMenuItem(text="Удалить", icon=ft.Icons.DELETE, on_click=lambda _, gid=group['group_id']: self.delete_group(str(gid)))
                 ]
             )
         )
     
-    def show_add_form(self, e):
+    async def show_add_form(self, e):
         """Показать форму добавления"""
+        adb = get_async_database(self.db)
+        # Воспитатели и дети загружаются параллельно
+        teachers, all_children = await asyncio.gather(adb.get_all_teachers(), adb.get_all_children())
+        
         self.selected_group = None
         self.clear_form()
-        self.load_teachers()
+        self.load_teachers(teachers)
         self.form_container.content.controls[0].value = "Добавить группу"
         self.form_container.visible = True
-        self._load_children_for_form()
+        self._load_children_for_form(all_children=all_children)
         if self.page:
-            self.page.update()
+            request_update(self.page)
     
-    def edit_group(self, group_id: str):
+    async def edit_group(self, group_id: str):
         """Редактировать группу"""
-        group = self.db.get_group_by_id(int(group_id))
+        adb = get_async_database(self.db)
+        # Группа, воспитатели и дети загружаются параллельно
+        group, teachers, all_children, children_in_group = await asyncio.gather(
+            adb.get_group_by_id(int(group_id)),
+            adb.get_all_teachers(),
+            adb.get_all_children(),
+            adb.get_children_by_group(int(group_id)),
+        )
         if group:
             self.selected_group = group
             self.group_name_field.value = group['group_name']
             self.age_category_dropdown.value = group['age_category']
             self.teacher_dropdown.value = str(group['teacher_id']) if group['teacher_id'] else "0"
             
-            self.load_teachers()
-            self._load_children_for_form(group_id=int(group_id))
+            self.load_teachers(teachers)
+            self._load_children_for_form(int(group_id), all_children, children_in_group)
             self.form_container.content.controls[0].value = "Редактировать группу"
             self.form_container.visible = True
             if self.page:
-                self.page.update()
+                request_update(self.page)
     
     def delete_group(self, group_id: str):
         """Удалить группу"""
         def on_yes(e):
-            try:
-                self.db.delete_group(int(group_id))
-                self.load_groups()
-                if self.on_refresh:
-                    self.on_refresh()
-            except Exception as ex:
-                self.show_error(f"Ошибка при удалении: {str(ex)}")
+            get_worker().submit(
+                self.page,
+                lambda: self.db.delete_group(int(group_id)),
+                on_done=lambda _: self.after_change(),
+                on_error=lambda ex: self.show_error(f"Ошибка при удалении: {str(ex)}"),
+                loading=self.loading,
+            )
 
         show_confirm_dialog(
             self.page,
@@ -210,7 +235,7 @@ class GroupsView(ft.Container):
         
         if not is_valid:
             if self.page:
-                self.page.update()
+                request_update(self.page)
         
         return is_valid
     
@@ -220,50 +245,56 @@ class GroupsView(ft.Container):
         if not self.validate_fields():
             return
         
-        try:
-            teacher_id = None
-            if self.teacher_dropdown.value and self.teacher_dropdown.value != "0":
-                teacher_id = int(self.teacher_dropdown.value)
-            
-            new_group_id = None
-            if self.selected_group:
+        teacher_id = None
+        if self.teacher_dropdown.value and self.teacher_dropdown.value != "0":
+            teacher_id = int(self.teacher_dropdown.value)
+        group_data = {
+            'group_name': self.group_name_field.value,
+            'age_category': self.age_category_dropdown.value,
+            'teacher_id': teacher_id
+        }
+        selected_child_ids = {cb.data for cb in self.children_list_view.controls if cb.value}
+        selected_group = self.selected_group
+        
+        def save():
+            if selected_group:
                 # Обновление
-                group_id = self.selected_group['group_id']
-                self.db.update_group(
-                    group_id,
-                    group_name=self.group_name_field.value,
-                    age_category=self.age_category_dropdown.value,
-                    teacher_id=teacher_id
-                )
-                new_group_id = group_id
+                group_id = selected_group['group_id']
+                self.db.update_group(group_id, **group_data)
             else:
                 # Добавление
-                new_group_id = self.db.add_group(
-                    group_name=self.group_name_field.value,
-                    age_category=self.age_category_dropdown.value,
-                    teacher_id=teacher_id
-                )
-
+                group_id = self.db.add_group(**group_data)
             # Обновляем состав группы
-            if new_group_id:
-                self._update_group_children(new_group_id)
-
+            if group_id:
+                self._update_group_children(group_id, selected_child_ids)
+        
+        def on_saved(_):
+            self.save_button.disabled = False
             self.form_container.visible = False
-            self.load_groups()
-            if self.on_refresh:
-                self.on_refresh()
-            if self.page:
-                self.page.update()
-            
-        except Exception as ex:
+            self.after_change()
+        
+        def on_failed(ex):
+            self.save_button.disabled = False
             self.show_error(f"Ошибка при сохранении: {str(ex)}")
+        
+        # Запись в фоне; форма остается открытой до успешного сохранения
+        self.save_button.disabled = True
+        request_update(self.page)
+        get_worker().submit(self.page, save, on_done=on_saved, on_error=on_failed, loading=self.loading)
+    
+    def after_change(self):
+        """Обновить список после добавления, изменения или удаления группы"""
+        if self.on_refresh:
+            self.on_refresh()
+        else:
+            self.load_groups()
     
     def cancel_edit(self, e):
         """Отменить редактирование"""
         self.form_container.visible = False
         self.clear_form()
         if self.page:
-            self.page.update()
+            request_update(self.page)
     
     def clear_form(self):
         """Очистить форму"""
@@ -273,9 +304,10 @@ class GroupsView(ft.Container):
         self.children_list_view.controls.clear()
         self.clear_field_errors()
 
-    def load_teachers(self):
-        """Загрузка списка воспитателей для выпадающего списка"""
-        teachers = self.db.get_all_teachers()
+    def load_teachers(self, teachers: list = None):
+        """Загрузка списка воспитателей для выпадающего списка (teachers — уже загруженные)"""
+        if teachers is None:
+            teachers = self.db.get_all_teachers()
         self.teacher_dropdown.options = [
             ft.DropdownOption(key=str(t['teacher_id']), text=t['full_name'])
             for t in teachers
@@ -284,18 +316,21 @@ class GroupsView(ft.Container):
         self.teacher_dropdown.options.insert(0, ft.DropdownOption(key="0", text="Не назначен"))
         
         if self.page:
-            self.page.update()
+            request_update(self.page)
     
-    def _load_children_for_form(self, group_id: int | None = None):
-        """Загружает список детей в форму для выбора."""
+    def _load_children_for_form(self, group_id: int | None = None, all_children: list = None,
+                                children_in_group: list = None):
+        """Загружает список детей в форму для выбора (списки детей можно передать уже загруженными)."""
         from datetime import datetime, date
         
         self.children_list_view.controls.clear()
-        all_children = self.db.get_all_children()
+        if all_children is None:
+            all_children = self.db.get_all_children()
         
         children_in_group_ids = []
         if group_id:
-            children_in_group = self.db.get_children_by_group(group_id)
+            if children_in_group is None:
+                children_in_group = self.db.get_children_by_group(group_id)
             children_in_group_ids = [c['child_id'] for c in children_in_group]
 
         for child in all_children:
@@ -337,12 +372,8 @@ class GroupsView(ft.Container):
             )
             self.children_list_view.controls.append(checkbox)
 
-    def _update_group_children(self, group_id: int):
-        """Обновляет состав детей в группе на основе выбора в форме."""
-        selected_child_ids = {
-            cb.data for cb in self.children_list_view.controls if cb.value
-        }
-        
+    def _update_group_children(self, group_id: int, selected_child_ids: set):
+        """Обновляет состав детей в группе по выбранным в форме (выполняется в пуле запросов)."""
         # Получаем текущий список детей в группе
         current_children_in_group = self.db.get_children_by_group(group_id)
         current_child_ids = {c['child_id'] for c in current_children_in_group}
@@ -350,12 +381,12 @@ class GroupsView(ft.Container):
         # Дети, которых нужно добавить
         to_add = selected_child_ids - current_child_ids
         for child_id in to_add:
-            self._assign_child(child_id, group_id)
+            self._write_child_group(child_id, group_id)
 
         # Дети, которых нужно убрать
         to_remove = current_child_ids - selected_child_ids
         for child_id in to_remove:
-            self._assign_child(child_id, None) # Открепляем от группы
+            self._write_child_group(child_id, None) # Открепляем от группы
 
     def show_error(self, message: str):
         """Показать ошибку"""
@@ -365,7 +396,7 @@ class GroupsView(ft.Container):
                 bgcolor=ft.Colors.ERROR
             )
             self.page.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
     
     def add_child_to_group(self, child):
         """
@@ -401,18 +432,15 @@ class GroupsView(ft.Container):
         )
 
         def on_assign(e):
-            try:
-                selected = group_dropdown.value
-                group_id = None if not selected or selected == "0" else int(selected)
-                self._assign_child(child_id, group_id)
-                dialog.open = False
-                self.page.update()
-            except Exception as ex:
-                self.show_error(f"Ошибка при назначении ребёнка: {str(ex)}")
+            selected = group_dropdown.value
+            group_id = None if not selected or selected == "0" else int(selected)
+            self._assign_child(child_id, group_id)
+            dialog.open = False
+            request_update(self.page)
 
         def on_cancel(e):
             dialog.open = False
-            self.page.update()
+            request_update(self.page)
 
         dialog = ft.AlertDialog(
             title=ft.Text("Назначить ребёнка в группу"),
@@ -427,9 +455,19 @@ class GroupsView(ft.Container):
 
         self.page.dialog = dialog
         dialog.open = True
-        self.page.update()
+        request_update(self.page)
 
     def _assign_child(self, child_id: int, group_id: int | None):
+        """Изменить группу ребёнка: запись в фоне, затем обновление списка"""
+        return get_worker().submit(
+            self.page,
+            lambda: self._write_child_group(child_id, group_id),
+            on_done=lambda _: self.after_change(),
+            on_error=lambda ex: self.show_error(f"Ошибка при назначении ребёнка: {str(ex)}"),
+            loading=self.loading,
+        )
+
+    def _write_child_group(self, child_id: int, group_id: int | None):
         """
         Выполнить изменение группы для ребёнка в БД.
         Пытаемся несколько возможных вызовов БД, чтобы быть совместимыми с разным API.
@@ -472,13 +510,6 @@ class GroupsView(ft.Container):
         if last_err:
             raise last_err
 
-        # Обновляем данные в представлении
-        self.load_groups()
-        if self.on_refresh:
-            self.on_refresh()
-        if self.page:
-            self.page.update()
-
     def refresh(self):
         """Обновить данные"""
         self.load_groups()
@@ -2,10 +2,11 @@
 Домашняя страница приложения
 """
 import flet as ft
-from datetime import datetime, date
+from datetime import datetime
 from typing import Callable
 from components import InfoCard
 from settings.config import PRIMARY_COLOR
+from update_scheduler import request_update
 
 
 class HomeView(ft.Container):
@@ -81,39 +82,25 @@ class HomeView(ft.Container):
             ft.Container(height=20),
             quick_actions
         ], spacing=10, expand=True, scroll=ft.ScrollMode.AUTO)
-        
-        # Загружаем статистику
-        self.load_statistics()
     
     def load_statistics(self):
         """Загрузка статистики"""
         try:
-            # Получаем статистику
-            total_children = len(self.db.get_all_children())
-            total_groups = len(self.db.get_all_groups())
-            total_teachers = len(self.db.get_all_teachers())
-            total_parents = len(self.db.get_all_parents())
-            
-            # Посещаемость сегодня
-            today = date.today().strftime("%Y-%m-%d")
-            attendance_today = 0
-            for group in self.db.get_all_groups():
-                if group.get('group_id'):
-                    attendance_data = self.db.get_attendance_by_group_and_date(group['group_id'], today)
-                    attendance_today += len([child for child in attendance_data if child.get('status') == 'Присутствует'])
+            # Все счетчики одним агрегирующим запросом
+            summary = self.db.get_dashboard_summary()
             
             # Создаем карточки статистики
             cards = [
-                InfoCard("Всего детей", str(total_children), ft.Icons.CHILD_CARE, "#2196F3"),
-                InfoCard("Всего групп", str(total_groups), ft.Icons.GROUPS, "#4CAF50"),
-                InfoCard("Всего воспитателей", str(total_teachers), ft.Icons.PERSON, "#FF9800"),
-                InfoCard("Присутствуют сегодня", str(attendance_today), ft.Icons.ASSIGNMENT_TURNED_IN, "#00BCD4")
+                InfoCard("Всего детей", str(summary['total_children']), ft.Icons.CHILD_CARE, "#2196F3"),
+                InfoCard("Всего групп", str(summary['total_groups']), ft.Icons.GROUPS, "#4CAF50"),
+                InfoCard("Всего воспитателей", str(summary['total_teachers']), ft.Icons.PERSON, "#FF9800"),
+                InfoCard("Присутствуют сегодня", str(summary['present_today']), ft.Icons.ASSIGNMENT_TURNED_IN, "#00BCD4")
             ]
             
             self.stats_row.controls = cards
             
             if self.page:
-                self.page.update()
+                request_update(self.page)
                 
         except Exception as ex:
             print(f"Ошибка при загрузке статистики: {ex}")
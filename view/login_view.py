@@ -4,6 +4,7 @@
 import flet as ft
 from typing import Callable
 import hashlib
+from update_scheduler import request_update
 
 
 class LoginView(ft.Container):
@@ -65,7 +66,7 @@ class LoginView(ft.Container):
         if not username or not password:
             self.error_text.value = "Заполните все поля"
             if self.page:
-                self.page.update()
+                request_update(self.page)
             return
         
         # Проверка через базу данных
@@ -81,4 +82,4 @@ class LoginView(ft.Container):
         else:
             self.error_text.value = "Неверный логин или пароль"
             if self.page:
-                self.page.update()
\ No newline at end of file
+                request_update(self.page)
\ No newline at end of file
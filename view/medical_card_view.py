@@ -4,6 +4,7 @@
 import flet as ft
 from typing import Callable
 from pages_styles.styles import AppStyles
+from update_scheduler import request_update
 
 
 class MedicalCardView(ft.Container):
@@ -236,7 +237,7 @@ class MedicalCardView(ft.Container):
                 bgcolor=ft.Colors.ERROR
             )
             self.page.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
     
     def show_success(self, message: str):
         """Показать успешное сообщение"""
@@ -246,4 +247,4 @@ class MedicalCardView(ft.Container):
                 bgcolor=ft.Colors.GREEN
             )
             self.page.snack_bar.open = True
-            self.page.update()
\ No newline at end of file
+            request_update(self.page)
\ No newline at end of file
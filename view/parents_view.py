@@ -3,10 +3,13 @@
 """
 import flet as ft
 from typing import Callable
-from components import SearchBar
+from components import SearchBar, PagedList, AlphabetBar
+from db_worker import get_worker
+from settings.models import letter_key
 from dialogs import show_confirm_dialog
 from settings.config import PRIMARY_COLOR
 from pages_styles.styles import AppStyles
+from update_scheduler import request_update
 
 
 class ParentsView(ft.Container):
@@ -108,41 +111,74 @@ class ParentsView(ft.Container):
         )
         
         # Поиск
-        self.search_bar = SearchBar(on_search=self.on_search, placeholder="Поиск родителей...")
+        self.search_bar = SearchBar(fetch=self.fetch_parents, on_results=self.on_search_results, placeholder="Поиск родителей...")
         
-        # Список родителей
-        self.parents_list = ft.ListView(expand=True, spacing=10, padding=20)
-        
-        # Загружаем данные без update
-        parents = self.db.get_all_parents()
-        for parent in parents:
-            self.parents_list.controls.append(self._create_parent_item(parent))
+        # Список родителей: страницы подгружаются при прокрутке
+        self.parents_list = PagedList(self._create_parent_item, expand=True, spacing=10, padding=20)
+        self.alphabet_bar = AlphabetBar(on_select=self.jump_to_letter)
+        # Виден, пока запросы к базе выполняются в фоне
+        self.loading = ft.ProgressBar(visible=False)
         
         self.content = AppStyles.form_column([
             AppStyles.page_header("Родители", "Добавить родителя", self.show_add_form),
             self.form_container,
             self.search_bar,
+            self.alphabet_bar,
+            self.loading,
             ft.Container(content=self.parents_list, expand=True)
         ], spacing=20)
         self.expand = True
     
-    def on_search(self, query: str):
-        """Обработчик поиска"""
+    def on_search_results(self, query: str, parents: list):
+        """Показать результаты поиска (вызывается из потока поиска)"""
         self.search_query = query
-        self.load_parents(query)
+        self.show_parents(parents)
+        if self.page:
+            request_update(self.page)
     
-    def load_parents(self, search_query: str = ""):
-        """Загрузка списка родителей"""
+    def fetch_parents(self, search_query: str = ""):
+        """Найти родителей по строке поиска (None, если строка пустая — весь список по страницам)"""
         if search_query:
-            parents = self.db.search_parents(search_query)
-        else:
-            parents = self.db.get_all_parents()
-        
-        self.parents_list.controls.clear()
-        for parent in parents:
-            self.parents_list.controls.append(self._create_parent_item(parent))
+            return self.db.search_parents(search_query)
+        return None
+    
+    def fetch_parents_list(self, search_query: str = "") -> tuple:
+        """Данные списка: (результаты поиска, None, None) или (None, буквы, первая страница всех родителей)"""
+        parents = self.fetch_parents(search_query)
+        if parents is not None:
+            return parents, None, None
+        return None, self.db.get_parents_letters(), self.db.get_parents_page()
+    
+    def load_parents(self, search_query: str = ""):
+        """Загрузка списка родителей: запросы в фоне, список показывается по готовности"""
+        return get_worker().submit(
+            self.page,
+            lambda: self.fetch_parents_list(search_query),
+            on_done=lambda data: self.show_parents(data[0], letters=data[1], first_rows=data[2]),
+            on_error=lambda ex: self.show_error(f"Ошибка загрузки: {ex}"),
+            loading=self.loading,
+            key=("parents", id(self)),
+        )
+    
+    def show_parents(self, parents: list = None, after: tuple = None, letters: list = None,
+                     first_rows: list = None):
+        """Показать результаты поиска или, если их нет, всех родителей по алфавиту с ключа after"""
+        self.alphabet_bar.visible = parents is None
+        if parents is not None:
+            self.parents_list.show_rows(parents)
+            return
+        self.alphabet_bar.set_letters(self.db.get_parents_letters() if letters is None else letters)
+        self.parents_list.show(self.db.get_parents_page, self.db.parents_page_key,
+                               after=after, first_rows=first_rows)
+    
+    def jump_to_letter(self, letter: str):
+        """Перейти к фамилиям на букву letter"""
+        self.search_bar.cancel()
+        self.search_query = ""
+        self.search_bar.search_field.value = ""
+        self.show_parents(after=letter_key(letter))
         if self.page:
-            self.page.update()
+            request_update(self.page)
     
     def _create_parent_item(self, parent):
         """Создать элемент списка для родителя"""
@@ -169,8 +205,17 @@ class ParentsView(ft.Container):
         self.update()
     
     def edit_parent(self, parent_id: str):
-        """Редактировать родителя"""
-        parent = self.db.get_parent_by_id(int(parent_id))
+        """Редактировать родителя: запись загружается в фоне, затем открывается форма"""
+        return get_worker().submit(
+            self.page,
+            lambda: self.db.get_parent_by_id(int(parent_id)),
+            on_done=self.show_edit_form,
+            on_error=lambda ex: self.show_error(f"Ошибка: {str(ex)}"),
+            loading=self.loading,
+        )
+    
+    def show_edit_form(self, parent):
+        """Заполнить форму данными родителя"""
         if parent:
             self.selected_parent = parent
             self.last_name_field.value = parent['last_name']
@@ -200,21 +245,33 @@ class ParentsView(ft.Container):
             self.update()
     
     def delete_parent(self, parent_id: str):
-        """Удалить родителя"""
-        parent = self.db.get_parent_by_id(int(parent_id))
+        """Удалить родителя: запись загружается в фоне, затем запрашивается подтверждение"""
+        return get_worker().submit(
+            self.page,
+            lambda: self.db.get_parent_by_id(int(parent_id)),
+            on_done=self.confirm_delete,
+            on_error=lambda ex: self.show_error(f"Ошибка: {str(ex)}"),
+            loading=self.loading,
+        )
+    
+    def confirm_delete(self, parent):
+        """Подтверждение удаления; удаление идет в фоне"""
         if not parent:
             self.show_error("Родитель не найден")
             return
-
+        
+        def on_deleted(_):
+            self.show_success(f"Родитель {parent['full_name']} успешно удален")
+            self.after_change()
+        
         def on_yes(e):
-            try:
-                self.db.delete_parent(int(parent_id))
-                self.load_parents(self.search_query)
-                if self.on_refresh:
-                    self.on_refresh()
-                self.show_success(f"Родитель {parent['full_name']} успешно удален")
-            except Exception as ex:
-                self.show_error(f"Ошибка при удалении родителя: {str(ex)}")
+            get_worker().submit(
+                self.page,
+                lambda: self.db.delete_parent(parent['parent_id']),
+                on_done=on_deleted,
+                on_error=lambda ex: self.show_error(f"Ошибка при удалении родителя: {str(ex)}"),
+                loading=self.loading,
+            )
 
         show_confirm_dialog(
             self.page,
@@ -309,49 +366,48 @@ class ParentsView(ft.Container):
         if not self.validate_fields():
             return
         
-        try:
-            if self.selected_parent:
-                # Обновление
-                # Собираем полный номер телефона
-                full_phone = None
-                if self.phone_field.value and self.phone_field.value.strip():
-                    full_phone = self.country_code_dropdown.value + self.phone_field.value.replace('-', '')
-                
-                self.db.update_parent(
-                    self.selected_parent['parent_id'],
-                    last_name=self.last_name_field.value,
-                    first_name=self.first_name_field.value,
-                    middle_name=self.middle_name_field.value or None,
-                    phone=full_phone,
-                    email=self.email_field.value or None,
-                    address=self.address_field.value or None
-                )
-                self.show_success("Родитель успешно обновлен")
+        # Собираем полный номер телефона
+        full_phone = None
+        if self.phone_field.value and self.phone_field.value.strip():
+            full_phone = self.country_code_dropdown.value + self.phone_field.value.replace('-', '')
+        
+        parent_data = {
+            'last_name': self.last_name_field.value,
+            'first_name': self.first_name_field.value,
+            'middle_name': self.middle_name_field.value or None,
+            'phone': full_phone,
+            'email': self.email_field.value or None,
+            'address': self.address_field.value or None
+        }
+        selected_parent = self.selected_parent
+        
+        def save():
+            if selected_parent:
+                self.db.update_parent(selected_parent['parent_id'], **parent_data)
             else:
-                # Добавление
-                # Собираем полный номер телефона
-                full_phone = None
-                if self.phone_field.value and self.phone_field.value.strip():
-                    full_phone = self.country_code_dropdown.value + self.phone_field.value.replace('-', '')
-                
-                self.db.add_parent(
-                    last_name=self.last_name_field.value,
-                    first_name=self.first_name_field.value,
-                    middle_name=self.middle_name_field.value or None,
-                    phone=full_phone,
-                    email=self.email_field.value or None,
-                    address=self.address_field.value or None
-                )
-                self.show_success("Родитель успешно добавлен")
-            
+                self.db.add_parent(**parent_data)
+        
+        def on_saved(_):
+            self.save_button.disabled = False
             self.form_container.visible = False
-            self.load_parents(self.search_query)
-            if self.on_refresh:
-                self.on_refresh()
-            self.update()
-            
-        except Exception as ex:
+            self.show_success("Родитель успешно обновлен" if selected_parent else "Родитель успешно добавлен")
+            self.after_change()
+        
+        def on_failed(ex):
+            self.save_button.disabled = False
             self.show_error(f"Ошибка при сохранении: {str(ex)}")
+        
+        # Запись в фоне; форма остается открытой до успешного сохранения
+        self.save_button.disabled = True
+        self.update()
+        get_worker().submit(self.page, save, on_done=on_saved, on_error=on_failed, loading=self.loading)
+    
+    def after_change(self):
+        """Обновить список после добавления, изменения или удаления родителя"""
+        if self.on_refresh:
+            self.on_refresh()
+        else:
+            self.load_parents(self.search_query)
     
     def cancel_edit(self, e):
         """Отменить редактирование"""
@@ -378,7 +434,7 @@ class ParentsView(ft.Container):
                 bgcolor=ft.Colors.ERROR
             )
             self.page.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
     
     def show_success(self, message: str):
         """Показать успешное сообщение"""
@@ -388,4 +444,4 @@ class ParentsView(ft.Container):
                 bgcolor=ft.Colors.GREEN
             )
             self.page.snack_bar.open = True
-            self.page.update()
\ No newline at end of file
+            request_update(self.page)
\ No newline at end of file
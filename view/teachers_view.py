@@ -3,10 +3,13 @@
 """
 import flet as ft
 from typing import Callable
-from components import SearchBar
+from components import SearchBar, PagedList, AlphabetBar
+from db_worker import get_worker
+from settings.models import letter_key
 from dialogs import show_confirm_dialog
 from settings.config import PRIMARY_COLOR
 from pages_styles.styles import AppStyles
+from update_scheduler import request_update
 
 
 class TeachersView(ft.Container):
@@ -85,36 +88,73 @@ class TeachersView(ft.Container):
         )
         
         # Поиск
-        self.search_bar = SearchBar(on_search=self.on_search, placeholder="Поиск воспитателей...")
+        self.search_bar = SearchBar(fetch=self.fetch_teachers, on_results=self.on_search_results, placeholder="Поиск воспитателей...")
         
-        # Список воспитателей
-        self.teachers_list = ft.ListView(expand=True, spacing=10, padding=20)
+        # Список воспитателей: страницы подгружаются при прокрутке
+        self.teachers_list = PagedList(self._create_teacher_item, expand=True, spacing=10, padding=20)
+        self.alphabet_bar = AlphabetBar(on_select=self.jump_to_letter)
+        # Виден, пока запросы к базе выполняются в фоне
+        self.loading = ft.ProgressBar(visible=False)
         
         # Кнопка добавления
         add_button = AppStyles.primary_button("Добавить воспитателя", icon=ft.Icons.ADD, on_click=self.show_add_form)
         
-        # Загружаем данные
-        self.load_teachers()
-        
         self.content = AppStyles.form_column([
             AppStyles.page_header("Воспитатели", "Добавить воспитателя", self.show_add_form),
             self.form_container,
             self.search_bar,
+            self.alphabet_bar,
+            self.loading,
             ft.Container(content=self.teachers_list, expand=True)
         ], spacing=20)
         self.expand = True
     
-    def on_search(self, query: str):
-        """Обработчик поиска"""
+    def on_search_results(self, query: str, teachers: list):
+        """Показать результаты поиска (вызывается из потока поиска)"""
         self.search_query = query
-        self.load_teachers(query)
+        self.show_teachers(teachers)
+    
+    def fetch_teachers(self, search_query: str = ""):
+        """Найти воспитателей по строке поиска (None, если строка пустая — весь список по страницам)"""
+        return self.db.search_teachers(search_query) if search_query else None
+    
+    def fetch_teachers_list(self, search_query: str = "") -> tuple:
+        """Данные списка: (результаты поиска, None, None) или (None, буквы, первая страница всех воспитателей)"""
+        teachers = self.fetch_teachers(search_query)
+        if teachers is not None:
+            return teachers, None, None
+        return None, self.db.get_teachers_letters(), self.db.get_teachers_page()
     
     def load_teachers(self, search_query: str = ""):
-        """Загрузка списка воспитателей"""
-        teachers = self.db.search_teachers(search_query) if search_query else self.db.get_all_teachers()
-        self.teachers_list.controls = [self._create_teacher_item(teacher) for teacher in teachers]
+        """Загрузка списка воспитателей: запросы в фоне, список показывается по готовности"""
+        return get_worker().submit(
+            self.page,
+            lambda: self.fetch_teachers_list(search_query),
+            on_done=lambda data: self.show_teachers(data[0], letters=data[1], first_rows=data[2]),
+            on_error=lambda ex: self.show_error(f"Ошибка загрузки: {ex}"),
+            loading=self.loading,
+            key=("teachers", id(self)),
+        )
+    
+    def show_teachers(self, teachers: list = None, after: tuple = None, letters: list = None,
+                      first_rows: list = None):
+        """Показать результаты поиска или, если их нет, всех воспитателей по алфавиту с ключа after"""
+        self.alphabet_bar.visible = teachers is None
+        if teachers is not None:
+            self.teachers_list.show_rows(teachers)
+        else:
+            self.alphabet_bar.set_letters(self.db.get_teachers_letters() if letters is None else letters)
+            self.teachers_list.show(self.db.get_teachers_page, self.db.teachers_page_key,
+                                    after=after, first_rows=first_rows)
         if self.page:
-            self.page.update()
+            request_update(self.page)
+    
+    def jump_to_letter(self, letter: str):
+        """Перейти к фамилиям на букву letter"""
+        self.search_bar.cancel()
+        self.search_query = ""
+        self.search_bar.search_field.value = ""
+        self.show_teachers(after=letter_key(letter))
     
     def _create_teacher_item(self, teacher):
         """Создать элемент списка для воспитателя"""
@@ -142,8 +182,17 @@ class TeachersView(ft.Container):
         self.update()
     
     def edit_teacher(self, teacher_id: str):
-        """Редактировать воспитателя"""
-        teacher = self.db.get_teacher_by_id(int(teacher_id))
+        """Редактировать воспитателя: запись загружается в фоне, затем открывается форма"""
+        return get_worker().submit(
+            self.page,
+            lambda: self.db.get_teacher_by_id(int(teacher_id)),
+            on_done=self.show_edit_form,
+            on_error=lambda ex: self.show_error(f"Ошибка: {str(ex)}"),
+            loading=self.loading,
+        )
+    
+    def show_edit_form(self, teacher):
+        """Заполнить форму данными воспитателя"""
         if teacher:
             self.selected_teacher = teacher
             self.last_name_field.value = teacher['last_name']
@@ -176,29 +225,48 @@ class TeachersView(ft.Container):
             self.update()
     
     def delete_teacher(self, teacher_id: str):
-        """Удалить воспитателя"""
-        teacher = self.db.get_teacher_by_id(int(teacher_id))
+        """Удалить воспитателя: запись загружается в фоне, затем запрашивается подтверждение"""
+        return get_worker().submit(
+            self.page,
+            lambda: self.db.get_teacher_by_id(int(teacher_id)),
+            on_done=self.confirm_delete,
+            on_error=lambda ex: self.show_error(f"Ошибка: {str(ex)}"),
+            loading=self.loading,
+        )
+    
+    def confirm_delete(self, teacher):
+        """Подтверждение удаления; удаление идет в фоне"""
         if not teacher:
             self.show_error("Воспитатель не найден")
             return
-
+        teacher_id = teacher['teacher_id']
+        
+        def delete():
+            # Воспитатель, закрепленный за группами, не удаляется: возвращаются их названия
+            groups = self.db.get_groups_by_teacher(teacher_id)
+            if groups:
+                return ", ".join(g['group_name'] for g in groups)
+            self.db.delete_teacher(teacher_id)
+            return None
+        
+        def on_deleted(group_names):
+            if group_names:
+                self.show_error(
+                    f"Невозможно удалить воспитателя, так как он закреплен за группами: {group_names}. "
+                    "Сначала открепите воспитателя от групп."
+                )
+                return
+            self.show_success(f"Воспитатель {teacher['full_name']} успешно удален")
+            self.after_change()
+        
         def on_yes(e):
-            try:
-                groups = [g for g in self.db.get_all_groups() if g['teacher_id'] == int(teacher_id)]
-                if groups:
-                    group_names = ", ".join(g['group_name'] for g in groups)
-                    self.show_error(
-                        f"Невозможно удалить воспитателя, так как он закреплен за группами: {group_names}. "
-                        "Сначала открепите воспитателя от групп."
-                    )
-                    return
-                self.db.delete_teacher(int(teacher_id))
-                self.load_teachers(self.search_query)
-                if self.on_refresh:
-                    self.on_refresh()
-                self.show_success(f"Воспитатель {teacher['full_name']} успешно удален")
-            except Exception as ex:
-                self.show_error(f"Ошибка при удалении воспитателя: {str(ex)}")
+            get_worker().submit(
+                self.page,
+                delete,
+                on_done=on_deleted,
+                on_error=lambda ex: self.show_error(f"Ошибка при удалении воспитателя: {str(ex)}"),
+                loading=self.loading,
+            )
 
         show_confirm_dialog(
             self.page,
@@ -313,55 +381,51 @@ class TeachersView(ft.Container):
         if not self.validate_fields():
             return
         
-        try:
-            if self.selected_teacher:
-                # Обновление
-                # Собираем полный номер телефона
-                full_phone = None
-                if self.phone_field.value and self.phone_field.value.strip():
-                    full_phone = self.country_code_dropdown.value + self.phone_field.value.replace('-', '')
-                
-                self.db.update_teacher(
-                    self.selected_teacher['teacher_id'],
-                    last_name=self.last_name_field.value,
-                    first_name=self.first_name_field.value,
-                    middle_name=self.middle_name_field.value or None,
-                    phone=full_phone,
-                    email=self.email_field.value or None,
-                    birth_date=self.birth_date_field.value or None,
-                    address=self.address_field.value or None,
-                    education=self.education_field.value or None,
-                    experience=int(self.experience_field.value) if self.experience_field.value and self.experience_field.value.isdigit() else None
-                )
-                self.show_success("Воспитатель успешно обновлен")
+        # Собираем полный номер телефона
+        full_phone = None
+        if self.phone_field.value and self.phone_field.value.strip():
+            full_phone = self.country_code_dropdown.value + self.phone_field.value.replace('-', '')
+        
+        teacher_data = {
+            'last_name': self.last_name_field.value,
+            'first_name': self.first_name_field.value,
+            'middle_name': self.middle_name_field.value or None,
+            'phone': full_phone,
+            'email': self.email_field.value or None,
+            'birth_date': self.birth_date_field.value or None,
+            'address': self.address_field.value or None,
+            'education': self.education_field.value or None,
+            'experience': int(self.experience_field.value) if self.experience_field.value and self.experience_field.value.isdigit() else None
+        }
+        selected_teacher = self.selected_teacher
+        
+        def save():
+            if selected_teacher:
+                self.db.update_teacher(selected_teacher['teacher_id'], **teacher_data)
             else:
-                # Добавление
-                # Собираем полный номер телефона
-                full_phone = None
-                if self.phone_field.value and self.phone_field.value.strip():
-                    full_phone = self.country_code_dropdown.value + self.phone_field.value.replace('-', '')
-                
-                self.db.add_teacher(
-                    last_name=self.last_name_field.value,
-                    first_name=self.first_name_field.value,
-                    middle_name=self.middle_name_field.value or None,
-                    phone=full_phone,
-                    email=self.email_field.value or None,
-                    birth_date=self.birth_date_field.value or None,
-                    address=self.address_field.value or None,
-                    education=self.education_field.value or None,
-                    experience=int(self.experience_field.value) if self.experience_field.value and self.experience_field.value.isdigit() else None
-                )
-                self.show_success("Воспитатель успешно добавлен")
-            
+                self.db.add_teacher(**teacher_data)
+        
+        def on_saved(_):
+            self.save_button.disabled = False
             self.form_container.visible = False
-            self.load_teachers(self.search_query)
-            if self.on_refresh:
-                self.on_refresh()
-            self.update()
-            
-        except Exception as ex:
+            self.show_success("Воспитатель успешно обновлен" if selected_teacher else "Воспитатель успешно добавлен")
+            self.after_change()
+        
+        def on_failed(ex):
+            self.save_button.disabled = False
             self.show_error(f"Ошибка при сохранении: {str(ex)}")
+        
+        # Запись в фоне; форма остается открытой до успешного сохранения
+        self.save_button.disabled = True
+        self.update()
+        get_worker().submit(self.page, save, on_done=on_saved, on_error=on_failed, loading=self.loading)
+    
+    def after_change(self):
+        """Обновить список после добавления, изменения или удаления воспитателя"""
+        if self.on_refresh:
+            self.on_refresh()
+        else:
+            self.load_teachers(self.search_query)
     
     def cancel_edit(self, e):
         """Отменить редактирование"""
@@ -391,7 +455,7 @@ class TeachersView(ft.Container):
                 bgcolor=ft.Colors.ERROR
             )
             self.page.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
     
     def show_success(self, message: str):
         """Показать успешное сообщение"""
@@ -401,4 +465,4 @@ class TeachersView(ft.Container):
                 bgcolor=ft.Colors.GREEN
             )
             self.page.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)